@@ -9,7 +9,12 @@ from apps.catalog.views.gallery import (
     ComboMediaViewSet,
     JourneyMediaViewSet,
 )
-from apps.catalog.views.category import CategoryViewSet
+from apps.catalog.views.category import CategoryViewSet, CategoryItemsView
+from apps.catalog.views.by_slug import (
+    TreatmentBySlugView,
+    ComboBySlugView,
+    JourneyBySlugView,
+)
 from apps.catalog.views.ordering import ItemOrderViewSet
 from apps.catalog.views.placement import PlacementViewSet, PlacementItemViewSet
 from apps.catalog.views.zone import ZoneViewSet
@@ -49,7 +54,27 @@ router.register(r"filters/objectives", ObjectiveViewSet)
 router.register(r"filters/intensities", IntensityViewSet)
 router.register(r"filters/tags", TagViewSet)
 
-urlpatterns = router.urls + [
+# Lecturas publicas de mas trafico, servidas por vistas async.
+async_urlpatterns = [
+    path(
+        "categories/<uuid:pk>/items/",
+        CategoryItemsView.as_view(),
+        name="category-items",
+    ),
+    path(
+        "treatments/by-slug/<str:slug>/",
+        TreatmentBySlugView.as_view(),
+        name="treatment-by-slug",
+    ),
+    path("combos/by-slug/<str:slug>/", ComboBySlugView.as_view(), name="combo-by-slug"),
+    path(
+        "journeys/by-slug/<str:slug>/",
+        JourneyBySlugView.as_view(),
+        name="journey-by-slug",
+    ),
+]
+
+urlpatterns = async_urlpatterns + router.urls + [
     path("catalog/", CatalogSummaryView.as_view(), name="catalog-summary"),
     path("filters/summary/", FiltersSummaryView.as_view(), name="filters-summary"),
     path("upload/sign/", UploadSignatureView.as_view(), name="upload-sign"),
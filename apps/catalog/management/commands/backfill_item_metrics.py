@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...services.pricing import refresh_journey_metrics, refresh_treatment_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula en bloque las métricas desnormalizadas (effective_price, "
+        "base_price, avg_duration, min_duration) de Treatments y Journeys."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            treatments = refresh_treatment_metrics()
+            # Las jornadas leen las métricas ya guardadas de sus treatments.
+            journeys = refresh_journey_metrics()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Métricas recalculadas. Treatments={treatments} Journeys={journeys}"
+            )
+        )
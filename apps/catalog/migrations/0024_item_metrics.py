@@ -0,0 +1,119 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:29
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def backfill_item_metrics(apps, schema_editor):
+    from apps.catalog.services.pricing import journey_metrics, treatment_metrics
+
+    Treatment = apps.get_model("catalog", "Treatment")
+    TreatmentZoneConfig = apps.get_model("catalog", "TreatmentZoneConfig")
+    Combo = apps.get_model("catalog", "Combo")
+    Journey = apps.get_model("catalog", "Journey")
+    fields = ["effective_price", "base_price", "avg_duration", "min_duration"]
+
+    zone_rows = defaultdict(list)
+    for treatment_id, price, promo, duration in TreatmentZoneConfig.objects.values_list(
+        "treatment_id", "price", "promotional_price", "duration"
+    ):
+        zone_rows[treatment_id].append((price, promo, duration))
+    treatments = []
+    for treatment in Treatment.objects.only("id", "journey_id"):
+        for field, value in treatment_metrics(zone_rows[treatment.id]).items():
+            setattr(treatment, field, value)
+        treatments.append(treatment)
+    Treatment.objects.bulk_update(treatments, fields, batch_size=500)
+
+    treatment_rows = defaultdict(list)
+    for treatment in treatments:
+        if treatment.journey_id:
+            treatment_rows[treatment.journey_id].append(
+                (treatment.effective_price, treatment.base_price, treatment.avg_duration)
+            )
+    combo_rows = defaultdict(list)
+    for journey_id, price, promo, duration in Combo.objects.filter(
+        journey__isnull=False
+    ).values_list("journey_id", "price", "promotional_price", "duration"):
+        combo_rows[journey_id].append((price, promo, duration))
+    journeys = []
+    for journey in Journey.objects.only("id"):
+        metrics = journey_metrics(treatment_rows[journey.id], combo_rows[journey.id])
+        for field, value in metrics.items():
+            setattr(journey, field, value)
+        journeys.append(journey)
+    Journey.objects.bulk_update(journeys, fields, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0023_normalize_category_and_objective_cloudinary_paths"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journey",
+            name="avg_duration",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="journey",
+            name="base_price",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=10, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="journey",
+            name="effective_price",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=10, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="journey",
+            name="min_duration",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="treatment",
+            name="avg_duration",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="treatment",
+            name="base_price",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=10, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="treatment",
+            name="effective_price",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=10, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="treatment",
+            name="min_duration",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["category", "effective_price"],
+                name="catalog_jou_categor_7e7858_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="treatment",
+            index=models.Index(
+                fields=["category", "effective_price"],
+                name="catalog_tre_categor_94c870_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_item_metrics, migrations.RunPython.noop),
+    ]
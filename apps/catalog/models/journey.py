@@ -59,10 +59,21 @@ class Journey(TimeStampedUUIDModel):
     )
     faqs = GenericRelation("catalog.ItemFAQ", related_query_name="journey")
 
+    # Métricas desnormalizadas desde treatments y combos (services.pricing)
+    effective_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, editable=False
+    )
+    base_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, editable=False
+    )
+    avg_duration = models.FloatField(null=True, blank=True, editable=False)
+    min_duration = models.FloatField(null=True, blank=True, editable=False)
+
     class Meta:
         indexes = [
             models.Index(fields=["category", "title"]),
             models.Index(fields=["slug"]),
+            models.Index(fields=["category", "effective_price"]),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -16,8 +16,21 @@ class Treatment(ItemBase):
     # Un treatment por defecto requiere seleccionar zonas
     requires_zones = models.BooleanField(default=True)
 
+    # Métricas desnormalizadas desde zone_configs (services.pricing)
+    effective_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, editable=False
+    )
+    base_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, editable=False
+    )
+    avg_duration = models.FloatField(null=True, blank=True, editable=False)
+    min_duration = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
     class Meta:
-        indexes = [*ItemBase.Meta.indexes]
+        indexes = [
+            *ItemBase.Meta.indexes,
+            models.Index(fields=["category", "effective_price"]),
+        ]
         constraints = [
             models.UniqueConstraint(
                 Lower("slug"),
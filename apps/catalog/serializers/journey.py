@@ -16,7 +16,6 @@ from ..models import (
     ItemRecommendedPoint,
     ItemFAQ,
 )
-from ..services.pricing import effective_price_for_journey
 from ..services.uniqueness import validate_item_uniqueness
 from ..services.cloudinary_assets import (
     CATALOG_MEDIA_PREFIXES,
@@ -125,7 +124,7 @@ class JourneySerializer(
         return None
 
     def get_effective_price(self, obj):
-        return effective_price_for_journey(obj)
+        return obj.effective_price
 
     def get_kind(self, obj):
         return "journey"
@@ -2,14 +2,7 @@ from rest_framework import serializers
 
 from ..models import Treatment, Combo, Journey
 from ..utils.media import build_media_url, build_video_thumbnail_url
-from ..services.pricing import (
-    price_pair_for_treatment,
-    price_pair_for_combo,
-    price_pair_for_journey,
-    average_duration_for_treatment,
-    duration_for_combo,
-    duration_for_journey,
-)
+from ..services.pricing import price_pair_for_combo, duration_for_combo
 
 
 class FilterItemSerializer(serializers.Serializer):
@@ -132,13 +125,15 @@ class TreatmentListSerializer(BaseListItemSerializer):
         return "treatment"
 
     def get_price(self, obj):
-        return price_pair_for_treatment(obj)[0]
+        return obj.effective_price
 
     def get_price_without_discount(self, obj):
-        return price_pair_for_treatment(obj)[1]
+        return obj.base_price
 
     def get_duration(self, obj):
-        return average_duration_for_treatment(obj)
+        if obj.avg_duration is None:
+            return None
+        return round(obj.avg_duration, 2)
 
     def get_zones(self, obj):
         zones = []
@@ -184,10 +179,10 @@ class JourneyListSerializer(BaseListItemSerializer):
         return "journey"
 
     def get_price(self, obj):
-        return price_pair_for_journey(obj)[0]
+        return obj.effective_price
 
     def get_price_without_discount(self, obj):
-        return price_pair_for_journey(obj)[1]
+        return obj.base_price
 
     def get_duration(self, obj):
-        return duration_for_journey(obj)
+        return obj.min_duration
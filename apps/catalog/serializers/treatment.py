@@ -7,7 +7,6 @@ asset references instead of multipart file uploads.
 
 import json
 from django.db import transaction
-from django.db.models import Avg, Min
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
@@ -20,7 +19,7 @@ from ..models import (
     ItemRecommendedPoint,
     ItemFAQ,
 )
-from ..services.pricing import effective_price_for_treatment
+from ..services.pricing import ITEM_METRIC_FIELDS, effective_price_for_treatment
 from ..services.commands import cleanup_treatment_deactivation
 from ..services.uniqueness import validate_item_uniqueness
 from ..services.validation import validate_treatment_rules
@@ -162,18 +161,12 @@ class TreatmentSerializer(
         return "treatment"
 
     def get_duration(self, obj):
-        avg_duration = getattr(obj, "avg_duration", None)
-        if avg_duration is None:
-            avg_duration = obj.zone_configs.aggregate(avg=Avg("duration")).get("avg")
-        if avg_duration is None:
+        if obj.avg_duration is None:
             return None
-        return int(round(avg_duration))
+        return int(round(obj.avg_duration))
 
     def get_from_duration(self, obj):
-        min_duration = getattr(obj, "min_duration", None)
-        if min_duration is None:
-            min_duration = obj.zone_configs.aggregate(min=Min("duration")).get("min")
-        return min_duration
+        return obj.min_duration
 
     def _parse_zone_configs(self, raw):
         if raw is None:
@@ -255,6 +248,8 @@ class TreatmentSerializer(
         )
         ser.is_valid(raise_exception=True)
         ser.save(treatment=treatment)
+        # Las signals de TZC recalculan las métricas en DB; traerlas a la instancia.
+        treatment.refresh_from_db(fields=ITEM_METRIC_FIELDS)
 
     def _sync_zone_configs(self, treatment, zone_configs):
         if zone_configs is None:
@@ -332,6 +327,7 @@ class TreatmentSerializer(
         to_delete = existing_ids - seen_ids
         if to_delete:
             treatment.zone_configs.filter(id__in=to_delete).delete()
+        treatment.refresh_from_db(fields=ITEM_METRIC_FIELDS)
 
     def create(self, validated_data):
         tags = validated_data.pop("tags", None)
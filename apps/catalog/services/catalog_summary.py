@@ -0,0 +1,185 @@
+"""
+Full-catalog export used by the admin SPA (``CatalogSummaryView``).
+
+The document is produced incrementally: every section is walked in primary
+key batches so only ``CHUNK_SIZE`` objects (and their prefetches) are alive at
+once. The same generator feeds the streaming response and the precomputed
+snapshot that a Celery task rebuilds after catalog changes.
+"""
+
+import hashlib
+from typing import Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.renderers import render_json
+
+from ..models import (
+    Category,
+    Combo,
+    Intensity,
+    Journey,
+    Objective,
+    Technique,
+    Treatment,
+    Zone,
+)
+from ..serializers import (
+    CategorySerializer,
+    ComboSerializer,
+    IntensitySerializer,
+    JourneySerializer,
+    ObjectiveSerializer,
+    TechniqueSerializer,
+    TreatmentSerializer,
+    ZoneSerializer,
+)
+
+
+CHUNK_SIZE = 200
+
+_SNAPSHOT_KEY = "catalog:summary:snapshot"
+_SNAPSHOT_PENDING_KEY = "catalog:summary:snapshot:pending"
+
+
+def _item_sections():
+    treatments_qs = (
+        Treatment.objects.all()
+        .select_related("category", "journey")
+        .prefetch_related(
+            "media",
+            "tags",
+            "techniques",
+            "objectives",
+            "intensities",
+            "zone_configs",
+            "zone_configs__zone",
+            "benefits",
+            "recommended_points",
+            "faqs",
+        )
+    )
+    combos_qs = (
+        Combo.objects.all()
+        .select_related("category", "journey")
+        .prefetch_related(
+            "media",
+            "tags",
+            "techniques",
+            "objectives",
+            "intensities",
+            "ingredients",
+            "ingredients__treatment_zone_config",
+            "ingredients__treatment_zone_config__zone",
+            "ingredients__treatment_zone_config__treatment",
+            "session_items",
+            "session_items__ingredient",
+            "session_items__ingredient__treatment_zone_config",
+            "session_items__ingredient__treatment_zone_config__zone",
+            "session_items__ingredient__treatment_zone_config__treatment",
+            "benefits",
+            "recommended_points",
+            "faqs",
+        )
+    )
+    journeys_qs = (
+        Journey.objects.all()
+        .select_related("category")
+        .prefetch_related(
+            "media",
+            "addons",
+            "benefits",
+            "recommended_points",
+            "faqs",
+        )
+    )
+    return [
+        ("treatments", treatments_qs, TreatmentSerializer),
+        ("combos", combos_qs, ComboSerializer),
+        ("journeys", journeys_qs, JourneySerializer),
+        ("categories", Category.objects.all(), CategorySerializer),
+        ("zones", Zone.objects.all(), ZoneSerializer),
+    ]
+
+
+def _filter_sections():
+    return [
+        ("techniques", Technique.objects.all(), TechniqueSerializer),
+        ("objectives", Objective.objects.all(), ObjectiveSerializer),
+        ("intensities", Intensity.objects.all(), IntensitySerializer),
+    ]
+
+
+def _iter_array(queryset, serializer_class, chunk_size) -> Iterator[bytes]:
+    yield b"["
+    last_pk = None
+    first = True
+    while True:
+        batch_qs = queryset.order_by("pk")
+        if last_pk is not None:
+            batch_qs = batch_qs.filter(pk__gt=last_pk)
+        batch = list(batch_qs[:chunk_size])
+        if not batch:
+            break
+        chunk = b",".join(render_json(serializer_class(obj).data) for obj in batch)
+        yield chunk if first else b"," + chunk
+        first = False
+        last_pk = batch[-1].pk
+    yield b"]"
+
+
+def _iter_object(sections, chunk_size) -> Iterator[bytes]:
+    for index, (name, queryset, serializer_class) in enumerate(sections):
+        yield (b"," if index else b"") + render_json(name) + b":"
+        yield from _iter_array(queryset, serializer_class, chunk_size)
+
+
+def iter_catalog_summary(chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the catalog summary JSON document piece by piece."""
+    yield b"{"
+    yield from _iter_object(_item_sections(), chunk_size)
+    yield b',"filters":{'
+    yield from _iter_object(_filter_sections(), chunk_size)
+    yield b"}}"
+
+
+# =========================
+# Snapshot precalculado
+# =========================
+
+
+def refresh_catalog_snapshot() -> dict:
+    """Rebuild and store the snapshot; returns ``{"etag", "body"}``."""
+    # Se libera antes de recalcular: un cambio durante el calculo agenda otro.
+    cache.delete(_SNAPSHOT_PENDING_KEY)
+    body = b"".join(iter_catalog_summary())
+    snapshot = {"etag": hashlib.sha1(body).hexdigest(), "body": body}
+    cache.set(_SNAPSHOT_KEY, snapshot, timeout=None)
+    return snapshot
+
+
+def get_catalog_snapshot() -> dict:
+    """Stored snapshot, built synchronously only when there is none yet."""
+    snapshot = cache.get(_SNAPSHOT_KEY)
+    if snapshot is None:
+        snapshot = refresh_catalog_snapshot()
+    return snapshot
+
+
+def schedule_catalog_snapshot_refresh() -> None:
+    """
+    Queue a debounced snapshot rebuild after the surrounding transaction
+    commits; changes inside ``CATALOG_SUMMARY_SNAPSHOT_DEBOUNCE`` share a run.
+    """
+    transaction.on_commit(_enqueue_refresh)
+
+
+def _enqueue_refresh() -> None:
+    from ..tasks import refresh_catalog_snapshot_task
+
+    delay = getattr(settings, "CATALOG_SUMMARY_SNAPSHOT_DEBOUNCE", 0)
+    if not cache.add(_SNAPSHOT_PENDING_KEY, 1, delay + 60):
+        return
+    refresh_catalog_snapshot_task.apply_async(countdown=delay)
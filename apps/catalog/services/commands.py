@@ -29,6 +29,23 @@ def _affected_combo_ids_by_treatments(treatment_ids: Collection[UUID] | None) ->
     )
 
 
+def _bump_listings_for(model, item_ids: list[UUID]) -> None:
+    """
+    Invalidate cached listings, filter summaries and the catalog snapshot after
+    queryset updates, which skip signals.
+    """
+    from .catalog_summary import schedule_catalog_snapshot_refresh
+    from .filters_summary import schedule_filters_summary_refresh
+    from .listing_cache import bump_listing_version
+
+    category_ids = set(
+        model.objects.filter(id__in=item_ids).values_list("category_id", flat=True)
+    )
+    bump_listing_version(*category_ids)
+    schedule_filters_summary_refresh(*category_ids)
+    schedule_catalog_snapshot_refresh()
+
+
 def remove_items_from_placements(
     item_kind: str,
     item_ids: Collection[UUID] | None,
@@ -107,6 +124,7 @@ def deactivate_combos(combo_ids: Collection[UUID] | None) -> int:
     with transaction.atomic():
         Combo.objects.filter(id__in=active_ids).update(is_active=False)
         cleanup_combo_deactivation(active_ids)
+        _bump_listings_for(Combo, active_ids)
 
     return len(active_ids)
 
@@ -138,6 +156,7 @@ def deactivate_treatments(treatment_ids: Collection[UUID] | None) -> int:
     with transaction.atomic():
         Treatment.objects.filter(id__in=active_ids).update(is_active=False)
         cleanup_treatment_deactivation(active_ids)
+        _bump_listings_for(Treatment, active_ids)
 
     return len(active_ids)
 
@@ -165,6 +184,7 @@ def deactivate_empty_combo(combo_id: UUID | None) -> bool:
         if combo.is_active:
             Combo.objects.filter(id=combo_id).update(is_active=False, sessions=0)
             cleanup_combo_deactivation([combo_id])
+            _bump_listings_for(Combo, [combo_id])
             return True
 
         if combo.sessions != 0:
@@ -1,5 +1,9 @@
 from typing import Optional, Dict, Any
+from uuid import UUID
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Min, Max
 from django.db.models.functions import Coalesce
 
@@ -21,6 +25,14 @@ from ..serializers import (
 )
 
 
+_SUMMARY_KEY = "catalog:filters:summary:{category_id}:{journey_id}"
+_PENDING_KEY = "catalog:filters:pending:{category_id}"
+
+
+def _summary_key(category_id, journey_id=None) -> str:
+    return _SUMMARY_KEY.format(category_id=category_id, journey_id=journey_id or "-")
+
+
 def _min_value(*values):
     vals = [v for v in values if v is not None]
     return min(vals) if vals else None
@@ -137,3 +149,85 @@ def build_filters_summary(
             "options": list(journeys_qs.values("id", "title", "slug")),
         },
     }
+
+
+# =========================
+# Resumen materializado
+# =========================
+
+
+def get_filters_summary(
+    *,
+    category: Optional[Category] = None,
+    journey: Optional[Journey] = None,
+) -> Dict[str, Any]:
+    """
+    Stored filters summary of a category or journey: a single cache lookup.
+
+    The entry is built on first read and afterwards only rewritten by
+    ``refresh_filters_summaries`` when the underlying catalog rows change.
+    """
+    category_id = category.id if category else getattr(journey, "category_id", None)
+    if category_id is None:
+        return {}
+    if journey and category and journey.category_id != category.id:
+        # Combinacion arbitraria de la query string: no se materializa.
+        return build_filters_summary(category=category, journey=journey)
+
+    key = _summary_key(category_id, journey.id if journey else None)
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_filters_summary(category=category, journey=journey)
+        cache.set(key, summary, timeout=None)
+    return summary
+
+
+def refresh_filters_summaries(category_id: UUID) -> int:
+    """
+    Rebuild the stored summaries of a category and all its journeys.
+
+    Returns the number of summaries written.
+    """
+    from .listing_cache import bump_listing_version
+
+    # Se libera antes de recalcular: un cambio durante el calculo agenda otro.
+    cache.delete(_PENDING_KEY.format(category_id=category_id))
+
+    category = Category.objects.filter(id=category_id).first()
+    if category is None:
+        cache.delete(_summary_key(category_id))
+        return 0
+
+    summaries = {_summary_key(category.id): build_filters_summary(category=category)}
+    for journey in Journey.objects.filter(category=category):
+        summaries[_summary_key(category.id, journey.id)] = build_filters_summary(
+            category=category, journey=journey
+        )
+    cache.set_many(summaries, timeout=None)
+    # Los listados cacheados embeben el resumen anterior.
+    bump_listing_version(category.id)
+    return len(summaries)
+
+
+def schedule_filters_summary_refresh(*category_ids: Optional[UUID]) -> None:
+    """
+    Queue a debounced recompute of the summaries of the given categories.
+
+    Every change inside the ``CATALOG_FILTERS_SUMMARY_DEBOUNCE`` window shares
+    a single Celery run, enqueued after the surrounding transaction commits.
+    """
+    for category_id in {category_id for category_id in category_ids if category_id}:
+        transaction.on_commit(
+            lambda category_id=category_id: _enqueue_refresh(category_id)
+        )
+
+
+def _enqueue_refresh(category_id: UUID) -> None:
+    from ..tasks import refresh_filters_summary_task
+
+    delay = getattr(settings, "CATALOG_FILTERS_SUMMARY_DEBOUNCE", 0)
+    # El margen cubre la latencia de la cola; si la tarea se pierde, la
+    # marca expira y el siguiente cambio vuelve a agendarla.
+    if not cache.add(_PENDING_KEY.format(category_id=category_id), 1, delay + 60):
+        return
+    refresh_filters_summary_task.apply_async(args=[str(category_id)], countdown=delay)
@@ -1,4 +1,13 @@
-from typing import Iterable, List, Optional, Dict, Tuple
+import hashlib
+import json
+from dataclasses import dataclass, field, replace
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, List, Optional, Dict, Sequence, Tuple
+from uuid import UUID
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import CharField, Count, F, Value
+from django.db.models.functions import Coalesce
 
 from ..models import Treatment, Combo, Journey
 from ..serializers.listing import (
@@ -6,6 +15,7 @@ from ..serializers.listing import (
     ComboListSerializer,
     JourneyListSerializer,
 )
+from .listing_page import ListingSource
 from .pricing import effective_price_for_item
 
 
@@ -20,6 +30,75 @@ SORT_OPTIONS = {
 }
 
 
+ITEM_KINDS = ("treatment", "combo", "journey")
+
+# Facetas tipo "array" (modo any) de build_filters_summary: ruta ORM por tipo de
+# item. Las jornadas no exponen zonas ni filtros en el listado, asi que su
+# fuente se descarta en cuanto se elige cualquier opcion de estas facetas.
+ARRAY_FACETS = {
+    "zone_ids": {
+        "treatment": "zone_configs__zone_id",
+        "combo": "ingredients__treatment_zone_config__zone_id",
+    },
+    "technique_ids": {"treatment": "techniques", "combo": "techniques"},
+    "objective_ids": {"treatment": "objectives", "combo": "objectives"},
+    "intensity_ids": {"treatment": "intensities", "combo": "intensities"},
+}
+
+# Facetas tipo "range": campo que se muestra en el listado para cada tipo.
+RANGE_FACETS = {
+    "duration": {
+        "treatment": "avg_duration",
+        "combo": "duration",
+        "journey": "min_duration",
+    },
+    "current_price": {
+        "treatment": "effective_price",
+        "combo": "current_price",
+        "journey": "effective_price",
+    },
+}
+
+KIND_FACET = "kind"
+
+
+@dataclass(frozen=True)
+class ListingFilters:
+    """Facet selection parsed from the query string of an items listing."""
+
+    kinds: Tuple[str, ...] = ()
+    arrays: Dict[str, Tuple[UUID, ...]] = field(default_factory=dict)
+    ranges: Dict[str, Tuple[Optional[Decimal], Optional[Decimal]]] = field(
+        default_factory=dict
+    )
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.kinds or self.arrays or self.ranges)
+
+    def without(self, facet: str) -> "ListingFilters":
+        if facet == KIND_FACET:
+            return replace(self, kinds=())
+        return replace(
+            self,
+            arrays={k: v for k, v in self.arrays.items() if k != facet},
+            ranges={k: v for k, v in self.ranges.items() if k != facet},
+        )
+
+    def cache_token(self) -> str:
+        if self.is_empty:
+            return "none"
+        payload = json.dumps(
+            {
+                "k": sorted(self.kinds),
+                "a": {k: sorted(str(v) for v in ids) for k, ids in self.arrays.items()},
+                "r": {k: [str(v) for v in bounds] for k, bounds in self.ranges.items()},
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
 def item_kind(item) -> Optional[str]:
     if isinstance(item, Treatment):
         return "treatment"
@@ -58,6 +137,135 @@ def sort_items(
     return _sort_by_price(items_list, reverse=False)
 
 
+def parse_listing_filters(query_params, error_cls=DjangoValidationError) -> ListingFilters:
+    """
+    Read the facets advertised by ``build_filters_summary`` from the query string.
+
+    Array facets accept repeated params or comma separated ids; ranges use
+    ``<field>_min`` / ``<field>_max``.
+    """
+    kinds = tuple(sorted(set(_param_values(query_params, KIND_FACET))))
+    invalid = [kind for kind in kinds if kind not in ITEM_KINDS]
+    if invalid:
+        raise error_cls({KIND_FACET: f"Invalid kind: {', '.join(invalid)}."})
+
+    arrays = {}
+    for facet in ARRAY_FACETS:
+        values = _param_values(query_params, facet)
+        if not values:
+            continue
+        try:
+            arrays[facet] = tuple(sorted({UUID(value) for value in values}, key=str))
+        except ValueError:
+            raise error_cls({facet: "Must be a list of valid UUIDs."})
+
+    ranges = {}
+    for facet in RANGE_FACETS:
+        bounds = []
+        for suffix in ("min", "max"):
+            name = f"{facet}_{suffix}"
+            raw = query_params.get(name)
+            if raw in (None, ""):
+                bounds.append(None)
+                continue
+            try:
+                bounds.append(Decimal(raw))
+            except InvalidOperation:
+                raise error_cls({name: "Must be a number."})
+        low, high = bounds
+        if low is None and high is None:
+            continue
+        if low is not None and high is not None and low > high:
+            raise error_cls({facet: f"{facet}_min must be <= {facet}_max."})
+        ranges[facet] = (low, high)
+
+    return ListingFilters(kinds=kinds, arrays=arrays, ranges=ranges)
+
+
+def filter_sources(
+    sources: Sequence[ListingSource],
+    filters: ListingFilters,
+) -> List[ListingSource]:
+    """Apply the facet selection to every listing source."""
+    filtered = []
+    for source in sources:
+        if filters.kinds and source.kind not in filters.kinds:
+            continue
+        if any(source.kind not in ARRAY_FACETS[facet] for facet in filters.arrays):
+            continue
+        filtered.append(
+            replace(source, queryset=_filter_queryset(source.kind, source.queryset, filters))
+        )
+    return filtered
+
+
+def build_facet_counts(
+    sources: Sequence[ListingSource],
+    filters: ListingFilters,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Count the items behind every option of the kind and array facets.
+
+    Each facet is counted against the other active facets only (so selecting a
+    zone does not zero out the other zones) and costs a single grouped query.
+    """
+    counts = {}
+
+    kind_sources = filter_sources(sources, filters.without(KIND_FACET))
+    counts[KIND_FACET] = _grouped_counts(
+        source.queryset.annotate(option=_kind_value(source.kind))
+        .values("option")
+        .annotate(n=Count("pk"))
+        for source in kind_sources
+    )
+
+    for facet, paths in ARRAY_FACETS.items():
+        facet_sources = filter_sources(sources, filters.without(facet))
+        counts[facet] = _grouped_counts(
+            source.queryset.values(option=F(paths[source.kind]))
+            .annotate(n=Count("pk", distinct=True))
+            for source in facet_sources
+            if source.kind in paths
+        )
+    return counts
+
+
+# Relaciones que leen los serializers del listado: sin ellas cada item del
+# listado dispara sus propias queries (categoria, jornada, zonas, media...).
+LIST_SELECT_RELATED = {
+    Treatment: ("category", "journey"),
+    Combo: ("category", "journey"),
+    Journey: ("category",),
+}
+LIST_PREFETCH_RELATED = {
+    Treatment: (
+        "media",
+        "zone_configs__zone",
+        "techniques",
+        "objectives",
+        "intensities",
+        "tags",
+    ),
+    Combo: (
+        "media",
+        "ingredients__treatment_zone_config__zone",
+        "techniques",
+        "objectives",
+        "intensities",
+        "tags",
+    ),
+    Journey: ("media",),
+}
+
+
+def with_list_relations(queryset):
+    """Load everything ``serialize_items`` touches for the queryset's model."""
+    model = queryset.model
+    return queryset.select_related(*LIST_SELECT_RELATED[model]).prefetch_related(
+        *LIST_PREFETCH_RELATED[model]
+    )
+
+
 def serialize_items(items: Iterable, context=None) -> List[dict]:
     data = []
     for item in items:
@@ -96,3 +304,47 @@ def _sort_by_price(items, reverse=False):
     with_price.sort(key=lambda pair: pair[0], reverse=reverse)
     sorted_items = [item for _, item in with_price]
     return sorted_items + without_price
+
+
+def _param_values(query_params, name) -> List[str]:
+    values = []
+    for raw in query_params.getlist(name):
+        values.extend(part.strip() for part in raw.split(",") if part.strip())
+    return values
+
+
+def _filter_queryset(kind, queryset, filters):
+    for facet, ids in filters.arrays.items():
+        path = ARRAY_FACETS[facet][kind]
+        matching = queryset.model.objects.filter(**{f"{path}__in": ids}).values("pk")
+        queryset = queryset.filter(pk__in=matching)
+
+    if "current_price" in filters.ranges and kind == "combo":
+        queryset = queryset.alias(current_price=Coalesce("promotional_price", "price"))
+    for facet, (low, high) in filters.ranges.items():
+        column = RANGE_FACETS[facet][kind]
+        if low is not None:
+            queryset = queryset.filter(**{f"{column}__gte": low})
+        if high is not None:
+            queryset = queryset.filter(**{f"{column}__lte": high})
+    return queryset
+
+
+def _kind_value(kind):
+    return Value(kind, output_field=CharField())
+
+
+def _grouped_counts(querysets) -> Dict[str, int]:
+    querysets = [qs.order_by().prefetch_related(None) for qs in querysets]
+    if not querysets:
+        return {}
+    query = querysets[0]
+    if len(querysets) > 1:
+        query = query.union(*querysets[1:], all=True)
+    counts = {}
+    for row in query:
+        if row["option"] is None:
+            continue
+        key = str(row["option"])
+        counts[key] = counts.get(key, 0) + row["n"]
+    return counts
@@ -0,0 +1,149 @@
+"""
+Versioned response cache for the public catalog listings.
+
+Every category owns a version counter stored in the default cache backend.
+Cached listings embed the current counters in their key, so bumping a counter
+makes every listing of that category unreachable without scanning keys; the
+stale entries simply expire. A global counter covers rows that are shared by
+all categories (tags, filters without category).
+"""
+
+import hashlib
+import time
+from typing import Any, Callable, Optional, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.renderers import render_json
+
+
+GLOBAL_SCOPE = "global"
+AUDIENCE_STAFF = "staff"
+AUDIENCE_PUBLIC = "public"
+
+_VERSION_KEY = "catalog:listing:version:{scope}"
+# Las entradas son (payload, body); el prefijo "r" deja atras las que solo
+# guardaban el payload.
+_ENTRY_KEY = (
+    "catalog:listing:r:{context}:{context_id}:{sort}:{audience}:{page}:{filters}"
+    ":g{global_version}:c{category_version}"
+)
+
+
+def _new_version() -> int:
+    # Seeded from the clock so a counter evicted by Redis never points back
+    # to entries cached under an older value.
+    return time.time_ns() // 1000
+
+
+def _scope(category_id: Optional[UUID]) -> str:
+    return str(category_id) if category_id else GLOBAL_SCOPE
+
+
+def _bump_scopes(scopes) -> None:
+    for scope in scopes:
+        key = _VERSION_KEY.format(scope=scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), timeout=None)
+
+
+def get_listing_versions(category_id: Optional[UUID]) -> Tuple[int, int]:
+    """Return the (global, category) version counters, creating them if missing."""
+    keys = [
+        _VERSION_KEY.format(scope=GLOBAL_SCOPE),
+        _VERSION_KEY.format(scope=_scope(category_id)),
+    ]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            version = _new_version()
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+        versions.append(version)
+    return versions[0], versions[1]
+
+
+def bump_listing_version(*category_ids: Optional[UUID]) -> None:
+    """
+    Invalidate the cached listings of the given categories.
+
+    Passing ``None`` bumps the global counter, which invalidates every listing.
+    The counters are bumped immediately and again after the surrounding
+    transaction commits, so a concurrent reader that cached pre-commit data
+    under the new version does not keep serving it.
+    """
+    scopes = {_scope(category_id) for category_id in category_ids}
+    if not scopes:
+        return
+    _bump_scopes(scopes)
+    transaction.on_commit(lambda: _bump_scopes(scopes))
+
+
+def bump_listing_context(context_kind: str, context_id: UUID) -> None:
+    """Invalidate the listings of an ordering context (category or journey)."""
+    from ..models import ItemOrder, Journey
+
+    if context_kind == ItemOrder.ContextKind.CATEGORY:
+        bump_listing_version(context_id)
+        return
+    bump_listing_version(
+        Journey.objects.filter(id=context_id)
+        .values_list("category_id", flat=True)
+        .first()
+    )
+
+
+def listing_audience(request) -> str:
+    user = getattr(request, "user", None)
+    if user and user.is_staff:
+        return AUDIENCE_STAFF
+    return AUDIENCE_PUBLIC
+
+
+def cached_listing(
+    *,
+    context: str,
+    context_id: UUID,
+    category_id: UUID,
+    sort_key: str,
+    audience: str,
+    build: Callable[[], Any],
+    page: str = "all",
+    filters: str = "none",
+) -> Tuple[Any, Optional[bytes]]:
+    """
+    Return the cached ``(payload, body)`` of a listing or build and store it.
+
+    ``body`` is the payload already rendered as JSON, so cache hits are sent
+    without encoding them again. ``CATALOG_LISTING_CACHE_TIMEOUT = 0``
+    disables the cache entirely and ``body`` is then None.
+    """
+    timeout = getattr(settings, "CATALOG_LISTING_CACHE_TIMEOUT", 0)
+    if not timeout:
+        return build(), None
+
+    global_version, category_version = get_listing_versions(category_id)
+    key = _ENTRY_KEY.format(
+        context=context,
+        context_id=context_id,
+        sort=sort_key,
+        audience=audience,
+        # Los cursores pueden ser largos; se resumen para acotar la clave.
+        page=hashlib.sha1(page.encode()).hexdigest()[:16],
+        filters=filters,
+        global_version=global_version,
+        category_version=category_version,
+    )
+    entry = cache.get(key)
+    if entry is None:
+        payload = build()
+        entry = (payload, render_json(payload))
+        cache.set(key, entry, timeout)
+    return entry
@@ -0,0 +1,320 @@
+"""
+Keyset pagination for the category and journey item listings.
+
+Treatments, combos and journeys are projected onto a common row shape and
+combined with ``UNION ALL`` so ordering, the cursor predicate and ``LIMIT`` run
+in Postgres. Only the rows of the requested page are then loaded as model
+instances (with their prefetches) and serialized.
+
+The cursor is the full sort key of the last row of the page, so each page is a
+single index-friendly range scan and stays stable when rows are inserted or
+removed before it.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    IntegerField,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Lower
+
+from ..models import ItemOrder
+
+
+MAX_PAGE_SIZE = 100
+
+KIND_RANK = {
+    ItemOrder.ItemKind.TREATMENT: 0,
+    ItemOrder.ItemKind.COMBO: 1,
+    ItemOrder.ItemKind.JOURNEY: 2,
+}
+_RANK_KIND = {rank: kind for kind, rank in KIND_RANK.items()}
+
+# (columna, descendente). Replica el orden de sort_items: los items sin precio
+# o sin orden manual van al final, y los empates se resuelven por tipo e id.
+_SORT_COLUMNS = {
+    "price_asc": (("price_missing", False), ("price_key", False)),
+    "price_desc": (("price_missing", False), ("price_key", True)),
+    "az": (("title_key", False),),
+    "za": (("title_key", True),),
+    "newest": (("created", True),),
+    "oldest": (("created", False),),
+    "manual": (
+        ("order_missing", False),
+        ("manual_order", False),
+        ("title_key", False),
+    ),
+}
+_TIEBREAK_COLUMNS = (("kind_rank", False), ("item_id", False))
+
+_COLUMN_PARSERS = {
+    "block": int,
+    "price_missing": int,
+    "price_key": Decimal,
+    "title_key": str,
+    "created": datetime.fromisoformat,
+    "order_missing": int,
+    "manual_order": int,
+    "kind_rank": int,
+    "item_id": UUID,
+}
+_ROW_COLUMNS = tuple(_COLUMN_PARSERS)
+
+# Python ordena los titulos por code point; la collation "C" hace lo mismo en
+# Postgres para que las paginas coincidan con el listado completo.
+_COLLATED_COLUMNS = {"title_key"}
+
+
+@dataclass(frozen=True)
+class ListingSource:
+    """One item table of a listing: the filtered queryset and its block."""
+
+    kind: str
+    queryset: QuerySet
+    block: int = 0
+
+
+@dataclass(frozen=True)
+class ListingPage:
+    items: List
+    next_cursor: Optional[str]
+
+
+def page_request(
+    query_params,
+    sort_key: str,
+    error_cls=DjangoValidationError,
+) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Read and validate ``cursor`` and ``page_size`` from the query string.
+
+    Returns ``(None, None)`` when neither is sent, which keeps the unpaginated
+    response for existing clients.
+    """
+    cursor = query_params.get("cursor") or None
+    raw_size = query_params.get("page_size")
+    if cursor is not None:
+        try:
+            decode_cursor(sort_key, cursor)
+        except ValueError as exc:
+            raise error_cls({"cursor": str(exc)})
+    if not raw_size:
+        if cursor is None:
+            return None, None
+        return cursor, settings.REST_FRAMEWORK.get("PAGE_SIZE") or MAX_PAGE_SIZE
+    try:
+        size = int(raw_size)
+    except (TypeError, ValueError):
+        raise error_cls({"page_size": "page_size must be an integer."})
+    if size < 1:
+        raise error_cls({"page_size": "page_size must be greater than 0."})
+    return cursor, min(size, MAX_PAGE_SIZE)
+
+
+def sort_columns(sort_key: str) -> Tuple[Tuple[str, bool], ...]:
+    return (("block", False),) + _SORT_COLUMNS[sort_key] + _TIEBREAK_COLUMNS
+
+
+def encode_cursor(sort_key: str, values: Sequence) -> str:
+    payload = json.dumps(
+        {"s": sort_key, "v": [_dump_value(value) for value in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(sort_key: str, cursor: str) -> list:
+    """Parse a cursor produced by ``encode_cursor``; raises ValueError if invalid."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        raw_values = payload["v"]
+        if payload["s"] != sort_key:
+            raise ValueError("Cursor was issued for a different sort.")
+        columns = sort_columns(sort_key)
+        if not isinstance(raw_values, list) or len(raw_values) != len(columns):
+            raise ValueError("Cursor does not match the sort columns.")
+        return [
+            _COLUMN_PARSERS[column](value)
+            for (column, _), value in zip(columns, raw_values)
+        ]
+    except (
+        binascii.Error,
+        UnicodeDecodeError,
+        json.JSONDecodeError,
+        InvalidOperation,
+        KeyError,
+        TypeError,
+    ) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def paginate_listing(
+    *,
+    sources: Sequence[ListingSource],
+    context_kind: str,
+    context_id: UUID,
+    sort_key: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> ListingPage:
+    """
+    Return the items of one listing page in display order.
+
+    ``limit=None`` returns the whole listing with the same ordering, so the
+    concatenation of every page equals the unpaginated response.
+    """
+    columns = sort_columns(sort_key)
+    after = decode_cursor(sort_key, cursor) if cursor else None
+    rows = _fetch_rows(
+        sources, context_kind, context_id, columns, after, limit
+    )
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_key, [last[column] for column, _ in columns])
+
+    return ListingPage(items=_load_items(sources, rows), next_cursor=next_cursor)
+
+
+def _dump_value(value):
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _branch_queryset(source: ListingSource, context_kind: str, context_id: UUID, manual: bool):
+    queryset = source.queryset.order_by().prefetch_related(None)
+    if source.kind == ItemOrder.ItemKind.COMBO:
+        price = Coalesce("promotional_price", "price")
+    else:
+        price = F("effective_price")
+
+    if manual:
+        order = Subquery(
+            ItemOrder.objects.filter(
+                context_kind=context_kind,
+                context_id=context_id,
+                item_kind=source.kind,
+                item_id=OuterRef("pk"),
+            ).values("order")[:1]
+        )
+        queryset = queryset.alias(manual_raw=order)
+        order_missing = Case(
+            When(manual_raw__isnull=True, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        manual_order = Coalesce("manual_raw", Value(0), output_field=IntegerField())
+    else:
+        order_missing = Value(0, output_field=IntegerField())
+        manual_order = Value(0, output_field=IntegerField())
+
+    return queryset.alias(price_raw=price).annotate(
+        block=Value(source.block, output_field=IntegerField()),
+        price_missing=Case(
+            When(price_raw__isnull=True, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+        price_key=Coalesce(
+            "price_raw",
+            Value(Decimal("0")),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        ),
+        title_key=Lower("title"),
+        created=F("created_at"),
+        order_missing=order_missing,
+        manual_order=manual_order,
+        kind_rank=Value(KIND_RANK[source.kind], output_field=IntegerField()),
+        item_id=F("pk"),
+    ).values(*_ROW_COLUMNS)
+
+
+def _column_ref(column: str) -> str:
+    ref = f'listing."{column}"'
+    if column in _COLLATED_COLUMNS:
+        ref += ' COLLATE "C"'
+    return ref
+
+
+def _fetch_rows(sources, context_kind, context_id, columns, after, limit):
+    if not sources:
+        return []
+
+    manual = any(column == "manual_order" for column, _ in columns)
+    branch_sql = []
+    params = []
+    for source in sources:
+        sql, branch_params = _branch_queryset(
+            source, context_kind, context_id, manual
+        ).query.sql_with_params()
+        branch_sql.append(f"({sql})")
+        params.extend(branch_params)
+
+    select = ", ".join(f'listing."{column}"' for column in _ROW_COLUMNS)
+    sql = f"SELECT {select} FROM ({' UNION ALL '.join(branch_sql)}) AS listing"
+
+    if after is not None:
+        clauses = []
+        for index, (column, descending) in enumerate(columns):
+            parts = [f"{_column_ref(prev)} = %s" for prev, _ in columns[:index]]
+            parts.append(f"{_column_ref(column)} {'<' if descending else '>'} %s")
+            clauses.append("(" + " AND ".join(parts) + ")")
+            params.extend(after[: index + 1])
+        sql += " WHERE " + " OR ".join(clauses)
+
+    order_by = ", ".join(
+        f"{_column_ref(column)} {'DESC' if descending else 'ASC'}"
+        for column, descending in columns
+    )
+    sql += f" ORDER BY {order_by}"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit + 1)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [dict(zip(_ROW_COLUMNS, row)) for row in cursor.fetchall()]
+
+
+def _load_items(sources, rows):
+    ids_by_kind = {}
+    for row in rows:
+        ids_by_kind.setdefault(_RANK_KIND[row["kind_rank"]], []).append(row["item_id"])
+
+    loaded = {}
+    for source in sources:
+        ids = ids_by_kind.get(source.kind)
+        if not ids:
+            continue
+        for obj in source.queryset.filter(pk__in=ids):
+            loaded[(source.kind, obj.pk)] = obj
+
+    items = []
+    for row in rows:
+        obj = loaded.get((_RANK_KIND[row["kind_rank"]], row["item_id"]))
+        if obj is not None:
+            items.append(obj)
+    return items
@@ -1,19 +1,23 @@
+from collections import defaultdict
 from decimal import Decimal
-from typing import Optional, Tuple
+from typing import Collection, Dict, Iterable, Optional, Tuple
+from uuid import UUID
 
-from ..models import Treatment, Combo, Journey
+from ..models import Treatment, TreatmentZoneConfig, Combo, Journey
 
 
-def price_pair_for_treatment(treatment: Treatment) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+# Columnas desnormalizadas que mantienen refresh_treatment_metrics/refresh_journey_metrics.
+ITEM_METRIC_FIELDS = ("effective_price", "base_price", "avg_duration", "min_duration")
+METRICS_BATCH_SIZE = 500
+
+PricePair = Tuple[Optional[Decimal], Optional[Decimal]]
+
+
+def best_price_pair(pairs: Iterable[PricePair]) -> PricePair:
+    """Return the (effective, base) pair with the lowest effective price."""
     best = None
     best_base = None
-    for zone_config in treatment.zone_configs.all():
-        effective = (
-            zone_config.promotional_price
-            if zone_config.promotional_price is not None
-            else zone_config.price
-        )
-        base = zone_config.price
+    for effective, base in pairs:
         if effective is None:
             continue
         if best is None or effective < best:
@@ -22,6 +26,19 @@ def price_pair_for_treatment(treatment: Treatment) -> Tuple[Optional[Decimal], O
     return best, best_base
 
 
+def _price_pair(price, promotional_price) -> PricePair:
+    if promotional_price is not None:
+        return promotional_price, price
+    return price, price
+
+
+def price_pair_for_treatment(treatment: Treatment) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+    return best_price_pair(
+        _price_pair(zone_config.price, zone_config.promotional_price)
+        for zone_config in treatment.zone_configs.all()
+    )
+
+
 def price_pair_for_combo(combo: Combo) -> Tuple[Optional[Decimal], Optional[Decimal]]:
     if combo.promotional_price is not None:
         return combo.promotional_price, combo.price
@@ -49,12 +66,11 @@ def price_pair_for_journey(journey: Journey) -> Tuple[Optional[Decimal], Optiona
 
 
 def effective_price_for_item(item):
-    if isinstance(item, Treatment):
-        return price_pair_for_treatment(item)[0]
+    """Effective price used for sorting; treatments and journeys read the stored column."""
+    if isinstance(item, (Treatment, Journey)):
+        return item.effective_price
     if isinstance(item, Combo):
         return price_pair_for_combo(item)[0]
-    if isinstance(item, Journey):
-        return price_pair_for_journey(item)[0]
     return None
 
 
@@ -92,3 +108,141 @@ def duration_for_journey(journey: Journey) -> Optional[float]:
         if dur is not None:
             durations.append(dur)
     return min(durations) if durations else None
+
+
+# =========================
+# Métricas desnormalizadas
+# =========================
+
+
+def treatment_metrics(zone_rows: Iterable[tuple]) -> Dict[str, object]:
+    """
+    Compute the stored metrics of a treatment.
+
+    ``zone_rows`` are ``(price, promotional_price, duration)`` tuples of its
+    zone configs. ``avg_duration`` is kept unrounded; readers round it.
+    """
+    zone_rows = list(zone_rows)
+    effective, base = best_price_pair(
+        _price_pair(price, promotional_price) for price, promotional_price, _ in zone_rows
+    )
+    durations = [duration for _, _, duration in zone_rows if duration]
+    return {
+        "effective_price": effective,
+        "base_price": base,
+        "avg_duration": sum(durations) / len(durations) if durations else None,
+        "min_duration": min(durations) if durations else None,
+    }
+
+
+def journey_metrics(
+    treatment_rows: Iterable[tuple],
+    combo_rows: Iterable[tuple],
+) -> Dict[str, object]:
+    """
+    Compute the stored metrics of a journey.
+
+    ``treatment_rows`` are ``(effective_price, base_price, avg_duration)`` of the
+    journey treatments (already refreshed) and ``combo_rows`` are
+    ``(price, promotional_price, duration)`` of its combos. Mirrors
+    ``price_pair_for_journey`` and ``duration_for_journey``.
+    """
+    treatment_rows = list(treatment_rows)
+    combo_rows = list(combo_rows)
+    pairs = [(effective, base) for effective, base, _ in treatment_rows]
+    pairs += [_price_pair(price, promo) for price, promo, _ in combo_rows]
+    effective, base = best_price_pair(pairs)
+
+    durations = [round(avg, 2) for _, _, avg in treatment_rows if avg is not None]
+    durations += [duration for _, _, duration in combo_rows if duration is not None]
+    return {
+        "effective_price": effective,
+        "base_price": base,
+        "avg_duration": sum(durations) / len(durations) if durations else None,
+        "min_duration": min(durations) if durations else None,
+    }
+
+
+def _chunks(ids, size=METRICS_BATCH_SIZE):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
+
+def refresh_treatment_metrics(treatment_ids: Collection[UUID] | None = None) -> int:
+    """
+    Recompute the stored metrics of the given treatments (all when None).
+
+    Runs one read and one bulk UPDATE per batch and does not emit signals.
+    """
+    if treatment_ids is None:
+        treatment_ids = Treatment.objects.values_list("id", flat=True)
+    ids = {treatment_id for treatment_id in treatment_ids if treatment_id}
+
+    updated = 0
+    for chunk in _chunks(ids):
+        zone_rows = defaultdict(list)
+        for treatment_id, price, promo, duration in TreatmentZoneConfig.objects.filter(
+            treatment_id__in=chunk
+        ).values_list("treatment_id", "price", "promotional_price", "duration"):
+            zone_rows[treatment_id].append((price, promo, duration))
+
+        rows = [
+            Treatment(id=treatment_id, **treatment_metrics(zone_rows[treatment_id]))
+            for treatment_id in chunk
+        ]
+        updated += Treatment.objects.bulk_update(rows, ITEM_METRIC_FIELDS)
+    return updated
+
+
+def refresh_journey_metrics(journey_ids: Collection[UUID] | None = None) -> int:
+    """
+    Recompute the stored metrics of the given journeys (all when None).
+
+    Reads the stored treatment metrics, so treatments must be refreshed first.
+    """
+    if journey_ids is None:
+        journey_ids = Journey.objects.values_list("id", flat=True)
+    ids = {journey_id for journey_id in journey_ids if journey_id}
+
+    updated = 0
+    for chunk in _chunks(ids):
+        treatment_rows = defaultdict(list)
+        for journey_id, effective, base, avg in Treatment.objects.filter(
+            journey_id__in=chunk
+        ).values_list("journey_id", "effective_price", "base_price", "avg_duration"):
+            treatment_rows[journey_id].append((effective, base, avg))
+
+        combo_rows = defaultdict(list)
+        for journey_id, price, promo, duration in Combo.objects.filter(
+            journey_id__in=chunk
+        ).values_list("journey_id", "price", "promotional_price", "duration"):
+            combo_rows[journey_id].append((price, promo, duration))
+
+        rows = [
+            Journey(
+                id=journey_id,
+                **journey_metrics(treatment_rows[journey_id], combo_rows[journey_id]),
+            )
+            for journey_id in chunk
+        ]
+        updated += Journey.objects.bulk_update(rows, ITEM_METRIC_FIELDS)
+    return updated
+
+
+def refresh_item_metrics(
+    *,
+    treatment_ids: Collection[UUID] = (),
+    journey_ids: Collection[UUID] = (),
+) -> None:
+    """Refresh treatments and then every journey affected by them."""
+    treatment_ids = {treatment_id for treatment_id in treatment_ids if treatment_id}
+    journey_ids = {journey_id for journey_id in journey_ids if journey_id}
+    if treatment_ids:
+        refresh_treatment_metrics(treatment_ids)
+        journey_ids.update(
+            Treatment.objects.filter(id__in=treatment_ids, journey__isnull=False)
+            .values_list("journey_id", flat=True)
+        )
+    if journey_ids:
+        refresh_journey_metrics(journey_ids)
@@ -1,4 +1,5 @@
 import threading
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
 from django.db.models.signals import (
     m2m_changed,
@@ -22,6 +23,11 @@ from .models import (
     ComboSessionItem,
     Category,
     Objective,
+    Technique,
+    Intensity,
+    Tag,
+    Zone,
+    ItemOrder,
 )
 from .models.placement import PlacementItem
 from .services.commands import (
@@ -31,6 +37,10 @@ from .services.commands import (
     deactivate_treatments as service_deactivate_treatments,
     remove_items_from_placements,
 )
+from .services.catalog_summary import schedule_catalog_snapshot_refresh
+from .services.filters_summary import schedule_filters_summary_refresh
+from .services.listing_cache import bump_listing_context, bump_listing_version
+from .services.pricing import refresh_item_metrics
 
 
 _tzc_delete_state = threading.local()
@@ -453,3 +463,220 @@ def capture_journey_media_old(sender, instance, **kwargs):
 def cleanup_journey_media_old(sender, instance, **kwargs):
     """Cleanup old media after new one is saved successfully."""
     cleanup_old_images_after_save(instance)
+
+
+# =========================
+# Listing cache invalidation
+# =========================
+
+
+def _related_category_id(instance, *path):
+    """
+    Resolve the category id through a chain of FK attributes.
+
+    Returns None (global bump) when the chain is already gone, e.g. while a
+    cascade delete is removing the parent rows.
+    """
+    obj = instance
+    try:
+        for attr in path:
+            obj = getattr(obj, attr)
+    except ObjectDoesNotExist:
+        return None
+    return getattr(obj, "category_id", None)
+
+
+@receiver(pre_save, sender=Treatment)
+@receiver(pre_save, sender=Combo)
+@receiver(pre_save, sender=Journey)
+def capture_previous_item_parents(sender, instance, **kwargs):
+    """
+    Remember the stored category/journey so moving an item refreshes both
+    sides (listing cache and journey metrics).
+    """
+    if not instance.pk:
+        return
+    fields = ["category_id"] if sender is Journey else ["category_id", "journey_id"]
+    previous = sender.objects.filter(pk=instance.pk).values(*fields).first() or {}
+    instance._previous_category_id = previous.get("category_id")
+    instance._previous_journey_id = previous.get("journey_id")
+
+
+@receiver(post_save, sender=Treatment)
+@receiver(post_save, sender=Combo)
+@receiver(post_save, sender=Journey)
+@receiver(post_delete, sender=Treatment)
+@receiver(post_delete, sender=Combo)
+@receiver(post_delete, sender=Journey)
+def invalidate_listing_on_item_change(sender, instance, **kwargs):
+    previous_category_id = getattr(instance, "_previous_category_id", None)
+    if previous_category_id and previous_category_id != instance.category_id:
+        bump_listing_version(instance.category_id, previous_category_id)
+    else:
+        bump_listing_version(instance.category_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_listing_on_category_change(sender, instance, **kwargs):
+    bump_listing_version(instance.id)
+
+
+@receiver(post_save, sender=Zone)
+@receiver(post_delete, sender=Zone)
+@receiver(post_save, sender=Technique)
+@receiver(post_delete, sender=Technique)
+@receiver(post_save, sender=Objective)
+@receiver(post_delete, sender=Objective)
+@receiver(post_save, sender=Intensity)
+@receiver(post_delete, sender=Intensity)
+def invalidate_listing_on_filter_change(sender, instance, **kwargs):
+    # Filters without category are shared, so they bump the global version.
+    bump_listing_version(instance.category_id)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_listing_on_tag_change(sender, instance, **kwargs):
+    bump_listing_version(None)
+
+
+@receiver(post_save, sender=TreatmentZoneConfig)
+@receiver(post_delete, sender=TreatmentZoneConfig)
+def invalidate_listing_on_tzc_change(sender, instance, **kwargs):
+    bump_listing_version(_related_category_id(instance, "treatment"))
+
+
+@receiver(post_save, sender=ComboIngredient)
+@receiver(post_delete, sender=ComboIngredient)
+def invalidate_listing_on_ingredient_change(sender, instance, **kwargs):
+    bump_listing_version(_related_category_id(instance, "combo"))
+
+
+@receiver(post_save, sender=TreatmentMedia)
+@receiver(post_delete, sender=TreatmentMedia)
+def invalidate_listing_on_treatment_media_change(sender, instance, **kwargs):
+    bump_listing_version(_related_category_id(instance, "treatment"))
+
+
+@receiver(post_save, sender=ComboMedia)
+@receiver(post_delete, sender=ComboMedia)
+def invalidate_listing_on_combo_media_change(sender, instance, **kwargs):
+    bump_listing_version(_related_category_id(instance, "combo"))
+
+
+@receiver(post_save, sender=JourneyMedia)
+@receiver(post_delete, sender=JourneyMedia)
+def invalidate_listing_on_journey_media_change(sender, instance, **kwargs):
+    bump_listing_version(_related_category_id(instance, "journey"))
+
+
+@receiver(post_save, sender=ItemOrder)
+@receiver(post_delete, sender=ItemOrder)
+def invalidate_listing_on_item_order_change(sender, instance, **kwargs):
+    bump_listing_context(instance.context_kind, instance.context_id)
+
+
+@receiver(m2m_changed, sender=Treatment.techniques.through)
+@receiver(m2m_changed, sender=Treatment.objectives.through)
+@receiver(m2m_changed, sender=Treatment.intensities.through)
+@receiver(m2m_changed, sender=Treatment.tags.through)
+@receiver(m2m_changed, sender=Combo.techniques.through)
+@receiver(m2m_changed, sender=Combo.objectives.through)
+@receiver(m2m_changed, sender=Combo.intensities.through)
+@receiver(m2m_changed, sender=Combo.tags.through)
+@receiver(m2m_changed, sender=Journey.addons.through)
+def invalidate_listing_on_m2m_change(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    # On reverse changes the instance is the filter/tag; without category it is global.
+    bump_listing_version(getattr(instance, "category_id", None))
+
+
+# =========================
+# Métricas desnormalizadas
+# =========================
+
+
+def _item_journey_ids(instance):
+    return {instance.journey_id, getattr(instance, "_previous_journey_id", None)}
+
+
+@receiver(post_save, sender=TreatmentZoneConfig)
+@receiver(post_delete, sender=TreatmentZoneConfig)
+def refresh_metrics_on_tzc_change(sender, instance, **kwargs):
+    refresh_item_metrics(treatment_ids=[instance.treatment_id])
+
+
+@receiver(post_save, sender=Treatment)
+def refresh_metrics_on_treatment_save(sender, instance, **kwargs):
+    # Recalcula también el propio treatment: save() escribe los valores en memoria.
+    refresh_item_metrics(
+        treatment_ids=[instance.id],
+        journey_ids=_item_journey_ids(instance),
+    )
+
+
+@receiver(post_delete, sender=Treatment)
+@receiver(post_save, sender=Combo)
+@receiver(post_delete, sender=Combo)
+def refresh_journey_metrics_on_item_change(sender, instance, **kwargs):
+    refresh_item_metrics(journey_ids=_item_journey_ids(instance))
+
+
+@receiver(post_save, sender=Journey)
+def refresh_metrics_on_journey_save(sender, instance, **kwargs):
+    refresh_item_metrics(journey_ids=[instance.id])
+
+
+# =========================
+# Resumen de filtros
+# =========================
+
+
+@receiver(post_save, sender=Zone)
+@receiver(post_delete, sender=Zone)
+@receiver(post_save, sender=Technique)
+@receiver(post_delete, sender=Technique)
+@receiver(post_save, sender=Objective)
+@receiver(post_delete, sender=Objective)
+@receiver(post_save, sender=Intensity)
+@receiver(post_delete, sender=Intensity)
+def refresh_filters_summary_on_option_change(sender, instance, **kwargs):
+    schedule_filters_summary_refresh(instance.category_id)
+
+
+@receiver(post_save, sender=TreatmentZoneConfig)
+@receiver(post_delete, sender=TreatmentZoneConfig)
+def refresh_filters_summary_on_tzc_change(sender, instance, **kwargs):
+    schedule_filters_summary_refresh(_related_category_id(instance, "treatment"))
+
+
+@receiver(post_save, sender=Treatment)
+@receiver(post_save, sender=Combo)
+@receiver(post_save, sender=Journey)
+@receiver(post_delete, sender=Treatment)
+@receiver(post_delete, sender=Combo)
+@receiver(post_delete, sender=Journey)
+def refresh_filters_summary_on_item_change(sender, instance, **kwargs):
+    # Activar, mover o borrar items cambia los rangos y la lista de jornadas.
+    schedule_filters_summary_refresh(
+        instance.category_id, getattr(instance, "_previous_category_id", None)
+    )
+
+
+# =========================
+# Snapshot del catálogo
+# =========================
+
+
+@receiver(post_save)
+@receiver(post_delete)
+@receiver(m2m_changed)
+def refresh_catalog_snapshot_on_change(sender, **kwargs):
+    meta = getattr(sender, "_meta", None)
+    if meta is None or meta.app_label != "catalog":
+        return
+    if kwargs.get("action", "post_").startswith("pre_"):
+        return
+    schedule_catalog_snapshot_refresh()
@@ -0,0 +1,15 @@
+from celery import shared_task
+
+from .services.catalog_summary import refresh_catalog_snapshot
+from .services.filters_summary import refresh_filters_summaries
+
+
+@shared_task
+def refresh_filters_summary_task(category_id):
+    return refresh_filters_summaries(category_id)
+
+
+@shared_task
+def refresh_catalog_snapshot_task():
+    snapshot = refresh_catalog_snapshot()
+    return snapshot["etag"]
@@ -1,3 +1,4 @@
+import json
 import uuid
 
 import pytest
@@ -7,11 +8,15 @@ from rest_framework.test import APIClient
 from apps.catalog.models import (
     Category,
     Combo,
+    ItemOrder,
     Journey,
+    Technique,
     Treatment,
     TreatmentZoneConfig,
     Zone,
 )
+from apps.catalog.services.catalog_summary import refresh_catalog_snapshot
+from apps.catalog.services.listing import SORT_OPTIONS, sort_items
 
 
 def _uid(prefix: str) -> str:
@@ -1030,6 +1035,267 @@ def test_journey_items_excludes_inactive_treatments_and_combos():
     assert kinds.count("combo") == 1
 
 
+@pytest.mark.django_db
+def test_category_items_are_cached_and_invalidated_on_catalog_edit(
+    django_assert_max_num_queries,
+):
+    client = APIClient()
+    category = _make_category()
+    zone = _make_zone(category)
+    treatment = _make_treatment(category)
+    TreatmentZoneConfig.objects.create(
+        treatment=treatment, zone=zone, duration=30, price=100
+    )
+    url = f"/api/v1/catalog/categories/{category.id}/items/"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    with django_assert_max_num_queries(1):
+        cached = client.get(url)
+    assert cached.data == first.data
+
+    treatment.title = _uid("Renamed")
+    treatment.save()
+
+    resp = client.get(url)
+    assert [item["title"] for item in resp.data["items"]] == [treatment.title]
+
+
+@pytest.mark.django_db
+def test_journey_items_cache_invalidated_by_zone_config_price_change():
+    client = APIClient()
+    category = _make_category()
+    zone = _make_zone(category)
+    journey = _make_journey(category)
+    treatment = Treatment.objects.create(
+        category=category,
+        journey=journey,
+        slug=_uid("treat-slug"),
+        title=_uid("Treatment"),
+    )
+    tzc = TreatmentZoneConfig.objects.create(
+        treatment=treatment, zone=zone, duration=30, price=100
+    )
+    url = f"/api/v1/catalog/journeys/{journey.id}/items/"
+
+    resp = client.get(url)
+    assert resp.data["items"][0]["price"] == 100
+
+    tzc.promotional_price = 80
+    tzc.save()
+
+    resp = client.get(url)
+    assert resp.data["items"][0]["price"] == 80
+    assert resp.data["items"][0]["price_without_discount"] == 100
+
+
+def _walk_item_pages(client, url, params):
+    items = []
+    cursor = None
+    while True:
+        page_params = dict(params, page_size=2)
+        if cursor:
+            page_params["cursor"] = cursor
+        resp = client.get(url, page_params)
+        assert resp.status_code == 200
+        assert len(resp.data["items"]) <= 2
+        items.extend(resp.data["items"])
+        cursor = resp.data["next_cursor"]
+        if not cursor:
+            return items
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("sort_key", sorted(SORT_OPTIONS))
+def test_category_items_keyset_pages_match_full_listing(sort_key):
+    client = APIClient()
+    # Own throttle bucket: the walk issues several requests per sort.
+    client.force_authenticate(_make_staff())
+    category = _make_category()
+    zone = _make_zone(category)
+    products = []
+    for price in (300, 100, 200):
+        treatment = _make_treatment(category)
+        TreatmentZoneConfig.objects.create(
+            treatment=treatment, zone=zone, duration=30, price=price
+        )
+        products.append(treatment)
+    products.append(_make_treatment(category))
+    for price in (150, 250):
+        products.append(
+            Combo.objects.create(
+                category=category,
+                slug=_uid("combo-slug"),
+                title=_uid("Combo"),
+                price=price,
+                sessions=1,
+            )
+        )
+    journeys = [_make_journey(category), _make_journey(category)]
+    for order, item in enumerate((products[4], products[2])):
+        ItemOrder.objects.create(
+            context_kind=ItemOrder.ContextKind.CATEGORY,
+            context_id=category.id,
+            item_kind="combo" if isinstance(item, Combo) else "treatment",
+            item_id=item.id,
+            order=order,
+        )
+    url = f"/api/v1/catalog/categories/{category.id}/items/"
+
+    full = client.get(url, {"sort": sort_key})
+    assert full.status_code == 200
+    assert "next_cursor" not in full.data
+    full_ids = [str(item["id"]) for item in full.data["items"]]
+
+    for obj in products:
+        obj.refresh_from_db()
+    order_map = {
+        (o.item_kind, str(o.item_id)): o.order
+        for o in ItemOrder.objects.filter(context_id=category.id)
+    }
+    expected = [str(obj.id) for obj in sort_items(products, sort_key, order_map)]
+    assert full_ids[: len(products)] == expected
+    assert set(full_ids[len(products):]) == {str(j.id) for j in journeys}
+
+    paged = _walk_item_pages(client, url, {"sort": sort_key})
+    assert [str(item["id"]) for item in paged] == full_ids
+
+
+@pytest.mark.django_db
+def test_journey_items_pagination_rejects_invalid_cursor_and_page_size():
+    client = APIClient()
+    category = _make_category()
+    journey = _make_journey(category)
+    url = f"/api/v1/catalog/journeys/{journey.id}/items/"
+
+    resp = client.get(url, {"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+    assert "cursor" in resp.data
+
+    resp = client.get(url, {"page_size": "0"})
+    assert resp.status_code == 400
+    assert "page_size" in resp.data
+
+    resp = client.get(url, {"page_size": "5"})
+    assert resp.status_code == 200
+    assert resp.data["items"] == []
+    assert resp.data["next_cursor"] is None
+
+
+@pytest.mark.django_db
+def test_category_items_apply_facet_filters_and_return_counts():
+    client = APIClient()
+    client.force_authenticate(_make_staff())
+    category = _make_category()
+    zone_a = _make_zone(category)
+    zone_b = _make_zone(category)
+    technique = Technique.objects.create(name=_uid("tech"), category=category)
+    cheap = _make_treatment(category)
+    cheap_tzc = TreatmentZoneConfig.objects.create(
+        treatment=cheap, zone=zone_a, duration=30, price=100
+    )
+    cheap.techniques.add(technique)
+    expensive = _make_treatment(category)
+    TreatmentZoneConfig.objects.create(
+        treatment=expensive, zone=zone_b, duration=90, price=500
+    )
+    combo = Combo.objects.create(
+        category=category,
+        slug=_uid("combo-slug"),
+        title=_uid("Combo"),
+        price=300,
+        sessions=1,
+        duration=60,
+    )
+    combo.ingredients.create(treatment_zone_config=cheap_tzc)
+    _make_journey(category)
+    url = f"/api/v1/catalog/categories/{category.id}/items/"
+
+    resp = client.get(url)
+    assert len(resp.data["items"]) == 4
+    assert resp.data["facet_counts"]["kind"] == {
+        "treatment": 2,
+        "combo": 1,
+        "journey": 1,
+    }
+    assert resp.data["facet_counts"]["zone_ids"] == {
+        str(zone_a.id): 2,
+        str(zone_b.id): 1,
+    }
+
+    resp = client.get(url, {"zone_ids": str(zone_a.id)})
+    assert {str(item["id"]) for item in resp.data["items"]} == {
+        str(cheap.id),
+        str(combo.id),
+    }
+    counts = resp.data["facet_counts"]
+    # La faceta activa se cuenta sin su propio filtro.
+    assert counts["zone_ids"] == {str(zone_a.id): 2, str(zone_b.id): 1}
+    assert counts["kind"] == {"treatment": 1, "combo": 1}
+    assert counts["technique_ids"] == {str(technique.id): 1}
+
+    resp = client.get(
+        url,
+        {
+            "zone_ids": f"{zone_a.id},{zone_b.id}",
+            "current_price_min": "200",
+            "duration_max": "60",
+        },
+    )
+    assert [str(item["id"]) for item in resp.data["items"]] == [str(combo.id)]
+
+    resp = client.get(url, {"technique_ids": str(technique.id), "kind": "treatment"})
+    assert [str(item["id"]) for item in resp.data["items"]] == [str(cheap.id)]
+
+    resp = client.get(url, {"zone_ids": "nope"})
+    assert resp.status_code == 400
+    assert "zone_ids" in resp.data
+
+
+@pytest.mark.django_db
+def test_catalog_summary_serves_snapshot_with_etag_and_streams_live_catalog(
+    django_capture_on_commit_callbacks,
+    monkeypatch,
+):
+    client = APIClient()
+    client.force_authenticate(_make_staff())
+    url = "/api/v1/catalog/catalog/"
+    # Las tareas corren en linea: el snapshot se regenera al confirmar.
+    monkeypatch.setattr(
+        "apps.catalog.tasks.refresh_catalog_snapshot_task.apply_async",
+        lambda **kwargs: refresh_catalog_snapshot(),
+    )
+    monkeypatch.setattr(
+        "apps.catalog.tasks.refresh_filters_summary_task.apply_async",
+        lambda **kwargs: None,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        category = _make_category()
+        treatment = _make_treatment(category)
+
+    resp = client.get(url)
+    assert resp.status_code == 200
+    etag = resp["ETag"]
+    data = json.loads(resp.content)
+    assert str(treatment.id) in {item["id"] for item in data["treatments"]}
+    assert set(data["filters"]) == {"techniques", "objectives", "intensities"}
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    stream = client.get(url, {"stream": "1"})
+    assert stream.streaming
+    assert json.loads(b"".join(stream.streaming_content)) == data
+
+    with django_capture_on_commit_callbacks(execute=True):
+        other = _make_treatment(category)
+
+    resp = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp["ETag"] != etag
+    assert str(other.id) in {item["id"] for item in json.loads(resp.content)["treatments"]}
+
+
 @pytest.mark.django_db
 def test_api_journey_patch_supports_nested_benefits_recommended_points_and_faqs():
     client = APIClient()
@@ -5,6 +5,7 @@ from unittest import mock
 import pytest
 from django.contrib.admin.sites import AdminSite
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.test import RequestFactory
 
 from apps.catalog.admin.combo import ComboAdmin, ComboAdminForm
@@ -32,6 +33,11 @@ from apps.catalog.services.combo_sessions import (
     serialize_session_items_for_validation,
 )
 from apps.catalog.services.commands import deactivate_treatments
+from apps.catalog.services.filters_summary import (
+    get_filters_summary,
+    refresh_filters_summaries,
+)
+from apps.catalog.services.pricing import price_pair_for_journey
 
 
 def _uid(prefix: str) -> str:
@@ -1042,3 +1048,104 @@ def test_treatment_admin_form_allows_active_with_related_name_zone_prefix():
     )
 
     assert form.is_valid() is True
+
+
+@pytest.mark.django_db
+def test_treatment_and_journey_metrics_follow_zone_config_and_combo_changes():
+    category = _make_category()
+    journey = _make_journey(category)
+    treatment = _make_treatment(category)
+    treatment.journey = journey
+    treatment.save()
+    tzc_a = TreatmentZoneConfig.objects.create(
+        treatment=treatment, zone=_make_zone(category), duration=30, price=100
+    )
+    TreatmentZoneConfig.objects.create(
+        treatment=treatment,
+        zone=_make_zone(category),
+        duration=45,
+        price=150,
+        promotional_price=90,
+    )
+
+    treatment.refresh_from_db()
+    assert treatment.effective_price == 90
+    assert treatment.base_price == 150
+    assert treatment.avg_duration == 37.5
+    assert treatment.min_duration == 30
+
+    combo = _make_combo(category)
+    combo.journey = journey
+    combo.promotional_price = 80
+    combo.duration = 20
+    combo.save()
+
+    journey.refresh_from_db()
+    assert journey.effective_price == 80
+    assert journey.base_price == 200
+    assert journey.min_duration == 20
+    assert (journey.effective_price, journey.base_price) == price_pair_for_journey(
+        journey
+    )
+
+    combo.delete()
+    tzc_a.delete()
+
+    journey.refresh_from_db()
+    assert journey.effective_price == 90
+    assert journey.min_duration == 45
+
+
+@pytest.mark.django_db
+def test_backfill_item_metrics_command_recomputes_stored_columns():
+    category = _make_category()
+    treatment = _make_treatment(category)
+    TreatmentZoneConfig.objects.create(
+        treatment=treatment, zone=_make_zone(category), duration=30, price=100
+    )
+    Treatment.objects.filter(id=treatment.id).update(
+        effective_price=None, base_price=None, avg_duration=None, min_duration=None
+    )
+
+    call_command("backfill_item_metrics", stdout=mock.MagicMock())
+
+    treatment.refresh_from_db()
+    assert treatment.effective_price == 100
+    assert treatment.avg_duration == 30
+
+
+@pytest.mark.django_db
+def test_filters_summary_is_stored_and_recomputed_once_per_debounce_window(
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+    monkeypatch,
+):
+    monkeypatch.setattr(
+        "apps.catalog.tasks.refresh_catalog_snapshot_task.apply_async",
+        lambda **kwargs: None,
+    )
+    category = _make_category()
+    _make_zone(category)
+    journey = Journey.objects.create(
+        category=category, slug=_uid("journey-slug"), title=_uid("Journey")
+    )
+
+    summary = get_filters_summary(category=category)
+    assert len(summary["zones"]["options"]) == 1
+    with django_assert_num_queries(0):
+        assert get_filters_summary(category=category) == summary
+
+    with mock.patch(
+        "apps.catalog.tasks.refresh_filters_summary_task.apply_async"
+    ) as apply_async:
+        with django_capture_on_commit_callbacks(execute=True):
+            _make_zone(category)
+            _make_zone(category)
+    assert apply_async.call_count == 1
+    # Hasta que corre la tarea se sigue sirviendo el resumen guardado.
+    assert len(get_filters_summary(category=category)["zones"]["options"]) == 1
+
+    assert refresh_filters_summaries(category.id) == 2
+    assert len(get_filters_summary(category=category)["zones"]["options"]) == 3
+    journey_summary = get_filters_summary(journey=journey)
+    assert len(journey_summary["zones"]["options"]) == 3
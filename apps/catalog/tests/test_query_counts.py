@@ -0,0 +1,286 @@
+"""
+Query-count regression tests for the public catalog routes.
+
+Every route is measured cold (caches cleared) over a seeded catalog and again
+after doubling it: the count must stay under the bound and must not grow with
+the number of items, which is what an N+1 looks like.
+"""
+
+import uuid
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.catalog.models import (
+    Category,
+    Combo,
+    ComboIngredient,
+    ComboSessionItem,
+    Intensity,
+    ItemOrder,
+    Journey,
+    Objective,
+    Tag,
+    Technique,
+    Treatment,
+    TreatmentZoneConfig,
+    Zone,
+)
+from apps.catalog.models.gallery import ComboMedia, JourneyMedia, TreatmentMedia
+from apps.catalog.models.placement import Placement, PlacementItem
+
+
+ITEMS_PER_KIND = 5
+
+# Techo de queries en frio de cada ruta. Si una ruta necesita mas, subir el
+# numero a conciencia en el mismo PR que agrega la query.
+QUERY_BOUNDS = {
+    "category_items": 35,
+    "category_items_manual": 35,
+    "journey_items": 37,
+    "placement_items": 14,
+    "treatment_detail": 12,
+    "treatment_by_slug": 13,
+    "combo_detail": 19,
+    "combo_by_slug": 20,
+    "journey_detail": 7,
+    "journey_by_slug": 8,
+    "filters_summary": 9,
+}
+
+
+def _uid(prefix: str) -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture(autouse=True)
+def _public_client_settings(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_CLASSES": [],
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class _Catalog:
+    """A category with a journey, filters and fully populated items."""
+
+    def __init__(self):
+        self.category = Category.objects.create(name=_uid("cat"), slug=_uid("cat-slug"))
+        self.journey = Journey.objects.create(
+            slug=_uid("journey-slug"), title=_uid("Journey"), category=self.category
+        )
+        self.placement = Placement.objects.create(slug=_uid("placement"), title="Home")
+        self.zones = [
+            Zone.objects.create(name=_uid("zone"), category=self.category)
+            for _ in range(2)
+        ]
+        self.tags = [Tag.objects.create(name=_uid("tag")) for _ in range(2)]
+        self.technique = Technique.objects.create(
+            name=_uid("technique"), category=self.category
+        )
+        self.objective = Objective.objects.create(
+            name=_uid("objective"), category=self.category
+        )
+        self.intensity = Intensity.objects.create(
+            name=_uid("intensity"), category=self.category
+        )
+        self.treatments = []
+        self.combos = []
+        self.journeys = [self.journey]
+
+    def add_items(self, count: int) -> None:
+        for _ in range(count):
+            treatment = self._add_treatment()
+            self._add_combo(treatment)
+            journey = Journey.objects.create(
+                slug=_uid("journey-slug"), title=_uid("Journey"), category=self.category
+            )
+            JourneyMedia.objects.create(journey=journey, media="catalog/j.jpg")
+            journey.addons.add(treatment)
+            journey.benefits.create(title="Beneficio")
+            journey.faqs.create(question="Pregunta", answer="Respuesta")
+            self.journeys.append(journey)
+            for kind, item in (
+                (PlacementItem.ItemKind.TREATMENT, treatment),
+                (PlacementItem.ItemKind.JOURNEY, journey),
+            ):
+                PlacementItem.objects.create(
+                    placement=self.placement,
+                    item_kind=kind,
+                    item_id=item.id,
+                    order=self.placement.items.count(),
+                )
+                ItemOrder.objects.create(
+                    context_kind=ItemOrder.ContextKind.CATEGORY,
+                    context_id=self.category.id,
+                    item_kind=kind,
+                    item_id=item.id,
+                    order=len(self.treatments),
+                )
+
+    def _add_treatment(self) -> Treatment:
+        treatment = Treatment.objects.create(
+            category=self.category,
+            journey=self.journey,
+            slug=_uid("treatment-slug"),
+            title=_uid("Treatment"),
+        )
+        for index, zone in enumerate(self.zones):
+            TreatmentZoneConfig.objects.create(
+                treatment=treatment, zone=zone, duration=30, price=100 + index
+            )
+        for order in range(2):
+            TreatmentMedia.objects.create(
+                treatment=treatment, media="catalog/t.jpg", order=order
+            )
+        treatment.tags.add(*self.tags)
+        treatment.techniques.add(self.technique)
+        treatment.objectives.add(self.objective)
+        treatment.intensities.add(self.intensity)
+        treatment.benefits.create(title="Beneficio")
+        treatment.recommended_points.create(title="Recomendado")
+        treatment.faqs.create(question="Pregunta", answer="Respuesta")
+        self.treatments.append(treatment)
+        return treatment
+
+    def _add_combo(self, treatment: Treatment) -> Combo:
+        combo = Combo.objects.create(
+            category=self.category,
+            journey=self.journey,
+            slug=_uid("combo-slug"),
+            title=_uid("Combo"),
+            price=200,
+            sessions=1,
+        )
+        for config in treatment.zone_configs.all():
+            ingredient = ComboIngredient.objects.create(
+                combo=combo, treatment_zone_config=config
+            )
+            ComboSessionItem.objects.create(
+                combo=combo, session_index=1, ingredient=ingredient
+            )
+        ComboMedia.objects.create(combo=combo, media="catalog/c.jpg")
+        combo.tags.add(*self.tags)
+        combo.techniques.add(self.technique)
+        combo.benefits.create(title="Beneficio")
+        combo.faqs.create(question="Pregunta", answer="Respuesta")
+        self.combos.append(combo)
+        return combo
+
+
+def _routes(catalog: _Catalog) -> dict:
+    treatment = catalog.treatments[0]
+    combo = catalog.combos[0]
+    journey = catalog.journeys[1]
+    return {
+        "category_items": f"/api/v1/catalog/categories/{catalog.category.id}/items/",
+        "category_items_manual": (
+            f"/api/v1/catalog/categories/{catalog.category.id}/items/?sort=manual"
+        ),
+        "journey_items": f"/api/v1/catalog/journeys/{catalog.journey.id}/items/",
+        "placement_items": f"/api/v1/catalog/placements/{catalog.placement.slug}/items/",
+        "treatment_detail": f"/api/v1/catalog/treatments/{treatment.id}/",
+        "treatment_by_slug": f"/api/v1/catalog/treatments/by-slug/{treatment.slug}/",
+        "combo_detail": f"/api/v1/catalog/combos/{combo.id}/",
+        "combo_by_slug": f"/api/v1/catalog/combos/by-slug/{combo.slug}/",
+        "journey_detail": f"/api/v1/catalog/journeys/{journey.id}/",
+        "journey_by_slug": f"/api/v1/catalog/journeys/by-slug/{journey.slug}/",
+        "filters_summary": (
+            f"/api/v1/catalog/filters/summary/?category={catalog.category.id}"
+        ),
+    }
+
+
+def _count_queries(url: str) -> int:
+    # En frio: el payload de los listados queda cacheado entre requests.
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = APIClient().get(url)
+    assert response.status_code == 200, (url, response.status_code)
+    return len(queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_public_catalog_routes_query_counts_are_bounded_and_constant():
+    catalog = _Catalog()
+    catalog.add_items(ITEMS_PER_KIND)
+    small = {name: _count_queries(url) for name, url in _routes(catalog).items()}
+
+    catalog.add_items(ITEMS_PER_KIND)
+    large = {name: _count_queries(url) for name, url in _routes(catalog).items()}
+
+    assert set(small) == set(QUERY_BOUNDS)
+    for name, bound in QUERY_BOUNDS.items():
+        assert small[name] <= bound, (name, small[name], bound)
+    assert large == small
+
+
+@pytest.mark.django_db
+def test_listing_routes_serve_every_seeded_item():
+    catalog = _Catalog()
+    catalog.add_items(ITEMS_PER_KIND)
+    client = APIClient()
+
+    category_items = client.get(_routes(catalog)["category_items"]).data["items"]
+    journey_items = client.get(_routes(catalog)["journey_items"]).data["items"]
+    placement_items = client.get(_routes(catalog)["placement_items"]).data["items"]
+
+    # 5 tratamientos, 5 combos y 5 jornadas (+ la jornada de los items).
+    assert len(category_items) == 3 * ITEMS_PER_KIND + 1
+    assert len(journey_items) == 2 * ITEMS_PER_KIND
+    assert len(placement_items) == 2 * ITEMS_PER_KIND
+    treatment = next(item for item in category_items if item["kind"] == "treatment")
+    assert treatment["category"]["id"] == catalog.category.id
+    assert treatment["journey"]["id"] == catalog.journey.id
+    assert len(treatment["zones"]) == 2
+    assert treatment["media_count"] == 2
+
+
+@pytest.mark.django_db
+def test_async_public_routes_match_the_sync_responses():
+    catalog = _Catalog()
+    catalog.add_items(2)
+    routes = _routes(catalog)
+    client = AsyncClient()
+
+    for name in (
+        "category_items",
+        "treatment_by_slug",
+        "combo_by_slug",
+        "journey_by_slug",
+    ):
+        url = routes[name]
+        assert iscoroutinefunction(resolve(url).func), name
+        cache.clear()
+        response = async_to_sync(client.get)(url)
+        assert response.status_code == 200, name
+        assert response.json() == APIClient().get(url).json(), name
+
+    missing = async_to_sync(client.get)("/api/v1/catalog/treatments/by-slug/nope/")
+    assert missing.status_code == 404
+
+
+@pytest.mark.django_db
+def test_cached_listings_are_sent_prerendered():
+    catalog = _Catalog()
+    catalog.add_items(2)
+    routes = _routes(catalog)
+    client = APIClient()
+
+    for name in ("category_items", "journey_items"):
+        cache.clear()
+        cold = client.get(routes[name])
+        warm = client.get(routes[name])
+        assert warm.prerendered_body is not None, name
+        assert cold.content == warm.content == warm.prerendered_body, name
+        assert warm.content == JSONRenderer().render(warm.data), name
@@ -0,0 +1,68 @@
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+
+from core.api import AsyncAPIView
+
+from ..permissions import IsAdminOrReadOnly
+from .combo import ComboViewSet
+from .journey import JourneyViewSet
+from .treatment import TreatmentViewSet
+
+
+class ItemBySlugView(AsyncAPIView):
+    """
+    Async ``<items>/by-slug/<slug>/`` detail of treatments, combos and journeys.
+
+    Queryset and serializer come from ``viewset_class``, so staff and public
+    users get exactly what the viewset detail returns.
+    """
+
+    permission_classes = [IsAdminOrReadOnly]
+    viewset_class = None
+
+    def get_viewset(self):
+        return self.viewset_class(
+            request=self.request,
+            args=self.args,
+            kwargs=self.kwargs,
+            format_kwarg=self.format_kwarg,
+            action="retrieve",
+        )
+
+    async def get(self, request, slug):
+        viewset = self.get_viewset()
+        category_slug = request.query_params.get("category")
+        category_id = request.query_params.get("category_id")
+        qs = viewset.get_queryset().filter(slug__iexact=slug)
+        if category_slug:
+            qs = qs.filter(category__slug__iexact=category_slug)
+        elif category_id:
+            qs = qs.filter(category_id=category_id)
+        count = await qs.acount()
+        if count == 0:
+            raise NotFound(detail="No encontrado.")
+        if count > 1:
+            raise ValidationError(
+                {
+                    "slug": [
+                        "Hay más de un resultado para este slug. Envíe category o category_id."
+                    ]
+                }
+            )
+        item = await qs.afirst()
+        # Los serializers anidados pueden consultar la DB: se arman en el hilo sync.
+        data = await sync_to_async(lambda: viewset.get_serializer(item).data)()
+        return Response(data)
+
+
+class TreatmentBySlugView(ItemBySlugView):
+    viewset_class = TreatmentViewSet
+
+
+class ComboBySlugView(ItemBySlugView):
+    viewset_class = ComboViewSet
+
+
+class JourneyBySlugView(ItemBySlugView):
+    viewset_class = JourneyViewSet
@@ -1,108 +1,50 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
 from rest_framework.views import APIView
-from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
-from apps.catalog.models import (
-    Treatment,
-    Combo,
-    Journey,
-    Category,
-    Zone,
-    Technique,
-    Objective,
-    Intensity,
-)
-from apps.catalog.serializers import (
-    TreatmentSerializer,
-    ComboSerializer,
-    JourneySerializer,
-    CategorySerializer,
-    ZoneSerializer,
-    TechniqueSerializer,
-    ObjectiveSerializer,
-    IntensitySerializer,
+
+from apps.catalog.services.catalog_summary import (
+    get_catalog_snapshot,
+    iter_catalog_summary,
 )
 
 
+async def _aiter_chunks(iterator):
+    # Bajo ASGI Django acumula los iteradores sincronos antes de enviarlos;
+    # se consumen en el hilo de sync para que el streaming sea real.
+    while True:
+        chunk = await sync_to_async(next, thread_sensitive=True)(iterator, None)
+        if chunk is None:
+            break
+        yield chunk
+
+
 class CatalogSummaryView(APIView):
+    """
+    Full catalog for the admin SPA.
+
+    By default serves the precomputed snapshot with an ETag (``304`` on a
+    matching ``If-None-Match``). ``?stream=1`` streams the live catalog
+    instead, serializing it in chunks.
+    """
+
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        treatments_qs = (
-            Treatment.objects.all()
-            .select_related("category", "journey")
-            .prefetch_related(
-                "media",
-                "tags",
-                "techniques",
-                "objectives",
-                "intensities",
-                "zone_configs",
-                "zone_configs__zone",
-                "benefits",
-                "recommended_points",
-                "faqs",
-            )
-        )
-        combos_qs = (
-            Combo.objects.all()
-            .select_related("category", "journey")
-            .prefetch_related(
-                "media",
-                "tags",
-                "techniques",
-                "objectives",
-                "intensities",
-                "ingredients",
-                "ingredients__treatment_zone_config",
-                "ingredients__treatment_zone_config__zone",
-                "ingredients__treatment_zone_config__treatment",
-                "session_items",
-                "session_items__ingredient",
-                "session_items__ingredient__treatment_zone_config",
-                "session_items__ingredient__treatment_zone_config__zone",
-                "session_items__ingredient__treatment_zone_config__treatment",
-                "benefits",
-                "recommended_points",
-                "faqs",
-            )
-        )
-        journeys_qs = (
-            Journey.objects.all()
-            .select_related("category")
-            .prefetch_related(
-                "media",
-                "addons",
-                "benefits",
-                "recommended_points",
-                "faqs",
-            )
-        )
-        categories_qs = Category.objects.all()
-        zones_qs = Zone.objects.all()
-        techniques_qs = Technique.objects.all()
-        objectives_qs = Objective.objects.all()
-        intensities_qs = Intensity.objects.all()
-
-        treatments = TreatmentSerializer(treatments_qs, many=True).data
-        combos = ComboSerializer(combos_qs, many=True).data
-        journeys = JourneySerializer(journeys_qs, many=True).data
-        categories = CategorySerializer(categories_qs, many=True).data
-        zones = ZoneSerializer(zones_qs, many=True).data
-        techniques = TechniqueSerializer(techniques_qs, many=True).data
-        objectives = ObjectiveSerializer(objectives_qs, many=True).data
-        intensities = IntensitySerializer(intensities_qs, many=True).data
+        if request.query_params.get("stream") in ("1", "true"):
+            chunks = iter_catalog_summary()
+            if isinstance(request._request, ASGIRequest):
+                chunks = _aiter_chunks(chunks)
+            return StreamingHttpResponse(chunks, content_type="application/json")
 
-        return Response(
-            {
-                "treatments": treatments,
-                "combos": combos,
-                "journeys": journeys,
-                "categories": categories,
-                "zones": zones,
-                "filters": {
-                    "techniques": techniques,
-                    "objectives": objectives,
-                    "intensities": intensities,
-                },
-            }
-        )
+        snapshot = get_catalog_snapshot()
+        etag = quote_etag(snapshot["etag"])
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(snapshot["body"], content_type="application/json")
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
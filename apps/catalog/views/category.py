@@ -1,13 +1,24 @@
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404
 from rest_framework import viewsets
-from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
-from rest_framework.response import Response
+
+from core.api import AsyncAPIView, PrerenderedResponse
 
 from ..models import Category, Treatment, Combo, Journey, ItemOrder
 from ..serializers import CategorySerializer
 from ..permissions import IsAdminOrReadOnly
-from ..services.listing import SORT_OPTIONS, sort_items, serialize_items
-from ..services.filters_summary import build_filters_summary
+from ..services.listing import (
+    SORT_OPTIONS,
+    build_facet_counts,
+    filter_sources,
+    parse_listing_filters,
+    serialize_items,
+    with_list_relations,
+)
+from ..services.filters_summary import get_filters_summary
+from ..services.listing_cache import cached_listing, listing_audience
+from ..services.listing_page import ListingSource, page_request, paginate_listing
 
 
 class CategoryViewSet(viewsets.ModelViewSet):
@@ -15,64 +26,77 @@ class CategoryViewSet(viewsets.ModelViewSet):
     serializer_class = CategorySerializer
     permission_classes = [IsAdminOrReadOnly]
 
-    @action(detail=True, methods=["get"], url_path="items")
-    def items(self, request, pk=None):
-        category = self.get_object()
+
+class CategoryItemsView(AsyncAPIView):
+    """Async ``categories/<pk>/items/`` listing, served from the listing cache."""
+
+    permission_classes = [IsAdminOrReadOnly]
+
+    async def get(self, request, pk):
+        category = await aget_object_or_404(Category, pk=pk)
         sort_key = request.query_params.get("sort") or category.default_sort
         if sort_key == "most_sold":
             raise ValidationError({"sort": "most_sold is not available yet."})
         if sort_key not in SORT_OPTIONS:
             sort_key = "price_asc"
-
-        treatments = Treatment.objects.filter(
-            category=category, is_active=True
-        ).prefetch_related(
-            "media",
-            "zone_configs",
-            "zone_configs__zone",
-            "techniques",
-            "objectives",
-            "intensities",
-            "tags",
-        )
-        combos = Combo.objects.filter(
-            category=category, is_active=True
-        ).prefetch_related(
-            "media",
-            "ingredients__treatment_zone_config__zone",
-            "techniques",
-            "objectives",
-            "intensities",
-            "tags",
-        )
-        journeys = Journey.objects.filter(category=category).prefetch_related(
-            "media",
-            "treatments__zone_configs",
-            "combos",
+        cursor, limit = page_request(
+            request.query_params, sort_key, error_cls=ValidationError
         )
+        filters = parse_listing_filters(request.query_params, error_cls=ValidationError)
 
-        orders = ItemOrder.objects.filter(
-            context_kind=ItemOrder.ContextKind.CATEGORY, context_id=category.id
+        # Hit de cache o armado completo del listado: un solo salto al hilo sync.
+        payload, body = await sync_to_async(cached_listing)(
+            context="category",
+            context_id=category.id,
+            category_id=category.id,
+            sort_key=sort_key,
+            audience=listing_audience(request),
+            page=f"{limit}:{cursor}" if limit else "all",
+            filters=filters.cache_token(),
+            build=lambda: self._build_items_payload(
+                category, sort_key, filters, cursor, limit
+            ),
         )
-        order_map = {(o.item_kind, str(o.item_id)): o.order for o in orders}
-
-        product_items = sort_items(list(treatments) + list(combos), sort_key, order_map)
-        journey_items = sort_items(list(journeys), sort_key, order_map)
+        return PrerenderedResponse(payload, body)
 
+    def _build_items_payload(
+        self, category, sort_key, filters, cursor=None, limit=None
+    ):
+        treatments = with_list_relations(
+            Treatment.objects.filter(category=category, is_active=True)
+        )
+        combos = with_list_relations(
+            Combo.objects.filter(category=category, is_active=True)
+        )
+        journeys_first = category.journey_position == Category.JourneyPosition.FIRST
+        product_block = 1 if journeys_first else 0
+        sources = [
+            ListingSource(ItemOrder.ItemKind.TREATMENT, treatments, product_block),
+            ListingSource(ItemOrder.ItemKind.COMBO, combos, product_block),
+        ]
         if category.include_journeys:
-            if category.journey_position == Category.JourneyPosition.FIRST:
-                items = journey_items + product_items
-            else:
-                items = product_items + journey_items
-        else:
-            items = product_items
+            journeys = with_list_relations(Journey.objects.filter(category=category))
+            sources.append(
+                ListingSource(ItemOrder.ItemKind.JOURNEY, journeys, 1 - product_block)
+            )
 
-        return Response(
-            {
-                "items": serialize_items(items, context=self.get_serializer_context()),
-                "filters": build_filters_summary(category=category),
-                "include_journeys": category.include_journeys,
-                "journey_position": category.journey_position,
-                "sort": sort_key,
-            }
+        page = paginate_listing(
+            sources=filter_sources(sources, filters),
+            context_kind=ItemOrder.ContextKind.CATEGORY,
+            context_id=category.id,
+            sort_key=sort_key,
+            cursor=cursor,
+            limit=limit,
         )
+
+        payload = {
+            "items": serialize_items(page.items, context=self.get_serializer_context()),
+            "filters": get_filters_summary(category=category),
+            "facet_counts": build_facet_counts(sources, filters),
+            "include_journeys": category.include_journeys,
+            "journey_position": category.journey_position,
+            "sort": sort_key,
+        }
+        if limit:
+            payload["next_cursor"] = page.next_cursor
+        return payload
@@ -1,6 +1,5 @@
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
 
 from ..models import Combo
@@ -68,26 +67,3 @@ class ComboViewSet(GalleryOrderingMixin, viewsets.ModelViewSet):
         combo = self.get_object()
         media_items = combo.media.order_by("order")
         return Response(self.media_serializer_class(media_items, many=True).data)
-
-    @action(detail=False, methods=["get"], url_path=r"by-slug/(?P<slug>[^/.]+)")
-    def by_slug(self, request, slug=None):
-        category_slug = request.query_params.get("category")
-        category_id = request.query_params.get("category_id")
-        qs = self.get_queryset().filter(slug__iexact=slug)
-        if category_slug:
-            qs = qs.filter(category__slug__iexact=category_slug)
-        elif category_id:
-            qs = qs.filter(category_id=category_id)
-        count = qs.count()
-        if count == 0:
-            raise NotFound(detail="No encontrado.")
-        if count > 1:
-            raise ValidationError(
-                {
-                    "slug": [
-                        "Hay más de un resultado para este slug. Envíe category o category_id."
-                    ]
-                }
-            )
-        combo = qs.first()
-        return Response(self.get_serializer(combo).data)
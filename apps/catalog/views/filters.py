@@ -10,7 +10,7 @@ from ..serializers import (
     TagSerializer,
 )
 from ..permissions import IsAdminOrReadOnly
-from ..services.filters_summary import build_filters_summary
+from ..services.filters_summary import get_filters_summary
 
 
 class TechniqueViewSet(viewsets.ModelViewSet):
@@ -74,5 +74,5 @@ class FiltersSummaryView(APIView):
             if journey and not category:
                 category = journey.category
 
-        summary = build_filters_summary(category=category, journey=journey)
+        summary = get_filters_summary(category=category, journey=journey)
         return Response({"filters": summary})
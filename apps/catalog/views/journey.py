@@ -1,8 +1,10 @@
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from core.api import PrerenderedResponse
+
 from ..models import Journey, Treatment, Combo, ItemOrder
 from ..serializers import (
     JourneySerializer,
@@ -11,8 +13,17 @@ from ..serializers import (
 )
 from ..permissions import IsAdminOrReadOnly
 from .mixins import GalleryOrderingMixin
-from ..services.listing import SORT_OPTIONS, sort_items, serialize_items
-from ..services.filters_summary import build_filters_summary
+from ..services.listing import (
+    SORT_OPTIONS,
+    build_facet_counts,
+    filter_sources,
+    parse_listing_filters,
+    serialize_items,
+    with_list_relations,
+)
+from ..services.filters_summary import get_filters_summary
+from ..services.listing_cache import cached_listing, listing_audience
+from ..services.listing_page import ListingSource, page_request, paginate_listing
 
 
 class JourneyViewSet(GalleryOrderingMixin, viewsets.ModelViewSet):
@@ -52,60 +63,54 @@ class JourneyViewSet(GalleryOrderingMixin, viewsets.ModelViewSet):
             raise ValidationError({"sort": "most_sold is not available yet."})
         if sort_key not in SORT_OPTIONS:
             sort_key = "price_asc"
-
-        treatments = Treatment.objects.filter(
-            journey=journey, is_active=True
-        ).prefetch_related(
-            "media",
-            "zone_configs",
-            "techniques",
-            "objectives",
-            "intensities",
-            "tags",
-        )
-        combos = Combo.objects.filter(journey=journey, is_active=True).prefetch_related(
-            "media",
-            "ingredients__treatment_zone_config__zone",
-            "techniques",
-            "objectives",
-            "intensities",
-            "tags",
+        cursor, limit = page_request(
+            request.query_params, sort_key, error_cls=ValidationError
         )
+        filters = parse_listing_filters(request.query_params, error_cls=ValidationError)
 
-        orders = ItemOrder.objects.filter(
-            context_kind=ItemOrder.ContextKind.JOURNEY, context_id=journey.id
+        payload, body = cached_listing(
+            context="journey",
+            context_id=journey.id,
+            category_id=journey.category_id,
+            sort_key=sort_key,
+            audience=listing_audience(request),
+            page=f"{limit}:{cursor}" if limit else "all",
+            filters=filters.cache_token(),
+            build=lambda: self._build_items_payload(
+                journey, sort_key, filters, cursor, limit
+            ),
         )
-        order_map = {(o.item_kind, str(o.item_id)): o.order for o in orders}
+        return PrerenderedResponse(payload, body)
 
-        items = sort_items(list(treatments) + list(combos), sort_key, order_map)
+    def _build_items_payload(
+        self, journey, sort_key, filters, cursor=None, limit=None
+    ):
+        treatments = with_list_relations(
+            Treatment.objects.filter(journey=journey, is_active=True)
+        )
+        combos = with_list_relations(
+            Combo.objects.filter(journey=journey, is_active=True)
+        )
 
-        return Response(
-            {
-                "items": serialize_items(items, context=self.get_serializer_context()),
-                "filters": build_filters_summary(journey=journey),
-                "sort": sort_key,
-            }
+        sources = [
+            ListingSource(ItemOrder.ItemKind.TREATMENT, treatments),
+            ListingSource(ItemOrder.ItemKind.COMBO, combos),
+        ]
+        page = paginate_listing(
+            sources=filter_sources(sources, filters),
+            context_kind=ItemOrder.ContextKind.JOURNEY,
+            context_id=journey.id,
+            sort_key=sort_key,
+            cursor=cursor,
+            limit=limit,
         )
 
-    @action(detail=False, methods=["get"], url_path=r"by-slug/(?P<slug>[^/.]+)")
-    def by_slug(self, request, slug=None):
-        category_slug = request.query_params.get("category")
-        category_id = request.query_params.get("category_id")
-        qs = self.get_queryset().filter(slug__iexact=slug)
-        if category_slug:
-            qs = qs.filter(category__slug__iexact=category_slug)
-        elif category_id:
-            qs = qs.filter(category_id=category_id)
-        count = qs.count()
-        if count == 0:
-            raise NotFound(detail="No encontrado.")
-        if count > 1:
-            raise ValidationError(
-                {
-                    "slug": [
-                        "Hay más de un resultado para este slug. Envíe category o category_id."
-                    ]
-                }
-            )
-        journey = qs.first()
-        return Response(self.get_serializer(journey).data)
+        payload = {
+            "items": serialize_items(page.items, context=self.get_serializer_context()),
+            "filters": get_filters_summary(journey=journey),
+            "facet_counts": build_facet_counts(sources, filters),
+            "sort": sort_key,
+        }
+        if limit:
+            payload["next_cursor"] = page.next_cursor
+        return payload
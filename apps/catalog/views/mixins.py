@@ -1,6 +1,8 @@
 from rest_framework import status
 from rest_framework.response import Response
 
+from ..services.catalog_summary import schedule_catalog_snapshot_refresh
+from ..services.listing_cache import bump_listing_version
 from ..utils.gallery import reorder_gallery
 
 
@@ -16,6 +18,9 @@ class GalleryOrderingMixin:
             reorder_gallery(obj, ordered_ids)
         except Exception as exc:
             return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        # The cover media of listings depends on gallery order.
+        bump_listing_version(getattr(obj, "category_id", None))
+        schedule_catalog_snapshot_refresh()
 
         serializer_cls = self.media_serializer_class
         if serializer_cls:
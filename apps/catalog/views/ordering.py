@@ -6,6 +6,7 @@ from rest_framework.response import Response
 from ..models import ItemOrder, Category, Journey, Treatment, Combo
 from ..permissions import IsAdminOrReadOnly
 from ..serializers import ItemOrderSerializer
+from ..services.listing_cache import bump_listing_context
 
 
 ITEM_KIND_MODELS = {
@@ -86,6 +87,8 @@ class ItemOrderViewSet(viewsets.ModelViewSet):
             ItemOrder.objects.bulk_create(to_create)
         if to_update:
             ItemOrder.objects.bulk_update(to_update, ["order"])
+        # bulk_create/bulk_update do not emit signals.
+        bump_listing_context(context_kind, context_id)
 
         ordered_qs = ItemOrder.objects.filter(
             context_kind=context_kind, context_id=context_id
@@ -6,7 +6,7 @@ from rest_framework.response import Response
 from ..models import Placement, PlacementItem, Treatment, Combo, Journey
 from ..permissions import IsAdminOrReadOnly
 from ..serializers import PlacementSerializer, PlacementItemSerializer
-from ..services.listing import serialize_items
+from ..services.listing import serialize_items, with_list_relations
 
 
 ITEM_KIND_MODELS = {
@@ -137,7 +137,7 @@ class PlacementViewSet(viewsets.ModelViewSet):
             model = ITEM_KIND_MODELS.get(kind)
             if not model:
                 continue
-            for obj in model.objects.filter(id__in=ids):
+            for obj in with_list_relations(model.objects.filter(id__in=ids)):
                 item_map[(kind, str(obj.id))] = obj
 
         for item in items_qs:
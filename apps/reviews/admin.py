@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import GoogleReviewCache, ManualReview
+from .models import GoogleReviewCache, ManualReview, ReviewStats
 
 
 @admin.register(ManualReview)
@@ -35,6 +35,28 @@ class GoogleReviewCacheAdmin(admin.ModelAdmin):
         "update_time",
         "fetched_at",
         "raw_payload",
+        "content_hash",
         "created_at",
         "updated_at",
     )
+
+
+@admin.register(ReviewStats)
+class ReviewStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "provider",
+        "review_count",
+        "average_rating",
+        "rating_5",
+        "rating_4",
+        "rating_3",
+        "rating_2",
+        "rating_1",
+        "last_fetched_at",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -5,3 +5,7 @@ class ReviewsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.reviews"
     verbose_name = "Reviews"
+
+    def ready(self) -> None:
+        # Agregados de rating y cache del payload publico
+        from . import signals  # noqa
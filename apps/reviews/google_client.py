@@ -0,0 +1,175 @@
+"""
+HTTP client for the Google Business Profile reviews API.
+
+A single keep-alive ``requests.Session`` is shared per process, with retries
+and exponential backoff on 429/5xx (honouring ``Retry-After``). The OAuth
+access token obtained from the refresh token is cached in the default cache
+backend for its ``expires_in`` lifetime, so every worker reuses it.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Any, Iterator
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.dateparse import parse_datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+REVIEWS_API_URL = (
+    "https://mybusiness.googleapis.com/v4/accounts/{account_id}"
+    "/locations/{location_id}/reviews"
+)
+OAUTH_TOKEN_URL = "https://oauth2.googleapis.com/token"
+
+HTTP_TIMEOUT = 20
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Margen para no usar un token que vence en medio de la paginacion.
+TOKEN_EXPIRY_MARGIN = 60
+
+_TOKEN_KEY = "reviews:google:access_token"
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+class GoogleReviewsError(Exception):
+    pass
+
+
+def get_session() -> requests.Session:
+    """Process-wide session; connections to Google are reused across syncs."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=HTTP_RETRIES,
+                    backoff_factor=HTTP_BACKOFF_FACTOR,
+                    status_forcelist=HTTP_RETRY_STATUSES,
+                    # El refresh del token es idempotente, se puede reintentar.
+                    allowed_methods=frozenset({"GET", "POST"}),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(max_retries=retry))
+                session.headers["Accept"] = "application/json"
+                _session = session
+    return _session
+
+
+def _request(method: str, url: str, **kwargs) -> requests.Response:
+    try:
+        return get_session().request(method, url, timeout=HTTP_TIMEOUT, **kwargs)
+    except requests.RequestException as exc:
+        raise GoogleReviewsError(f"Google no respondio: {exc}") from exc
+
+
+def get_access_token() -> str:
+    static_access_token = settings.REVIEWS_GOOGLE_ACCESS_TOKEN
+    if static_access_token:
+        return static_access_token
+
+    access_token = cache.get(_TOKEN_KEY)
+    if access_token:
+        return access_token
+
+    refresh_token = settings.REVIEWS_GOOGLE_REFRESH_TOKEN
+    client_id = settings.REVIEWS_GOOGLE_CLIENT_ID
+    client_secret = settings.REVIEWS_GOOGLE_CLIENT_SECRET
+    if not (refresh_token and client_id and client_secret):
+        raise GoogleReviewsError(
+            "Faltan credenciales de Google OAuth para obtener access token."
+        )
+
+    response = _request(
+        "POST",
+        OAUTH_TOKEN_URL,
+        data={
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "refresh_token": refresh_token,
+            "grant_type": "refresh_token",
+        },
+    )
+    if response.status_code >= 400:
+        raise GoogleReviewsError(
+            f"OAuth token error ({response.status_code}): {response.text}"
+        )
+
+    payload = response.json()
+    access_token = payload.get("access_token")
+    if not access_token:
+        raise GoogleReviewsError("Google OAuth no devolvio access_token.")
+
+    try:
+        expires_in = int(payload.get("expires_in") or 0)
+    except (TypeError, ValueError):
+        expires_in = 0
+    timeout = expires_in - TOKEN_EXPIRY_MARGIN
+    if timeout > 0:
+        cache.set(_TOKEN_KEY, access_token, timeout)
+    return access_token
+
+
+def invalidate_access_token() -> None:
+    cache.delete(_TOKEN_KEY)
+
+
+def _get_reviews_page(url: str, params: dict[str, Any]) -> dict[str, Any]:
+    response = _request(
+        "GET", url, params=params, headers=_auth_headers(get_access_token())
+    )
+    if response.status_code == 401 and not settings.REVIEWS_GOOGLE_ACCESS_TOKEN:
+        # Token revocado antes de expirar: se pide uno nuevo una sola vez.
+        invalidate_access_token()
+        response = _request(
+            "GET", url, params=params, headers=_auth_headers(get_access_token())
+        )
+    if response.status_code >= 400:
+        raise GoogleReviewsError(
+            f"Google Reviews API error ({response.status_code}): {response.text}"
+        )
+    return response.json()
+
+
+def _auth_headers(access_token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+def iter_reviews(
+    *,
+    account_id: str,
+    location_id: str,
+    page_size: int,
+    updated_since: datetime | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield the raw reviews of a location, newest ``updateTime`` first.
+
+    With ``updated_since`` paging stops at the first review updated before it:
+    the API orders by ``updateTime desc``, so everything after it is already
+    cached.
+    """
+    url = REVIEWS_API_URL.format(account_id=account_id, location_id=location_id)
+    params: dict[str, Any] = {"pageSize": page_size, "orderBy": "updateTime desc"}
+
+    while True:
+        payload = _get_reviews_page(url, params)
+        for raw_review in payload.get("reviews", []):
+            if updated_since is not None:
+                update_time = parse_datetime(str(raw_review.get("updateTime") or ""))
+                if update_time is not None and update_time < updated_since:
+                    return
+            yield raw_review
+        next_page_token = payload.get("nextPageToken")
+        if not next_page_token:
+            return
+        params["pageToken"] = next_page_token
@@ -15,6 +15,11 @@ class Command(BaseCommand):
             default=settings.REVIEWS_PROVIDER,
             help="Provider a sincronizar.",
         )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Repagina todas las reviews de Google en vez de solo las nuevas.",
+        )
 
     def handle(self, *args, **options):
         provider = options["provider"]
@@ -29,13 +34,14 @@ class Command(BaseCommand):
             return
 
         try:
-            result = sync_google_reviews()
+            result = sync_google_reviews(full=options["full"])
         except GoogleReviewsError as exc:
             raise CommandError(str(exc)) from exc
 
         self.stdout.write(
             self.style.SUCCESS(
                 f"Sync Google completado. Recibidas={result['received']} "
-                f"Sincronizadas={result['synced']}"
+                f"Sincronizadas={result['synced']} Nuevas={result['inserted']} "
+                f"Actualizadas={result['updated']} Sin cambios={result['unchanged']}"
             )
         )
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0002_googlereviewcache_content_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReviewStats",
+            fields=[
+                (
+                    "provider",
+                    models.CharField(
+                        choices=[("manual", "Manual"), ("google", "Google")],
+                        max_length=20,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("review_count", models.PositiveIntegerField(default=0)),
+                ("rating_sum", models.PositiveIntegerField(default=0)),
+                ("rating_1", models.PositiveIntegerField(default=0)),
+                ("rating_2", models.PositiveIntegerField(default=0)),
+                ("rating_3", models.PositiveIntegerField(default=0)),
+                ("rating_4", models.PositiveIntegerField(default=0)),
+                ("rating_5", models.PositiveIntegerField(default=0)),
+                ("last_fetched_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "review stats",
+                "verbose_name_plural": "review stats",
+            },
+        ),
+    ]
@@ -47,6 +47,8 @@ class GoogleReviewCache(TimeStampedUUIDModel):
     update_time = models.DateTimeField(blank=True, null=True)
     fetched_at = models.DateTimeField(db_index=True)
     raw_payload = models.JSONField(default=dict, blank=True)
+    # Hash del payload normalizado: el sync saltea las filas que no cambiaron.
+    content_hash = models.CharField(max_length=64, blank=True, default="")
     is_hidden = models.BooleanField(default=False)
     hidden_reason = models.CharField(max_length=255, blank=True)
 
@@ -60,3 +62,44 @@ class GoogleReviewCache(TimeStampedUUIDModel):
     def __str__(self):
         reviewer = self.reviewer_name or "Anonimo"
         return f"{reviewer} ({self.rating})"
+
+
+class ReviewStats(models.Model):
+    """
+    Agregados por provider de las reviews publicables (activas / no ocultas).
+
+    Se mantienen incrementalmente desde las señales de ManualReview y desde el
+    sync de Google, asi el endpoint publico no agrega en cada request.
+    """
+
+    class Provider(models.TextChoices):
+        MANUAL = "manual", "Manual"
+        GOOGLE = "google", "Google"
+
+    provider = models.CharField(max_length=20, choices=Provider.choices, primary_key=True)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+    # Solo Google: ultimo sync exitoso, para medir la frescura de la cache.
+    last_fetched_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "review stats"
+        verbose_name_plural = "review stats"
+
+    def __str__(self):
+        return f"{self.provider} ({self.review_count})"
+
+    @property
+    def average_rating(self) -> float | None:
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    @property
+    def histogram(self) -> dict[str, int]:
+        return {str(rating): getattr(self, f"rating_{rating}") for rating in range(1, 6)}
@@ -1,18 +1,43 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import timedelta
 from typing import Any
 
-import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Count, F, Max, Min
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
-from .models import GoogleReviewCache, ManualReview
+from . import google_client
+from .google_client import GoogleReviewsError
+from .models import GoogleReviewCache, ManualReview, ReviewStats
 
 GOOGLE_REVIEWS_PAGE_SIZE = 50
+GOOGLE_SYNC_CHUNK_SIZE = 500
+# Columnas que se pisan cuando la review ya existe (created_at se conserva).
+GOOGLE_UPSERT_FIELDS = (
+    "reviewer_name",
+    "reviewer_profile_photo_url",
+    "reviewer_is_anonymous",
+    "rating",
+    "comment",
+    "create_time",
+    "update_time",
+    "fetched_at",
+    "raw_payload",
+    "content_hash",
+    "updated_at",
+)
 GOOGLE_STAR_RATING_MAP = {
     "ONE": 1,
     "TWO": 2,
@@ -22,8 +47,11 @@ GOOGLE_STAR_RATING_MAP = {
 }
 
 
-class GoogleReviewsError(Exception):
-    pass
+_GOOGLE_SYNC_LOCK_KEY = "reviews:google:sync:lock"
+_PUBLIC_VERSION_KEY = "reviews:public:version"
+_PUBLIC_ENTRY_KEY = (
+    "reviews:public:{provider}:{min_rating}:{with_content}:{limit}:v{version}"
+)
 
 
 @dataclass
@@ -32,6 +60,8 @@ class PublicReviewsResult:
     provider: str
     fallback_reason: str | None
     items: list[dict[str, Any]]
+    stats: dict[str, Any] | None = None
+    cache: dict[str, Any] | None = None
 
     def as_dict(self) -> dict[str, Any]:
         return {
@@ -40,6 +70,8 @@ class PublicReviewsResult:
             "fallback_reason": self.fallback_reason,
             "count": len(self.items),
             "items": self.items,
+            "stats": self.stats,
+            "cache": self.cache,
             "generated_at": timezone.now().isoformat(),
         }
 
@@ -52,23 +84,32 @@ def get_public_reviews(
     limit: int,
 ) -> dict[str, Any]:
     if provider == "google":
+        cache_state = None
         try:
-            _ensure_google_cache()
-            items = _load_google_reviews(
+            reviews = _cached_public_reviews(
+                ReviewStats.Provider.GOOGLE,
                 min_rating=min_rating,
                 with_content=with_content,
                 limit=limit,
             )
+            cache_state = _ensure_google_cache(reviews["fetched_at"])
+            if cache_state["fetched_at"] is None and cache_state["refreshing"]:
+                raise GoogleReviewsError(
+                    "Google Reviews todavia no se sincronizo; sincronizando en segundo plano."
+                )
             return PublicReviewsResult(
                 requested_provider="google",
                 provider="google",
                 fallback_reason=None,
-                items=items,
+                items=reviews["items"],
+                stats=reviews["stats"],
+                cache=cache_state,
             ).as_dict()
         except GoogleReviewsError as exc:
             if not settings.REVIEWS_FALLBACK_TO_MANUAL:
                 raise
-            items = _load_manual_reviews(
+            reviews = _cached_public_reviews(
+                ReviewStats.Provider.MANUAL,
                 min_rating=min_rating,
                 with_content=with_content,
                 limit=limit,
@@ -77,10 +118,13 @@ def get_public_reviews(
                 requested_provider="google",
                 provider="manual",
                 fallback_reason=str(exc),
-                items=items,
+                items=reviews["items"],
+                stats=reviews["stats"],
+                cache=cache_state,
             ).as_dict()
 
-    items = _load_manual_reviews(
+    reviews = _cached_public_reviews(
+        ReviewStats.Provider.MANUAL,
         min_rating=min_rating,
         with_content=with_content,
         limit=limit,
@@ -89,57 +133,381 @@ def get_public_reviews(
         requested_provider="manual",
         provider="manual",
         fallback_reason=None,
-        items=items,
+        items=reviews["items"],
+        stats=reviews["stats"],
     ).as_dict()
 
 
-def sync_google_reviews() -> dict[str, int]:
-    raw_reviews = _fetch_google_reviews()
+async def aget_public_reviews(**kwargs) -> dict[str, Any]:
+    """
+    ``get_public_reviews`` for async views.
+
+    Each cache and ORM call of the lookup (version, entry, freshness, the
+    manual fallback) would be its own thread hop, so the whole lookup runs in
+    a single ``sync_to_async`` call.
+    """
+    return await sync_to_async(get_public_reviews)(**kwargs)
+
+
+# =========================
+# Payload publico cacheado
+# =========================
+
+
+def _new_version() -> int:
+    # Sembrado con el reloj: si Redis desaloja el contador no vuelve a un valor viejo.
+    return time.time_ns() // 1000
+
+
+def _public_version() -> int:
+    version = cache.get(_PUBLIC_VERSION_KEY)
+    if version is None:
+        version = _new_version()
+        if not cache.add(_PUBLIC_VERSION_KEY, version, timeout=None):
+            version = cache.get(_PUBLIC_VERSION_KEY, version)
+    return version
+
+
+def _bump_public_version() -> None:
+    try:
+        cache.incr(_PUBLIC_VERSION_KEY)
+    except ValueError:
+        cache.set(_PUBLIC_VERSION_KEY, _new_version(), timeout=None)
+
+
+def bump_public_reviews_version() -> None:
+    """
+    Invalidate every cached public reviews payload.
+
+    Bumped immediately and again after commit, so a reader that cached
+    pre-commit rows under the new version does not keep serving them.
+    """
+    _bump_public_version()
+    transaction.on_commit(_bump_public_version)
+
+
+def _cached_public_reviews(
+    provider: str,
+    *,
+    min_rating: int,
+    with_content: bool,
+    limit: int,
+) -> dict[str, Any]:
+    """
+    Items, stats and cache freshness of one provider, served from the cache.
+
+    ``REVIEWS_PUBLIC_CACHE_TIMEOUT = 0`` disables the cache entirely.
+    """
+    timeout = settings.REVIEWS_PUBLIC_CACHE_TIMEOUT
+    if not timeout:
+        return _build_public_reviews(
+            provider, min_rating=min_rating, with_content=with_content, limit=limit
+        )
+
+    key = _PUBLIC_ENTRY_KEY.format(
+        provider=provider,
+        min_rating=min_rating,
+        with_content=int(with_content),
+        limit=limit,
+        version=_public_version(),
+    )
+    entry = cache.get(key)
+    if entry is None:
+        entry = _build_public_reviews(
+            provider, min_rating=min_rating, with_content=with_content, limit=limit
+        )
+        cache.set(key, entry, timeout)
+    return entry
+
+
+def _build_public_reviews(
+    provider: str,
+    *,
+    min_rating: int,
+    with_content: bool,
+    limit: int,
+) -> dict[str, Any]:
+    if provider == ReviewStats.Provider.GOOGLE:
+        loader = _load_google_reviews
+    else:
+        loader = _load_manual_reviews
+    stats = get_review_stats(provider)
+    return {
+        "items": loader(min_rating=min_rating, with_content=with_content, limit=limit),
+        "stats": {
+            "count": stats.review_count,
+            "average_rating": stats.average_rating,
+            "histogram": stats.histogram,
+        },
+        "fetched_at": stats.last_fetched_at,
+    }
+
+
+# =========================
+# Agregados de rating
+# =========================
+
+
+def _stats_queryset(provider: str):
+    if provider == ReviewStats.Provider.GOOGLE:
+        return GoogleReviewCache.objects.filter(is_hidden=False)
+    return ManualReview.objects.filter(is_active=True)
+
+
+def _rating_counts(queryset) -> Counter:
+    return Counter(
+        dict(queryset.order_by().values_list("rating").annotate(total=Count("pk")))
+    )
+
+
+def get_review_stats(provider: str) -> ReviewStats:
+    stats = ReviewStats.objects.filter(provider=provider).first()
+    if stats is None:
+        stats = rebuild_review_stats(provider)
+    return stats
+
+
+# Escrituras que ya ajustan agregados y version por su cuenta (ver signals).
+_stats_receivers_muted: ContextVar[bool] = ContextVar(
+    "review_stats_receivers_muted", default=False
+)
+
+
+@contextmanager
+def review_stats_receivers_muted():
+    """Skip the ``GoogleReviewCache`` stats receivers inside the block."""
+    token = _stats_receivers_muted.set(True)
+    try:
+        yield
+    finally:
+        _stats_receivers_muted.reset(token)
+
+
+def review_stats_receivers_are_muted() -> bool:
+    return _stats_receivers_muted.get()
+
+
+def rebuild_review_stats(provider: str) -> ReviewStats:
+    """Recompute the aggregates of ``provider`` from scratch."""
+    counts = _rating_counts(_stats_queryset(provider))
+    defaults = {
+        f"rating_{rating}": counts.get(rating, 0) for rating in range(1, 6)
+    }
+    defaults["review_count"] = sum(defaults.values())
+    defaults["rating_sum"] = sum(
+        rating * counts.get(rating, 0) for rating in range(1, 6)
+    )
+    if provider == ReviewStats.Provider.GOOGLE:
+        # Un sync sin reviews no deja filas: se conserva el ultimo registrado.
+        fetched = [
+            GoogleReviewCache.objects.aggregate(latest=Max("fetched_at"))["latest"],
+            ReviewStats.objects.filter(provider=provider)
+            .values_list("last_fetched_at", flat=True)
+            .first(),
+        ]
+        defaults["last_fetched_at"] = max(
+            (value for value in fetched if value is not None), default=None
+        )
+    stats, _ = ReviewStats.objects.update_or_create(
+        provider=provider, defaults=defaults
+    )
+    return stats
+
+
+def apply_review_stats_delta(
+    provider: str,
+    rating_deltas: dict[int, int],
+    *,
+    last_fetched_at=None,
+) -> None:
+    """
+    Add ``rating_deltas`` (rating -> +/- reviews) to the stored aggregates
+    with a single ``UPDATE``. If the row does not exist yet it is rebuilt.
+    """
+    deltas = {rating: delta for rating, delta in rating_deltas.items() if delta}
+    updates = {
+        f"rating_{rating}": F(f"rating_{rating}") + delta
+        for rating, delta in deltas.items()
+    }
+    if deltas:
+        updates["review_count"] = F("review_count") + sum(deltas.values())
+        updates["rating_sum"] = F("rating_sum") + sum(
+            rating * delta for rating, delta in deltas.items()
+        )
+    if last_fetched_at is not None:
+        updates["last_fetched_at"] = last_fetched_at
+    if not updates:
+        return
+    if not ReviewStats.objects.filter(provider=provider).update(**updates):
+        rebuild_review_stats(provider)
+        if last_fetched_at is not None:
+            ReviewStats.objects.filter(provider=provider).update(
+                last_fetched_at=last_fetched_at
+            )
+
+
+def sync_google_reviews(*, full: bool = False) -> dict[str, int]:
+    """
+    Upsert the Google reviews into the local cache.
+
+    Unless ``full`` is set, only the reviews updated since the newest cached
+    one are paged (see ``_incremental_sync_since``).
+    """
+    updated_since = None if full else _incremental_sync_since()
+    raw_reviews = _fetch_google_reviews(updated_since=updated_since)
     fetched_at = timezone.now()
-    synced = 0
+
+    normalized_by_id: dict[str, dict[str, Any]] = {}
+    for raw_review in raw_reviews:
+        normalized = _normalize_google_review(raw_review, fetched_at=fetched_at)
+        external_id = normalized.pop("external_id", "")
+        if not external_id:
+            continue
+        normalized["content_hash"] = _content_hash(normalized)
+        normalized_by_id[external_id] = normalized
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    external_ids = list(normalized_by_id)
+    for index in range(0, len(external_ids), GOOGLE_SYNC_CHUNK_SIZE):
+        chunk = external_ids[index : index + GOOGLE_SYNC_CHUNK_SIZE]
+        for key, value in _upsert_google_chunk(chunk, normalized_by_id, fetched_at).items():
+            counts[key] += value
+
+    _purge_old_google_cache()
+    # Tambien sin reviews: un sync vacio exitoso deja el cache al dia.
+    apply_review_stats_delta(
+        ReviewStats.Provider.GOOGLE, {}, last_fetched_at=fetched_at
+    )
+    bump_public_reviews_version()
+
+    return {
+        "received": len(raw_reviews),
+        "synced": sum(counts.values()),
+        **counts,
+    }
+
+
+def _content_hash(normalized: dict[str, Any]) -> str:
+    content = {key: value for key, value in normalized.items() if key != "fetched_at"}
+    encoded = json.dumps(content, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _upsert_google_chunk(
+    external_ids: list[str],
+    normalized_by_id: dict[str, dict[str, Any]],
+    fetched_at,
+) -> dict[str, int]:
+    """
+    Upsert one chunk in its own short transaction; returns the counts.
+
+    The rating aggregates are adjusted in the same transaction from the rows
+    that were inserted or changed.
+    """
+    stored = {
+        external_id: (content_hash, rating, is_hidden)
+        for external_id, content_hash, rating, is_hidden in (
+            GoogleReviewCache.objects.filter(external_id__in=external_ids).values_list(
+                "external_id", "content_hash", "rating", "is_hidden"
+            )
+        )
+    }
+    rows = []
+    unchanged = []
+    inserted = 0
+    rating_deltas = Counter()
+    for external_id in external_ids:
+        normalized = normalized_by_id[external_id]
+        stored_hash, stored_rating, is_hidden = stored.get(
+            external_id, (None, None, False)
+        )
+        if stored_hash == normalized["content_hash"]:
+            unchanged.append(external_id)
+            continue
+        if stored_hash is None:
+            inserted += 1
+        elif not is_hidden:
+            rating_deltas[stored_rating] -= 1
+        if not is_hidden:
+            rating_deltas[normalized["rating"]] += 1
+        rows.append(GoogleReviewCache(external_id=external_id, **normalized))
 
     with transaction.atomic():
-        for raw_review in raw_reviews:
-            normalized = _normalize_google_review(raw_review, fetched_at=fetched_at)
-            external_id = normalized.pop("external_id", "")
-            if not external_id:
-                continue
-
-            obj, created = GoogleReviewCache.objects.get_or_create(
-                external_id=external_id,
-                defaults=normalized,
+        if rows:
+            GoogleReviewCache.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["external_id"],
+                update_fields=list(GOOGLE_UPSERT_FIELDS),
+            )
+            apply_review_stats_delta(ReviewStats.Provider.GOOGLE, rating_deltas)
+        if unchanged:
+            # Solo se marca como vista para que la purga y la frescura la cuenten.
+            GoogleReviewCache.objects.filter(external_id__in=unchanged).update(
+                fetched_at=fetched_at
             )
-            if not created:
-                for key, value in normalized.items():
-                    setattr(obj, key, value)
-                obj.save()
-            synced += 1
 
-        _purge_old_google_cache()
+    return {
+        "inserted": inserted,
+        "updated": len(rows) - inserted,
+        "unchanged": len(unchanged),
+    }
 
-    return {"received": len(raw_reviews), "synced": synced}
 
+def _ensure_google_cache(latest_fetch) -> dict[str, Any]:
+    """
+    Describe the Google cache and, if it is stale, queue a background sync.
 
-def _ensure_google_cache() -> None:
-    if not settings.REVIEWS_GOOGLE_AUTO_SYNC_ON_READ:
-        return
+    The request never waits on the Google API: it is served from whatever is
+    cached while ``sync_google_reviews_task`` refreshes it. ``latest_fetch``
+    comes from the stored stats, so this costs no query.
+    """
+    now = timezone.now()
+    refresh_cutoff = now - timedelta(hours=settings.REVIEWS_CACHE_REFRESH_HOURS)
+    stale = latest_fetch is None or latest_fetch < refresh_cutoff
 
-    if not GoogleReviewCache.objects.exists():
-        sync_google_reviews()
-        return
+    refreshing = False
+    if stale and settings.REVIEWS_GOOGLE_AUTO_SYNC_ON_READ:
+        # La config se valida aca para que el fallback a manual siga siendo inmediato.
+        _google_location()
+        schedule_google_sync()
+        refreshing = True
+
+    return {
+        "fetched_at": latest_fetch.isoformat() if latest_fetch else None,
+        "age_seconds": (
+            max(int((now - latest_fetch).total_seconds()), 0) if latest_fetch else None
+        ),
+        "stale": stale,
+        "refreshing": refreshing,
+    }
 
-    latest_fetch = GoogleReviewCache.objects.order_by("-fetched_at").values_list(
-        "fetched_at", flat=True
-    ).first()
-    if latest_fetch is None:
-        sync_google_reviews()
+
+def schedule_google_sync() -> None:
+    """
+    Queue ``sync_google_reviews_task`` unless one is already in flight.
+
+    ``cache.add`` is atomic (SET NX in Redis), so concurrent visitors enqueue a
+    single sync. The task releases the lock when it succeeds; after a failure
+    it is left to expire, which spaces out the retries.
+    """
+    if not cache.add(
+        _GOOGLE_SYNC_LOCK_KEY, 1, timeout=settings.REVIEWS_GOOGLE_SYNC_LOCK_SECONDS
+    ):
         return
 
-    refresh_cutoff = timezone.now() - timedelta(
-        hours=settings.REVIEWS_CACHE_REFRESH_HOURS
-    )
-    if latest_fetch < refresh_cutoff:
-        sync_google_reviews()
+    from .tasks import sync_google_reviews_task
+
+    transaction.on_commit(sync_google_reviews_task.delay)
+
+
+def release_google_sync_lock() -> None:
+    cache.delete(_GOOGLE_SYNC_LOCK_KEY)
+
+
+def _with_content(queryset):
+    # En SQL, antes del LIMIT: las reviews sin texto no le restan items a la pagina.
+    return queryset.filter(comment__regex=r"\S")
 
 
 def _load_manual_reviews(
@@ -148,14 +516,12 @@ def _load_manual_reviews(
     with_content: bool,
     limit: int,
 ) -> list[dict[str, Any]]:
-    queryset = (
-        ManualReview.objects.filter(is_active=True, rating__gte=min_rating)
-        .order_by("order", "-created_at")[:limit]
-    )
+    queryset = ManualReview.objects.filter(is_active=True, rating__gte=min_rating)
+    if with_content:
+        queryset = _with_content(queryset)
+    queryset = queryset.order_by("order", "-created_at")[:limit]
     reviews = []
     for review in queryset:
-        if with_content and not (review.comment or "").strip():
-            continue
         reviews.append(
             {
                 "id": str(review.id),
@@ -177,12 +543,12 @@ def _load_google_reviews(
     limit: int,
 ) -> list[dict[str, Any]]:
     queryset = GoogleReviewCache.objects.filter(is_hidden=False, rating__gte=min_rating)
+    if with_content:
+        queryset = _with_content(queryset)
     queryset = queryset.order_by("-update_time", "-create_time", "-fetched_at")[:limit]
 
     reviews = []
     for review in queryset:
-        if with_content and not (review.comment or "").strip():
-            continue
         published_at = review.update_time or review.create_time or review.fetched_at
         reviews.append(
             {
@@ -198,77 +564,45 @@ def _load_google_reviews(
     return reviews
 
 
-def _fetch_google_reviews() -> list[dict[str, Any]]:
+def _google_location() -> tuple[str, str]:
     account_id = settings.REVIEWS_GOOGLE_ACCOUNT_ID
     location_id = settings.REVIEWS_GOOGLE_LOCATION_ID
     if not account_id or not location_id:
         raise GoogleReviewsError(
             "Falta REVIEWS_GOOGLE_ACCOUNT_ID o REVIEWS_GOOGLE_LOCATION_ID."
         )
+    return account_id, location_id
 
-    base_url = (
-        f"https://mybusiness.googleapis.com/v4/accounts/{account_id}"
-        f"/locations/{location_id}/reviews"
-    )
-    headers = {
-        "Authorization": f"Bearer {_get_google_access_token()}",
-        "Accept": "application/json",
-    }
-    params: dict[str, Any] = {
-        "pageSize": GOOGLE_REVIEWS_PAGE_SIZE,
-        "orderBy": "updateTime desc",
-    }
-    reviews: list[dict[str, Any]] = []
-
-    while True:
-        response = requests.get(base_url, headers=headers, params=params, timeout=20)
-        if response.status_code >= 400:
-            raise GoogleReviewsError(
-                f"Google Reviews API error ({response.status_code}): {response.text}"
-            )
-        payload = response.json()
-        reviews.extend(payload.get("reviews", []))
-        next_page_token = payload.get("nextPageToken")
-        if not next_page_token:
-            break
-        params["pageToken"] = next_page_token
-
-    return reviews
 
+def _fetch_google_reviews(*, updated_since=None) -> list[dict[str, Any]]:
+    account_id, location_id = _google_location()
+    return list(
+        google_client.iter_reviews(
+            account_id=account_id,
+            location_id=location_id,
+            page_size=GOOGLE_REVIEWS_PAGE_SIZE,
+            updated_since=updated_since,
+        )
+    )
 
-def _get_google_access_token() -> str:
-    static_access_token = settings.REVIEWS_GOOGLE_ACCESS_TOKEN
-    if static_access_token:
-        return static_access_token
 
-    refresh_token = settings.REVIEWS_GOOGLE_REFRESH_TOKEN
-    client_id = settings.REVIEWS_GOOGLE_CLIENT_ID
-    client_secret = settings.REVIEWS_GOOGLE_CLIENT_SECRET
-    if not (refresh_token and client_id and client_secret):
-        raise GoogleReviewsError(
-            "Faltan credenciales de Google OAuth para obtener access token."
-        )
+def _incremental_sync_since():
+    """
+    Newest cached ``update_time`` to page down to, or None for a full pass.
 
-    response = requests.post(
-        "https://oauth2.googleapis.com/token",
-        data={
-            "client_id": client_id,
-            "client_secret": client_secret,
-            "refresh_token": refresh_token,
-            "grant_type": "refresh_token",
-        },
-        timeout=20,
+    An incremental sync does not touch the reviews it does not page through,
+    so a full pass is forced once any row is halfway to ``REVIEWS_CACHE_DAYS``:
+    it refreshes ``fetched_at`` of everything still on Google and only the
+    reviews removed there reach the purge.
+    """
+    keep_days = max(int(settings.REVIEWS_CACHE_DAYS), 1)
+    refresh_before = timezone.now() - timedelta(days=keep_days) / 2
+    bounds = GoogleReviewCache.objects.aggregate(
+        oldest=Min("fetched_at"), newest=Max("update_time")
     )
-    if response.status_code >= 400:
-        raise GoogleReviewsError(
-            f"OAuth token error ({response.status_code}): {response.text}"
-        )
-
-    payload = response.json()
-    access_token = payload.get("access_token")
-    if not access_token:
-        raise GoogleReviewsError("Google OAuth no devolvio access_token.")
-    return access_token
+    if bounds["oldest"] is None or bounds["oldest"] < refresh_before:
+        return None
+    return bounds["newest"]
 
 
 def _normalize_google_review(
@@ -318,5 +652,15 @@ def _parse_google_datetime(value: Any):
 def _purge_old_google_cache() -> int:
     keep_days = max(int(settings.REVIEWS_CACHE_DAYS), 1)
     cutoff = timezone.now() - timedelta(days=keep_days)
-    deleted, _ = GoogleReviewCache.objects.filter(fetched_at__lt=cutoff).delete()
+    queryset = GoogleReviewCache.objects.filter(fetched_at__lt=cutoff)
+    with transaction.atomic():
+        purged = _rating_counts(queryset.filter(is_hidden=False))
+        # El post_delete recalcularia los agregados por fila y el delta los
+        # restaria de nuevo: se ajustan una sola vez, aca.
+        with review_stats_receivers_muted():
+            deleted, _ = queryset.delete()
+        apply_review_stats_delta(
+            ReviewStats.Provider.GOOGLE,
+            {rating: -total for rating, total in purged.items()},
+        )
     return deleted
@@ -0,0 +1,54 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import GoogleReviewCache, ManualReview, ReviewStats
+from .services import (
+    apply_review_stats_delta,
+    bump_public_reviews_version,
+    rebuild_review_stats,
+    review_stats_receivers_are_muted,
+)
+
+
+@receiver(pre_save, sender=ManualReview)
+def manual_review_remember_stats(sender, instance, **kwargs):
+    # Rating/estado previos para ajustar los agregados con un delta.
+    instance._stats_previous = None
+    if not instance._state.adding:
+        instance._stats_previous = (
+            ManualReview.objects.filter(pk=instance.pk)
+            .values_list("rating", "is_active")
+            .first()
+        )
+
+
+@receiver(post_save, sender=ManualReview)
+def manual_review_saved(sender, instance, **kwargs):
+    deltas = Counter()
+    previous = getattr(instance, "_stats_previous", None)
+    if previous and previous[1]:
+        deltas[previous[0]] -= 1
+    if instance.is_active:
+        deltas[instance.rating] += 1
+    apply_review_stats_delta(ReviewStats.Provider.MANUAL, deltas)
+    bump_public_reviews_version()
+
+
+@receiver(post_delete, sender=ManualReview)
+def manual_review_deleted(sender, instance, **kwargs):
+    if instance.is_active:
+        apply_review_stats_delta(ReviewStats.Provider.MANUAL, {instance.rating: -1})
+    bump_public_reviews_version()
+
+
+@receiver(post_save, sender=GoogleReviewCache)
+@receiver(post_delete, sender=GoogleReviewCache)
+def google_review_changed(sender, instance, **kwargs):
+    # El sync usa bulk_create y ajusta los agregados solo; esto cubre el admin
+    # (ocultar/mostrar reviews), donde alcanza con recalcular.
+    if review_stats_receivers_are_muted():
+        return
+    rebuild_review_stats(ReviewStats.Provider.GOOGLE)
+    bump_public_reviews_version()
@@ -1,8 +1,10 @@
 from celery import shared_task
 
-from .services import sync_google_reviews
+from .services import release_google_sync_lock, sync_google_reviews
 
 
 @shared_task
 def sync_google_reviews_task():
-    return sync_google_reviews()
+    result = sync_google_reviews()
+    release_google_sync_lock()
+    return result
@@ -1,8 +1,22 @@
+from datetime import timedelta
+
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APIClient
 
-from apps.reviews.models import ManualReview
-from apps.reviews import services
+from apps.reviews.models import GoogleReviewCache, ManualReview, ReviewStats
+from apps.reviews import google_client, services
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # El payload publico queda cacheado entre tests (locmem no hace rollback).
+    cache.clear()
+    yield
+    cache.clear()
 
 
 def _disable_throttling(settings):
@@ -137,3 +151,346 @@ def test_reviews_endpoint_google_no_sync_on_read_when_disabled(settings, monkeyp
     assert response.data["provider"] == "google"
     assert response.data["count"] == 0
     assert sync_called is False
+
+
+def _google_review(review_id: str, *, rating: str = "FIVE", comment: str = "Excelente") -> dict:
+    return {
+        "reviewId": review_id,
+        "reviewer": {"displayName": f"Cliente {review_id}"},
+        "starRating": rating,
+        "comment": comment,
+        "createTime": "2026-01-10T10:00:00Z",
+        "updateTime": "2026-01-10T10:00:00Z",
+    }
+
+
+@pytest.mark.django_db
+def test_sync_google_reviews_upserts_in_chunks_and_skips_unchanged(monkeypatch):
+    raw_reviews = [_google_review(f"r{index}") for index in range(5)]
+    monkeypatch.setattr(
+        services, "_fetch_google_reviews", lambda **kwargs: list(raw_reviews)
+    )
+    monkeypatch.setattr(services, "GOOGLE_SYNC_CHUNK_SIZE", 2)
+
+    first = services.sync_google_reviews()
+    assert first == {
+        "received": 5,
+        "synced": 5,
+        "inserted": 5,
+        "updated": 0,
+        "unchanged": 0,
+    }
+    created_ids = dict(GoogleReviewCache.objects.values_list("external_id", "id"))
+
+    raw_reviews[1] = _google_review("r1", rating="THREE", comment="Regular")
+    raw_reviews.append(_google_review("r5"))
+    second = services.sync_google_reviews()
+
+    assert second["inserted"] == 1
+    assert second["updated"] == 1
+    assert second["unchanged"] == 4
+    updated = GoogleReviewCache.objects.get(external_id="r1")
+    assert updated.rating == 3
+    assert updated.comment == "Regular"
+    assert updated.id == created_ids["r1"]
+    # Las filas sin cambios igual quedan marcadas como vistas en este sync.
+    fetched = set(GoogleReviewCache.objects.values_list("fetched_at", flat=True))
+    assert len(fetched) == 1
+
+
+@pytest.mark.django_db
+def test_reviews_endpoint_google_stale_cache_refreshes_in_background(
+    settings, monkeypatch, django_capture_on_commit_callbacks
+):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from apps.reviews import tasks
+
+    _disable_throttling(settings)
+    settings.REVIEWS_PROVIDER = "google"
+    settings.REVIEWS_GOOGLE_AUTO_SYNC_ON_READ = True
+    settings.REVIEWS_GOOGLE_ACCOUNT_ID = "account"
+    settings.REVIEWS_GOOGLE_LOCATION_ID = "location"
+    settings.REVIEWS_CACHE_REFRESH_HOURS = 24
+    services.release_google_sync_lock()
+
+    GoogleReviewCache.objects.create(
+        external_id="stale",
+        reviewer_name="Cliente",
+        rating=5,
+        comment="Excelente",
+        fetched_at=timezone.now() - timedelta(hours=30),
+    )
+
+    def _unexpected_sync():
+        raise AssertionError("El request no debe sincronizar en linea.")
+
+    enqueued = []
+    monkeypatch.setattr(services, "sync_google_reviews", _unexpected_sync)
+    monkeypatch.setattr(
+        tasks.sync_google_reviews_task, "delay", lambda: enqueued.append(1)
+    )
+
+    client = APIClient()
+    with django_capture_on_commit_callbacks(execute=True):
+        first = client.get("/api/v1/reviews/")
+        second = client.get("/api/v1/reviews/")
+
+    assert first.status_code == 200
+    assert first.data["provider"] == "google"
+    assert first.data["count"] == 1
+    assert first.data["cache"]["stale"] is True
+    assert first.data["cache"]["refreshing"] is True
+    assert first.data["cache"]["age_seconds"] >= 30 * 3600
+    assert second.data["cache"]["refreshing"] is True
+    # El lock deja pasar un solo sync aunque lleguen varios requests.
+    assert len(enqueued) == 1
+
+    services.release_google_sync_lock()
+
+
+@pytest.mark.django_db
+def test_reviews_endpoint_with_content_filters_before_limit(settings):
+    _disable_throttling(settings)
+    settings.REVIEWS_PROVIDER = "manual"
+
+    for order, comment in enumerate(["", "   ", "Muy bueno", "Excelente"]):
+        ManualReview.objects.create(
+            author_name=f"Review {order}",
+            rating=5,
+            comment=comment,
+            is_active=True,
+            order=order,
+        )
+
+    client = APIClient()
+    response = client.get("/api/v1/reviews/?with_content=true&limit=2")
+
+    assert response.status_code == 200
+    assert [item["comment"] for item in response.data["items"]] == [
+        "Muy bueno",
+        "Excelente",
+    ]
+
+
+@pytest.mark.django_db
+def test_reviews_stats_are_incremental_and_payload_is_cached(
+    settings, django_assert_num_queries
+):
+    _disable_throttling(settings)
+    settings.REVIEWS_PROVIDER = "manual"
+
+    first = ManualReview.objects.create(author_name="A", rating=5, comment="Genial")
+    second = ManualReview.objects.create(author_name="B", rating=4, comment="Bien")
+    ManualReview.objects.create(author_name="C", rating=3, comment="", is_active=False)
+    second.rating = 2
+    second.save()
+    first.is_active = False
+    first.save()
+    ManualReview.objects.create(author_name="D", rating=5, comment="Top")
+    ManualReview.objects.filter(author_name="D").first().delete()
+
+    stats = ReviewStats.objects.get(provider="manual")
+    assert (stats.review_count, stats.rating_sum) == (1, 2)
+    assert stats.histogram == {"1": 0, "2": 1, "3": 0, "4": 0, "5": 0}
+
+    client = APIClient()
+    response = client.get("/api/v1/reviews/?min_rating=1")
+    assert response.data["stats"] == {
+        "count": 1,
+        "average_rating": 2.0,
+        "histogram": {"1": 0, "2": 1, "3": 0, "4": 0, "5": 0},
+    }
+
+    with django_assert_num_queries(0):
+        cached = client.get("/api/v1/reviews/?min_rating=1")
+    assert cached.data["items"] == response.data["items"]
+
+    # Guardar una review invalida el payload cacheado.
+    ManualReview.objects.create(author_name="E", rating=5, comment="Nuevo")
+    refreshed = client.get("/api/v1/reviews/?min_rating=1")
+    assert refreshed.data["count"] == 2
+    assert refreshed.data["stats"]["average_rating"] == 3.5
+
+
+@pytest.mark.django_db
+def test_sync_google_reviews_keeps_stats_in_step(monkeypatch):
+    raw_reviews = [_google_review(f"r{index}") for index in range(3)]
+    monkeypatch.setattr(
+        services, "_fetch_google_reviews", lambda **kwargs: list(raw_reviews)
+    )
+
+    services.sync_google_reviews()
+    GoogleReviewCache.objects.filter(external_id="r0").update(is_hidden=True)
+    services.rebuild_review_stats(ReviewStats.Provider.GOOGLE)
+
+    raw_reviews[0] = _google_review("r0", rating="ONE")
+    raw_reviews[1] = _google_review("r1", rating="TWO")
+    raw_reviews.append(_google_review("r3", rating="FOUR"))
+    services.sync_google_reviews()
+
+    stats = ReviewStats.objects.get(provider="google")
+    assert stats.histogram == {"1": 0, "2": 1, "3": 0, "4": 1, "5": 1}
+    assert stats.last_fetched_at == GoogleReviewCache.objects.latest(
+        "fetched_at"
+    ).fetched_at
+    expected = services.rebuild_review_stats(ReviewStats.Provider.GOOGLE)
+    assert stats.histogram == expected.histogram
+    assert stats.rating_sum == expected.rating_sum
+
+
+@pytest.mark.django_db
+def test_sync_google_reviews_purges_old_rows_without_double_counting(
+    settings, monkeypatch
+):
+    settings.REVIEWS_CACHE_DAYS = 30
+    raw_reviews = [
+        _google_review("r0", rating="FIVE"),
+        _google_review("r1", rating="FOUR"),
+        _google_review("r2", rating="FOUR"),
+        _google_review("r3", rating="TWO"),
+    ]
+    monkeypatch.setattr(
+        services, "_fetch_google_reviews", lambda **kwargs: list(raw_reviews)
+    )
+    services.sync_google_reviews()
+
+    # r1 y r2 dejan de venir y quedan viejas; r3 ademas estaba oculta.
+    GoogleReviewCache.objects.filter(external_id="r3").update(is_hidden=True)
+    services.rebuild_review_stats(ReviewStats.Provider.GOOGLE)
+    GoogleReviewCache.objects.filter(external_id__in=["r1", "r2", "r3"]).update(
+        fetched_at=timezone.now() - timedelta(days=45)
+    )
+    raw_reviews[:] = [raw_reviews[0], _google_review("r4", rating="ONE")]
+    result = services.sync_google_reviews(full=True)
+
+    assert result["inserted"] == 1
+    assert set(GoogleReviewCache.objects.values_list("external_id", flat=True)) == {
+        "r0",
+        "r4",
+    }
+    stats = ReviewStats.objects.get(provider="google")
+    assert stats.histogram == {"1": 1, "2": 0, "3": 0, "4": 0, "5": 1}
+    expected = services.rebuild_review_stats(ReviewStats.Provider.GOOGLE)
+    assert stats.histogram == expected.histogram
+    assert stats.review_count == expected.review_count
+    assert stats.rating_sum == expected.rating_sum
+
+
+@pytest.mark.django_db
+def test_sync_google_reviews_without_reviews_records_the_fetch(monkeypatch):
+    monkeypatch.setattr(services, "_fetch_google_reviews", lambda **kwargs: [])
+
+    before = timezone.now()
+    result = services.sync_google_reviews()
+
+    assert result["received"] == 0
+    stats = ReviewStats.objects.get(provider="google")
+    assert stats.review_count == 0
+    assert stats.last_fetched_at >= before
+    # Recalcular (p. ej. desde el admin) no pierde la fecha del ultimo sync.
+    assert (
+        services.rebuild_review_stats(ReviewStats.Provider.GOOGLE).last_fetched_at
+        == stats.last_fetched_at
+    )
+
+
+class _FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+def test_google_client_caches_token_and_stops_at_cached_reviews(settings, monkeypatch):
+    from django.utils.dateparse import parse_datetime
+
+    settings.REVIEWS_GOOGLE_ACCESS_TOKEN = ""
+    settings.REVIEWS_GOOGLE_REFRESH_TOKEN = "refresh"
+    settings.REVIEWS_GOOGLE_CLIENT_ID = "client"
+    settings.REVIEWS_GOOGLE_CLIENT_SECRET = "secret"
+
+    newer = _google_review("new")
+    newer["updateTime"] = "2026-02-01T10:00:00Z"
+    older = _google_review("old")
+    pages = {
+        None: {"reviews": [newer], "nextPageToken": "p2"},
+        "p2": {"reviews": [older], "nextPageToken": "p3"},
+    }
+    calls = []
+
+    def _fake_request(method, url, **kwargs):
+        calls.append(method)
+        if method == "POST":
+            return _FakeResponse({"access_token": "token", "expires_in": 3599})
+        return _FakeResponse(pages[kwargs["params"].get("pageToken")])
+
+    monkeypatch.setattr(google_client, "_request", _fake_request)
+
+    def _fetch(updated_since):
+        return [
+            review["reviewId"]
+            for review in google_client.iter_reviews(
+                account_id="a",
+                location_id="l",
+                page_size=50,
+                updated_since=updated_since,
+            )
+        ]
+
+    assert _fetch(parse_datetime("2026-01-15T00:00:00Z")) == ["new"]
+    # El token quedo cacheado: la segunda sync no vuelve a pedirlo.
+    assert _fetch(parse_datetime("2026-01-15T00:00:00Z")) == ["new"]
+    assert calls == ["POST", "GET", "GET", "GET", "GET"]
+
+
+# Techo de queries en frio del endpoint publico, por proveedor.
+PUBLIC_QUERY_BOUNDS = {"manual": 3, "google": 3}
+
+
+def _seed_reviews(count: int) -> None:
+    fetched_at = timezone.now()
+    start = ManualReview.objects.count()
+    for index in range(start, start + count):
+        ManualReview.objects.create(
+            author_name=f"Cliente {index}", rating=5, comment="Excelente", order=index
+        )
+        GoogleReviewCache.objects.create(
+            external_id=f"review-{index}",
+            reviewer_name=f"Cliente {index}",
+            rating=4,
+            comment="Muy bien",
+            fetched_at=fetched_at,
+        )
+
+
+def _public_reviews_query_counts(settings) -> dict:
+    counts = {}
+    for provider in PUBLIC_QUERY_BOUNDS:
+        settings.REVIEWS_PROVIDER = provider
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get("/api/v1/reviews/")
+        assert response.data["provider"] == provider
+        counts[provider] = len(queries.captured_queries)
+    return counts
+
+
+@pytest.mark.django_db
+def test_reviews_endpoint_query_counts_are_bounded_and_constant(settings):
+    _disable_throttling(settings)
+    settings.REVIEWS_GOOGLE_AUTO_SYNC_ON_READ = False
+    _seed_reviews(10)
+    small = _public_reviews_query_counts(settings)
+
+    _seed_reviews(10)
+    large = _public_reviews_query_counts(settings)
+
+    for provider, bound in PUBLIC_QUERY_BOUNDS.items():
+        assert small[provider] <= bound, (provider, small[provider], bound)
+    assert large == small
@@ -3,6 +3,7 @@ from django.contrib import admin
 from apps.scheduling.models import (
     AvailabilityBatch,
     AvailabilityDay,
+    AvailabilityException,
     AvailabilitySlot,
     ScheduleBlock,
 )
@@ -18,11 +19,19 @@ class AvailabilityDayAdmin(admin.ModelAdmin):
 
 @admin.register(AvailabilityBatch)
 class AvailabilityBatchAdmin(admin.ModelAdmin):
-    list_display = ("id", "type", "date_start", "date_end", "created_at")
-    list_filter = ("type",)
+    list_display = ("id", "type", "mode", "date_start", "date_end", "created_at")
+    list_filter = ("type", "mode")
     search_fields = ("id",)
 
 
+@admin.register(AvailabilityException)
+class AvailabilityExceptionAdmin(admin.ModelAdmin):
+    list_display = ("id", "batch", "journey", "date")
+    list_filter = ("date", "journey")
+    search_fields = ("batch__id", "journey__title", "journey__slug")
+    date_hierarchy = "date"
+
+
 @admin.register(AvailabilitySlot)
 class AvailabilitySlotAdmin(admin.ModelAdmin):
     list_display = ("id", "availability_day", "start_time", "end_time")
@@ -2,6 +2,8 @@ from django.utils import timezone
 from rest_framework import serializers
 
 from apps.catalog.models import Journey
+from apps.scheduling.models import AvailabilityBatch
+from apps.scheduling.services import FREE_SLOTS_MAX_DAYS
 
 
 def _validate_time_slots(time_slots):
@@ -88,6 +90,11 @@ class AvailabilityCreateSerializer(serializers.Serializer):
     weekly_config = WeeklyConfigSerializer(many=True, required=False)
     recurrence_rule = RecurrenceRuleSerializer(required=False)
     time_slots = TimeSlotSerializer(many=True, required=False, allow_empty=False)
+    mode = serializers.ChoiceField(
+        choices=AvailabilityBatch.Mode.choices,
+        required=False,
+        default=AvailabilityBatch.Mode.MATERIALIZED,
+    )
 
     def validate_jornada_ids(self, value):
         unique_ids = list(dict.fromkeys(value))
@@ -275,6 +282,7 @@ class AvailabilityBatchUpdateSerializer(serializers.Serializer):
 class AvailabilityBatchSerializer(serializers.Serializer):
     id = serializers.UUIDField()
     type = serializers.CharField()
+    mode = serializers.CharField()
     date_start = serializers.DateField()
     date_end = serializers.DateField()
     rule = serializers.JSONField()
@@ -325,10 +333,17 @@ class ScheduleBlockCreateSerializer(serializers.Serializer):
 
 
 class AvailabilityListQuerySerializer(serializers.Serializer):
+    LAYOUT_DAYS = "days"
+    LAYOUT_COLUMNAR = "columnar"
+
     jornada_id = serializers.UUIDField(required=False)
     batch_id = serializers.UUIDField(required=False)
     start = serializers.DateField(required=False)
     end = serializers.DateField(required=False)
+    layout = serializers.ChoiceField(
+        choices=(LAYOUT_DAYS, LAYOUT_COLUMNAR), required=False, default=LAYOUT_DAYS
+    )
+    page_days = serializers.IntegerField(required=False, min_value=1, max_value=366)
 
     def validate(self, attrs):
         has_jornada = bool(attrs.get("jornada_id"))
@@ -347,6 +362,10 @@ class AvailabilityListQuerySerializer(serializers.Serializer):
             raise serializers.ValidationError(
                 {"date_range": "start no puede ser mayor que end."}
             )
+        if attrs.get("page_days") and not start:
+            raise serializers.ValidationError(
+                {"page_days": "page_days requiere start y end."}
+            )
         return attrs
 
 
@@ -355,6 +374,8 @@ class AvailabilityDeleteQuerySerializer(serializers.Serializer):
     batch_id = serializers.UUIDField(required=False)
     start = serializers.DateField(required=False)
     end = serializers.DateField(required=False)
+    # Encola el borrado en Celery y devuelve un job_id para consultar el avance.
+    background = serializers.BooleanField(required=False, default=False)
 
     def validate(self, attrs):
         has_jornada = bool(attrs.get("jornada_id"))
@@ -404,6 +425,8 @@ class ScheduleBlockDeleteQuerySerializer(serializers.Serializer):
     jornada_id = serializers.UUIDField(required=False)
     start = serializers.DateField(required=False)
     end = serializers.DateField(required=False)
+    # Encola el borrado en Celery y devuelve un job_id para consultar el avance.
+    background = serializers.BooleanField(required=False, default=False)
 
     def validate(self, attrs):
         has_jornada = bool(attrs.get("jornada_id"))
@@ -422,3 +445,24 @@ class ScheduleBlockDeleteQuerySerializer(serializers.Serializer):
                 {"date_range": "start no puede ser mayor que end."}
             )
         return attrs
+
+
+class FreeSlotsQuerySerializer(serializers.Serializer):
+    # Sin chequeo de existencia: la ruta es publica y se sirve desde la cache
+    # por dia; una jornada desconocida simplemente no tiene horarios.
+    jornada_id = serializers.UUIDField()
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, attrs):
+        start = attrs["start"]
+        end = attrs["end"]
+        if start > end:
+            raise serializers.ValidationError(
+                {"date_range": "start no puede ser mayor que end."}
+            )
+        if (end - start).days + 1 > FREE_SLOTS_MAX_DAYS:
+            raise serializers.ValidationError(
+                {"date_range": f"El rango no puede superar {FREE_SLOTS_MAX_DAYS} dias."}
+            )
+        return attrs
@@ -3,6 +3,8 @@ from django.urls import path
 from apps.scheduling.api.v1.views import (
     AvailabilityBatchDetailView,
     AvailabilityView,
+    DeletionJobView,
+    FreeSlotsView,
     ScheduleBlockView,
 )
 
@@ -15,5 +17,11 @@ urlpatterns = [
         AvailabilityBatchDetailView.as_view(),
         name="availability-batch-detail",
     ),
+    path("availability/free/", FreeSlotsView.as_view(), name="availability-free"),
     path("blocks/", ScheduleBlockView.as_view(), name="blocks"),
+    path(
+        "scheduling/jobs/<uuid:job_id>/",
+        DeletionJobView.as_view(),
+        name="deletion-job",
+    ),
 ]
@@ -8,20 +8,27 @@ from apps.scheduling.api.v1.serializers import (
     AvailabilityCreateSerializer,
     AvailabilityDeleteQuerySerializer,
     AvailabilityListQuerySerializer,
+    FreeSlotsQuerySerializer,
     ScheduleBlockCreateSerializer,
     ScheduleBlockDeleteQuerySerializer,
     ScheduleBlockListQuerySerializer,
 )
 from apps.scheduling.models import AvailabilityBatch
 from apps.scheduling.services import (
+    DELETION_AVAILABILITY,
+    DELETION_BLOCKS,
     AvailabilityConflictError,
     EmptyAvailabilityError,
     create_availability,
     create_blocks,
     delete_availability,
     delete_blocks,
+    get_deletion_job,
+    get_free_slots,
     list_availability,
+    list_availability_page,
     list_blocks,
+    start_deletion_job,
     update_availability_batch,
 )
 
@@ -32,7 +39,16 @@ class AvailabilityView(APIView):
     def get(self, request):
         serializer = AvailabilityListQuerySerializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
-        result = list_availability(filters=serializer.validated_data)
+        data = serializer.validated_data
+        layout = data.get("layout")
+        page_days = data.get("page_days")
+        # Sin layout ni paginado se mantiene la lista de dias original.
+        if layout == AvailabilityListQuerySerializer.LAYOUT_DAYS and not page_days:
+            result = list_availability(filters=data)
+        else:
+            result = list_availability_page(
+                filters=data, layout=layout, page_days=page_days
+            )
         return Response(result, status=status.HTTP_200_OK)
 
     def post(self, request):
@@ -49,6 +65,11 @@ class AvailabilityView(APIView):
     def delete(self, request):
         serializer = AvailabilityDeleteQuerySerializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
+        if serializer.validated_data["background"]:
+            job = start_deletion_job(
+                kind=DELETION_AVAILABILITY, filters=serializer.validated_data
+            )
+            return Response(job, status=status.HTTP_202_ACCEPTED)
         result = delete_availability(filters=serializer.validated_data)
         return Response(result, status=status.HTTP_200_OK)
 
@@ -74,6 +95,11 @@ class ScheduleBlockView(APIView):
     def delete(self, request):
         serializer = ScheduleBlockDeleteQuerySerializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
+        if serializer.validated_data["background"]:
+            job = start_deletion_job(
+                kind=DELETION_BLOCKS, filters=serializer.validated_data
+            )
+            return Response(job, status=status.HTTP_202_ACCEPTED)
         result = delete_blocks(filters=serializer.validated_data)
         return Response(result, status=status.HTTP_200_OK)
 
@@ -99,3 +125,34 @@ class AvailabilityBatchDetailView(APIView):
         except AvailabilityConflictError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
         return Response(result, status=status.HTTP_200_OK)
+
+
+class DeletionJobView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, job_id):
+        job = get_deletion_job(job_id)
+        if not job:
+            return Response({"detail": "Job no encontrado."}, status=404)
+        return Response(job, status=status.HTTP_200_OK)
+
+
+class FreeSlotsView(APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        serializer = FreeSlotsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        days = get_free_slots(
+            journey_id=data["jornada_id"], start=data["start"], end=data["end"]
+        )
+        return Response(
+            {
+                "jornada_id": str(data["jornada_id"]),
+                "start": data["start"].isoformat(),
+                "end": data["end"].isoformat(),
+                "days": days,
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0024_item_metrics"),
+        ("scheduling", "0002_availabilitybatch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AvailabilityException",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+            ],
+            options={
+                "db_table": "availability_exceptions",
+            },
+        ),
+        migrations.AddField(
+            model_name="availabilitybatch",
+            name="mode",
+            field=models.CharField(
+                choices=[("MATERIALIZED", "Materialized"), ("VIRTUAL", "Virtual")],
+                default="MATERIALIZED",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="availabilitybatch",
+            index=models.Index(
+                fields=["mode", "date_end"], name="availabilit_mode_c201c0_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="availabilityexception",
+            name="batch",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="exceptions",
+                to="scheduling.availabilitybatch",
+            ),
+        ),
+        migrations.AddField(
+            model_name="availabilityexception",
+            name="journey",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="availability_exceptions",
+                to="catalog.journey",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="availabilityexception",
+            constraint=models.UniqueConstraint(
+                fields=("batch", "journey", "date"),
+                name="uq_availability_exception_batch_journey_date",
+            ),
+        ),
+    ]
@@ -9,8 +9,16 @@ class AvailabilityBatch(models.Model):
         MONTHLY = "MONTHLY", "Monthly"
         SINGLE = "SINGLE", "Single"
 
+    class Mode(models.TextChoices):
+        # MATERIALIZED genera filas de dias/slots; VIRTUAL evalua la regla al leer.
+        MATERIALIZED = "MATERIALIZED", "Materialized"
+        VIRTUAL = "VIRTUAL", "Virtual"
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     type = models.CharField(max_length=20, choices=Type.choices)
+    mode = models.CharField(
+        max_length=20, choices=Mode.choices, default=Mode.MATERIALIZED
+    )
     date_start = models.DateField()
     date_end = models.DateField()
     rule = models.JSONField()
@@ -19,6 +27,34 @@ class AvailabilityBatch(models.Model):
 
     class Meta:
         db_table = "availability_batches"
+        indexes = [
+            models.Index(fields=["mode", "date_end"]),
+        ]
+
+
+class AvailabilityException(models.Model):
+    """Day of a virtual batch that no longer applies to a journey."""
+
+    batch = models.ForeignKey(
+        AvailabilityBatch,
+        on_delete=models.CASCADE,
+        related_name="exceptions",
+    )
+    journey = models.ForeignKey(
+        "catalog.Journey",
+        on_delete=models.CASCADE,
+        related_name="availability_exceptions",
+    )
+    date = models.DateField()
+
+    class Meta:
+        db_table = "availability_exceptions"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["batch", "journey", "date"],
+                name="uq_availability_exception_batch_journey_date",
+            ),
+        ]
 
 
 class AvailabilityDay(models.Model):
@@ -1,20 +1,44 @@
 import uuid
+from calendar import monthrange
 from collections import defaultdict
-from datetime import timedelta
-from typing import Iterable
-
-from django.db import transaction
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, time, timedelta
+from time import perf_counter
+from typing import Iterable, Iterator, NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Prefetch
 from django.utils import timezone
 
 from apps.catalog.models import Journey
 from apps.scheduling.models import (
     AvailabilityBatch,
     AvailabilityDay,
+    AvailabilityException,
     AvailabilitySlot,
     ScheduleBlock,
 )
 
 
+INSERT_BATCH_SIZE = 1000
+DELETE_CHUNK_SIZE = 1000
+DELETION_JOB_TIMEOUT = 60 * 60 * 24
+FREE_SLOTS_MAX_DAYS = 62
+
+_FREE_SLOTS_KEY = "scheduling:free:{journey_id}:{date}"
+_JOB_KEY = "scheduling:job:{job_id}"
+
+
+class Interval(NamedTuple):
+    journey_id: uuid.UUID
+    date: date
+    start_time: time
+    end_time: time
+
+
 class AvailabilityConflictError(Exception):
     def __init__(self, journey_name, date):
         date_str = date.strftime("%d/%m/%Y") if hasattr(date, "strftime") else str(date)
@@ -29,6 +53,26 @@ class EmptyAvailabilityError(Exception):
     pass
 
 
+# Los servicios invalidan los dias que tocan; las senales cubren el admin.
+_free_slots_receivers_muted: ContextVar[bool] = ContextVar(
+    "free_slots_receivers_muted", default=False
+)
+
+
+@contextmanager
+def free_slots_receivers_muted():
+    """Skip the free slots receivers inside the block (or decorated function)."""
+    token = _free_slots_receivers_muted.set(True)
+    try:
+        yield
+    finally:
+        _free_slots_receivers_muted.reset(token)
+
+
+def free_slots_receivers_are_muted() -> bool:
+    return _free_slots_receivers_muted.get()
+
+
 def _date_range(start_date, end_date) -> Iterable:
     current = start_date
     while current <= end_date:
@@ -36,34 +80,171 @@ def _date_range(start_date, end_date) -> Iterable:
         current += timedelta(days=1)
 
 
-def _is_nth_weekday(target_date, week_day: int, index: int) -> bool:
-    if target_date.isoweekday() != week_day:
-        return False
-    first_day = target_date.replace(day=1)
-    first_weekday = first_day.isoweekday()
-    day_offset = (week_day - first_weekday) % 7
-    first_occurrence_day = 1 + day_offset
-    if target_date.day < first_occurrence_day:
-        return False
-    occurrence = 1 + ((target_date.day - first_occurrence_day) // 7)
-    return occurrence == index
+def _iter_months(start_date, end_date) -> Iterator[tuple[int, int]]:
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _nth_weekday(year: int, month: int, week_day: int, index: int):
+    """Date of the ``index``-th ISO ``week_day`` of the month, or None."""
+    first_weekday = date(year, month, 1).isoweekday()
+    day = 1 + (week_day - first_weekday) % 7 + 7 * (index - 1)
+    if day > monthrange(year, month)[1]:
+        return None
+    return date(year, month, day)
+
+
+def _weekly_dates(weekly_map: dict, start_date, end_date):
+    firsts = sorted(
+        (start_date + timedelta(days=(day_of_week - start_date.isoweekday()) % 7), slots)
+        for day_of_week, slots in weekly_map.items()
+        if slots
+    )
+    offset = timedelta(0)
+    while firsts and firsts[0][0] + offset <= end_date:
+        for first, slots in firsts:
+            current = first + offset
+            if current > end_date:
+                break
+            yield current, slots
+        offset += timedelta(days=7)
+
+
+def _monthly_dates(recurrence_rule: dict, time_slots, start_date, end_date):
+    mode = recurrence_rule.get("mode")
+    for year, month in _iter_months(start_date, end_date):
+        if mode == "SPECIFIC_DATE":
+            day = recurrence_rule.get("day_of_month")
+            if not day or day > monthrange(year, month)[1]:
+                continue
+            current = date(year, month, day)
+        elif mode == "RELATIVE":
+            current = _nth_weekday(
+                year, month, recurrence_rule.get("week_day"), recurrence_rule.get("index")
+            )
+            if current is None:
+                continue
+        else:
+            return
+        if start_date <= current <= end_date:
+            yield current, time_slots
+
+
+def expand_rule(payload: dict, start_date, end_date) -> Iterator[tuple]:
+    """
+    Yield ``(date, time_slots)`` for every date matched by the rule, in order.
+
+    Dates are reached by calendar arithmetic (stride 7 for WEEKLY, one step per
+    month for MONTHLY), so the cost follows the number of matches and not the
+    length of the range.
+    """
+    availability_type = payload["type"]
+    time_slots = payload.get("time_slots") or []
+    if availability_type == "WEEKLY":
+        weekly_map = {
+            item["day_of_week"]: item["time_slots"]
+            for item in payload.get("weekly_config") or []
+        }
+        yield from _weekly_dates(weekly_map, start_date, end_date)
+    elif availability_type == "MONTHLY":
+        if time_slots:
+            yield from _monthly_dates(
+                payload.get("recurrence_rule") or {}, time_slots, start_date, end_date
+            )
+    elif availability_type == "SINGLE":
+        if time_slots:
+            for current in _date_range(start_date, end_date):
+                yield current, time_slots
+
+
+def _merge_ranges(ranges) -> list[tuple]:
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _existing_slot_ranges(intervals, exclude_batch_id=None) -> dict:
+    """Slots ya cargados para las jornadas y el rango de fechas, en una query."""
+    journey_ids = {interval.journey_id for interval in intervals}
+    dates = [interval.date for interval in intervals]
+    qs = AvailabilitySlot.objects.filter(
+        availability_day__journey_id__in=journey_ids,
+        availability_day__date__range=(min(dates), max(dates)),
+    )
+    if exclude_batch_id:
+        qs = qs.exclude(availability_day__batch_id=exclude_batch_id)
+
+    existing = defaultdict(list)
+    for journey_id, day, start_time, end_time in qs.values_list(
+        "availability_day__journey_id",
+        "availability_day__date",
+        "start_time",
+        "end_time",
+    ):
+        existing[(journey_id, day)].append((start_time, end_time))
+    for _, interval in iter_virtual_intervals(
+        start_date=min(dates),
+        end_date=max(dates),
+        journey_ids=journey_ids,
+        exclude_batch_id=exclude_batch_id,
+    ):
+        existing[(interval.journey_id, interval.date)].append(
+            (interval.start_time, interval.end_time)
+        )
+    return existing
+
+
+def _find_conflict(intervals, exclude_batch_id=None):
+    """
+    Return the first interval (in input order) that overlaps an existing slot.
+
+    Existing slots are merged per (journey, date) into disjoint ranges and swept
+    against the new intervals sorted by start, so the check is linear in the
+    number of rows instead of one query per interval.
+    """
+    if not intervals:
+        return None
+    existing = _existing_slot_ranges(intervals, exclude_batch_id)
+    if not existing:
+        return None
+
+    pending = defaultdict(list)
+    for index, interval in enumerate(intervals):
+        key = (interval.journey_id, interval.date)
+        if key in existing:
+            pending[key].append(index)
+
+    first_conflict = None
+    for key, indexes in pending.items():
+        ranges = _merge_ranges(existing[key])
+        indexes.sort(key=lambda idx: intervals[idx].start_time)
+        pointer = 0
+        for index in indexes:
+            interval = intervals[index]
+            while pointer < len(ranges) and ranges[pointer][1] <= interval.start_time:
+                pointer += 1
+            if pointer == len(ranges):
+                break
+            if ranges[pointer][0] < interval.end_time:
+                if first_conflict is None or index < first_conflict:
+                    first_conflict = index
+    return None if first_conflict is None else intervals[first_conflict]
 
 
 def _check_conflicts(intervals, journey_map, exclude_batch_id=None) -> None:
-    for interval in intervals:
-        qs = AvailabilitySlot.objects.filter(
-            availability_day__journey_id=interval["journey_id"],
-            availability_day__date=interval["date"],
-            start_time__lt=interval["end_time"],
-            end_time__gt=interval["start_time"],
+    conflict = _find_conflict(intervals, exclude_batch_id=exclude_batch_id)
+    if conflict is not None:
+        journey_name = journey_map.get(conflict.journey_id) or conflict.journey_id
+        raise AvailabilityConflictError(
+            journey_name=journey_name, date=conflict.date
         )
-        if exclude_batch_id:
-            qs = qs.exclude(availability_day__batch_id=exclude_batch_id)
-        if qs.exists():
-            journey_name = journey_map.get(interval["journey_id"]) or interval["journey_id"]
-            raise AvailabilityConflictError(
-                journey_name=journey_name, date=interval["date"]
-            )
 
 
 def _serialize_rule_payload(payload: dict) -> dict:
@@ -103,55 +284,216 @@ def _serialize_rule_payload(payload: dict) -> dict:
     return rule
 
 
-def _build_intervals(*, payload: dict, start_date=None, end_date=None) -> list[dict]:
-    availability_type = payload["type"]
-    journey_ids = payload["jornada_ids"]
+def iter_intervals(*, payload: dict, start_date=None, end_date=None) -> Iterator[Interval]:
+    """Lazily yield the intervals of the rule for every journey of the payload."""
     date_range = payload["date_range"]
     start_date = start_date or date_range["start"]
     end_date = end_date or date_range["end"]
-    weekly_config = payload.get("weekly_config") or []
-    recurrence_rule = payload.get("recurrence_rule") or {}
-    time_slots = payload.get("time_slots") or []
+    # La expansion es la misma para todas las jornadas: se calcula una vez.
+    occurrences = list(expand_rule(payload, start_date, end_date))
+    for journey_id in payload["jornada_ids"]:
+        for current_date, slots in occurrences:
+            for slot in slots:
+                yield Interval(journey_id, current_date, slot["start"], slot["end"])
 
-    weekly_map = {item["day_of_week"]: item["time_slots"] for item in weekly_config}
-    intervals = []
 
-    for journey_id in journey_ids:
-        for current_date in _date_range(start_date, end_date):
-            slots_for_day = []
-            if availability_type == "WEEKLY":
-                slots_for_day = weekly_map.get(current_date.isoweekday(), [])
-            elif availability_type == "MONTHLY":
-                mode = recurrence_rule.get("mode")
-                if mode == "SPECIFIC_DATE":
-                    if current_date.day == recurrence_rule.get("day_of_month"):
-                        slots_for_day = time_slots
-                elif mode == "RELATIVE":
-                    if _is_nth_weekday(
-                        current_date,
-                        recurrence_rule.get("week_day"),
-                        recurrence_rule.get("index"),
-                    ):
-                        slots_for_day = time_slots
-            elif availability_type == "SINGLE":
-                slots_for_day = time_slots
-
-            if not slots_for_day:
-                continue
+def _build_intervals(*, payload: dict, start_date=None, end_date=None) -> list[Interval]:
+    return list(iter_intervals(payload=payload, start_date=start_date, end_date=end_date))
+
+
+# =========================
+# Batches virtuales
+# =========================
 
-            for slot in slots_for_day:
-                intervals.append(
-                    {
-                        "journey_id": journey_id,
-                        "date": current_date,
-                        "start_time": slot["start"],
-                        "end_time": slot["end"],
-                    }
-                )
 
-    return intervals
+def _parse_rule_slots(items) -> list[dict]:
+    return [
+        {"start": time.fromisoformat(item["start"]), "end": time.fromisoformat(item["end"])}
+        for item in items
+    ]
 
 
+def _payload_from_rule(rule: dict) -> dict:
+    """Inverse of ``_serialize_rule_payload``."""
+    payload = {
+        "type": rule["type"],
+        "jornada_ids": [uuid.UUID(journey_id) for journey_id in rule["jornada_ids"]],
+        "date_range": {
+            "start": date.fromisoformat(rule["date_range"]["start"]),
+            "end": date.fromisoformat(rule["date_range"]["end"]),
+        },
+    }
+    if rule.get("weekly_config"):
+        payload["weekly_config"] = [
+            {
+                "day_of_week": item["day_of_week"],
+                "time_slots": _parse_rule_slots(item["time_slots"]),
+            }
+            for item in rule["weekly_config"]
+        ]
+    if rule.get("recurrence_rule"):
+        payload["recurrence_rule"] = rule["recurrence_rule"]
+    if rule.get("time_slots"):
+        payload["time_slots"] = _parse_rule_slots(rule["time_slots"])
+    return payload
+
+
+def _rule_segments(rule: dict) -> Iterator[tuple[dict, date, date]]:
+    """
+    Yield ``(rule, start, end)`` for each rule a virtual batch has had.
+
+    ``rule["history"]`` keeps the previous rules with the last day (``until``)
+    they applied, so an update from ``effective_from`` leaves earlier days as
+    they were, like it does for materialized batches.
+    """
+    segment_start = None
+    for previous in rule.get("history") or []:
+        start = date.fromisoformat(previous["date_range"]["start"])
+        end = min(
+            date.fromisoformat(previous["date_range"]["end"]),
+            date.fromisoformat(previous["until"]),
+        )
+        if segment_start is not None:
+            start = max(start, segment_start)
+        if start <= end:
+            yield previous, start, end
+        segment_start = date.fromisoformat(previous["until"]) + timedelta(days=1)
+
+    start = date.fromisoformat(rule["date_range"]["start"])
+    if segment_start is not None:
+        start = max(start, segment_start)
+    end = date.fromisoformat(rule["date_range"]["end"])
+    if start <= end:
+        yield rule, start, end
+
+
+def _rule_journey_ids(rule: dict) -> set:
+    return {
+        uuid.UUID(journey_id)
+        for segment, _, _ in _rule_segments(rule)
+        for journey_id in segment["jornada_ids"]
+    }
+
+
+def _virtual_batches(*, start_date=None, end_date=None, batch_id=None, exclude_batch_id=None):
+    qs = AvailabilityBatch.objects.filter(mode=AvailabilityBatch.Mode.VIRTUAL)
+    exceptions_qs = AvailabilityException.objects.all()
+    if start_date:
+        qs = qs.filter(date_end__gte=start_date)
+        exceptions_qs = exceptions_qs.filter(date__gte=start_date)
+    if end_date:
+        qs = qs.filter(date_start__lte=end_date)
+        exceptions_qs = exceptions_qs.filter(date__lte=end_date)
+    if batch_id:
+        qs = qs.filter(id=batch_id)
+    if exclude_batch_id:
+        qs = qs.exclude(id=exclude_batch_id)
+    return qs.prefetch_related(Prefetch("exceptions", queryset=exceptions_qs))
+
+
+def _iter_batch_intervals(batch, *, start_date=None, end_date=None, journey_ids=None):
+    skipped = {(item.journey_id, item.date) for item in batch.exceptions.all()}
+    for rule, segment_start, segment_end in _rule_segments(batch.rule):
+        if start_date:
+            segment_start = max(segment_start, start_date)
+        if end_date:
+            segment_end = min(segment_end, end_date)
+        if segment_start > segment_end:
+            continue
+        payload = _payload_from_rule(rule)
+        if journey_ids is not None:
+            payload["jornada_ids"] = [
+                journey_id for journey_id in payload["jornada_ids"] if journey_id in journey_ids
+            ]
+        for interval in iter_intervals(
+            payload=payload, start_date=segment_start, end_date=segment_end
+        ):
+            if (interval.journey_id, interval.date) not in skipped:
+                yield interval
+
+
+def iter_virtual_intervals(
+    *,
+    start_date=None,
+    end_date=None,
+    journey_ids=None,
+    batch_id=None,
+    exclude_batch_id=None,
+) -> Iterator[tuple[uuid.UUID, Interval]]:
+    """
+    Yield ``(batch_id, interval)`` for the virtual batches in the window.
+
+    The stored rules are evaluated on the fly and the days recorded in
+    ``AvailabilityException`` are skipped.
+    """
+    journey_ids = set(journey_ids) if journey_ids is not None else None
+    for batch in _virtual_batches(
+        start_date=start_date,
+        end_date=end_date,
+        batch_id=batch_id,
+        exclude_batch_id=exclude_batch_id,
+    ):
+        for interval in _iter_batch_intervals(
+            batch, start_date=start_date, end_date=end_date, journey_ids=journey_ids
+        ):
+            yield batch.id, interval
+
+
+def _drop_rule_journeys(rule: dict, journey_ids) -> dict:
+    """``rule`` without ``journey_ids``, in the current segment and in its history."""
+    dropped = {str(journey_id) for journey_id in journey_ids}
+
+    def _without(segment):
+        return {
+            **segment,
+            "jornada_ids": [
+                journey_id for journey_id in segment["jornada_ids"] if journey_id not in dropped
+            ],
+        }
+
+    trimmed = _without(rule)
+    if rule.get("history"):
+        trimmed["history"] = [_without(previous) for previous in rule["history"]]
+    return trimmed
+
+
+def _rule_history_until(rule: dict, until) -> list[dict]:
+    """Segments of ``rule`` that applied up to ``until`` (inclusive)."""
+    history = []
+    for segment, segment_start, segment_end in _rule_segments(rule):
+        if segment_start > until:
+            break
+        previous = {key: value for key, value in segment.items() if key != "history"}
+        previous["until"] = min(segment_end, until).isoformat()
+        history.append(previous)
+    return history
+
+
+@contextmanager
+def _timed(timings: dict, phase: str):
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = round((perf_counter() - started) * 1000, 2)
+
+
+def _bulk_create_days(day_keys, batch_id) -> dict:
+    """Insert the days in batches; Postgres returns the ids (RETURNING)."""
+    days = [
+        AvailabilityDay(journey_id=journey_id, date=date, batch_id=batch_id)
+        for journey_id, date in day_keys
+    ]
+    AvailabilityDay.objects.bulk_create(days, batch_size=INSERT_BATCH_SIZE)
+    return {(day.journey_id, day.date): day for day in days}
+
+
+def _bulk_create_slots(slot_rows) -> int:
+    AvailabilitySlot.objects.bulk_create(slot_rows, batch_size=INSERT_BATCH_SIZE)
+    return len(slot_rows)
+
+
+@free_slots_receivers_muted()
 def create_availability(*, payload: dict) -> dict:
     batch_id = uuid.uuid4()
     intervals = _build_intervals(payload=payload)
@@ -169,38 +511,47 @@ def create_availability(*, payload: dict) -> dict:
         for journey in Journey.objects.filter(id__in=journey_ids).only("id", "title")
     }
 
+    mode = payload.get("mode") or AvailabilityBatch.Mode.MATERIALIZED
+    day_keys = dict.fromkeys((interval.journey_id, interval.date) for interval in intervals)
+
+    timings = {}
     with transaction.atomic():
-        _check_conflicts(intervals, journey_map)
+        with _timed(timings, "conflicts"):
+            _check_conflicts(intervals, journey_map)
         AvailabilityBatch.objects.create(
             id=batch_id,
             type=payload["type"],
+            mode=mode,
             date_start=start_date,
             date_end=end_date,
             rule=rule_payload,
         )
-        day_map = {}
-        slot_rows = []
-        for interval in intervals:
-            key = (interval["journey_id"], interval["date"])
-            if key not in day_map:
-                day_map[key] = AvailabilityDay.objects.create(
-                    journey_id=interval["journey_id"],
-                    date=interval["date"],
-                    batch_id=batch_id,
+        # Un batch virtual solo guarda la regla: dias y slots se evaluan al leer.
+        if mode == AvailabilityBatch.Mode.MATERIALIZED:
+            with _timed(timings, "days"):
+                day_map = _bulk_create_days(day_keys, batch_id)
+            with _timed(timings, "slots"):
+                _bulk_create_slots(
+                    [
+                        AvailabilitySlot(
+                            availability_day=day_map[
+                                (interval.journey_id, interval.date)
+                            ],
+                            start_time=interval.start_time,
+                            end_time=interval.end_time,
+                        )
+                        for interval in intervals
+                    ]
                 )
-            slot_rows.append(
-                AvailabilitySlot(
-                    availability_day=day_map[key],
-                    start_time=interval["start_time"],
-                    end_time=interval["end_time"],
-                )
-            )
-        AvailabilitySlot.objects.bulk_create(slot_rows)
+
+    invalidate_free_slots(day_keys)
 
     return {
         "batch_id": str(batch_id),
-        "days_created": len(day_map),
-        "slots_created": len(slot_rows),
+        "mode": mode,
+        "days_created": len(day_keys),
+        "slots_created": len(intervals),
+        "timings_ms": timings,
     }
 
 
@@ -227,10 +578,117 @@ def create_blocks(*, payload: dict) -> dict:
         for journey_id in journey_ids
     ]
     ScheduleBlock.objects.bulk_create(blocks)
+    invalidate_free_slots((journey_id, block_date) for journey_id in journey_ids)
 
     return {"blocks_created": len(blocks)}
 
 
+def _changes_by_day(to_add, to_delete) -> dict:
+    changes_map = defaultdict(lambda: {"added": [], "removed": []})
+    for item in to_add:
+        changes_map[(item[0], item[1])]["added"].append(
+            {"start": item[2].strftime("%H:%M"), "end": item[3].strftime("%H:%M")}
+        )
+    for item in to_delete:
+        changes_map[(item[0], item[1])]["removed"].append(
+            {"start": item[2].strftime("%H:%M"), "end": item[3].strftime("%H:%M")}
+        )
+    return changes_map
+
+
+def _serialize_changes(changes_map) -> list[dict]:
+    changes = []
+    if changes_map:
+        journey_names = {
+            journey.id: journey.title
+            for journey in Journey.objects.filter(
+                id__in={key[0] for key in changes_map.keys()}
+            ).only("id", "title")
+        }
+        for (journey_id, date), payload_changes in changes_map.items():
+            changes.append(
+                {
+                    "journey_id": str(journey_id),
+                    "journey_name": journey_names.get(journey_id, str(journey_id)),
+                    "date": date.isoformat(),
+                    "added": payload_changes["added"],
+                    "removed": payload_changes["removed"],
+                }
+            )
+    return changes
+
+
+def _update_virtual_batch(*, batch, payload: dict, effective_start, new_set: set) -> dict:
+    """
+    Replace the rule of a virtual batch from ``effective_start`` on.
+
+    Nothing is rewritten row by row: the previous rule is kept in the rule
+    history up to the day before and the exceptions of the affected days are
+    dropped, since the new rule is authoritative for them.
+    """
+    timings = {}
+    date_range = payload["date_range"]
+    window_end = max(date_range["end"], batch.date_end)
+    old_set = set()
+    if effective_start <= window_end:
+        old_set = {
+            interval
+            for _, interval in iter_virtual_intervals(
+                start_date=effective_start, end_date=window_end, batch_id=batch.id
+            )
+        }
+    to_add = new_set - old_set
+    to_delete = old_set - new_set
+
+    if to_add:
+        journey_map = {
+            journey.id: journey.title
+            for journey in Journey.objects.filter(
+                id__in=payload["jornada_ids"]
+            ).only("id", "title")
+        }
+        with _timed(timings, "conflicts"):
+            _check_conflicts(list(to_add), journey_map, exclude_batch_id=batch.id)
+
+    old_days = {(item[0], item[1]) for item in old_set}
+    new_days = {(item[0], item[1]) for item in new_set}
+    changes_map = _changes_by_day(to_add, to_delete)
+
+    with transaction.atomic():
+        batch = AvailabilityBatch.objects.select_for_update().get(id=batch.id)
+        rule = _serialize_rule_payload(payload)
+        history = _rule_history_until(batch.rule, effective_start - timedelta(days=1))
+        if history:
+            rule["history"] = history
+            date_start = min(
+                date_range["start"], date.fromisoformat(history[0]["date_range"]["start"])
+            )
+        else:
+            date_start = date_range["start"]
+        AvailabilityException.objects.filter(
+            batch_id=batch.id, date__gte=effective_start
+        ).delete()
+
+        batch.type = payload["type"]
+        batch.date_start = date_start
+        batch.date_end = date_range["end"]
+        batch.rule = rule
+        batch.save(update_fields=["type", "date_start", "date_end", "rule", "updated_at"])
+        invalidate_free_slots(changes_map.keys())
+
+    return {
+        "batch_id": str(batch.id),
+        "mode": batch.mode,
+        "days_created": len(new_days - old_days),
+        "days_deleted": len(old_days - new_days),
+        "slots_created": len(to_add),
+        "slots_deleted": len(to_delete),
+        "changes": _serialize_changes(changes_map),
+        "timings_ms": timings,
+    }
+
+
+@free_slots_receivers_muted()
 def update_availability_batch(*, batch_id, payload: dict) -> dict:
     batch = AvailabilityBatch.objects.filter(id=batch_id).first()
     if not batch:
@@ -249,35 +707,33 @@ def update_availability_batch(*, batch_id, payload: dict) -> dict:
             payload=payload, start_date=effective_start, end_date=end_date
         )
 
-    new_set = {
-        (
-            interval["journey_id"],
-            interval["date"],
-            interval["start_time"],
-            interval["end_time"],
+    new_set = set(intervals)
+    if batch.mode == AvailabilityBatch.Mode.VIRTUAL:
+        return _update_virtual_batch(
+            batch=batch,
+            payload=payload,
+            effective_start=effective_start,
+            new_set=new_set,
         )
-        for interval in intervals
-    }
 
+    timings = {}
     days_qs = AvailabilityDay.objects.filter(
         batch_id=batch_id, date__gte=effective_start
     )
     day_map = {(day.journey_id, day.date): day for day in days_qs}
-    slots_qs = AvailabilitySlot.objects.filter(availability_day__in=days_qs)
+    day_keys_by_id = {day.id: key for key, day in day_map.items()}
 
     old_set = set()
     slot_map = {}
     old_day_counts = defaultdict(int)
-    for slot in slots_qs:
-        key = (
-            slot.availability_day.journey_id,
-            slot.availability_day.date,
-            slot.start_time,
-            slot.end_time,
-        )
+    for slot_id, day_id, start_time, end_time in AvailabilitySlot.objects.filter(
+        availability_day_id__in=day_keys_by_id
+    ).values_list("id", "availability_day_id", "start_time", "end_time"):
+        journey_id, date = day_keys_by_id[day_id]
+        key = (journey_id, date, start_time, end_time)
         old_set.add(key)
-        slot_map[key] = slot.id
-        old_day_counts[(key[0], key[1])] += 1
+        slot_map[key] = slot_id
+        old_day_counts[(journey_id, date)] += 1
 
     to_add = new_set - old_set
     to_delete = old_set - new_set
@@ -287,19 +743,12 @@ def update_availability_batch(*, batch_id, payload: dict) -> dict:
         for journey in Journey.objects.filter(id__in=journey_ids).only("id", "title")
     }
     if to_add:
-        _check_conflicts(
-            [
-                {
-                    "journey_id": item[0],
-                    "date": item[1],
-                    "start_time": item[2],
-                    "end_time": item[3],
-                }
-                for item in to_add
-            ],
-            journey_map,
-            exclude_batch_id=batch_id,
-        )
+        with _timed(timings, "conflicts"):
+            _check_conflicts(
+                [Interval(*item) for item in to_add],
+                journey_map,
+                exclude_batch_id=batch_id,
+            )
 
     removed_by_day = defaultdict(int)
     for item in to_delete:
@@ -316,89 +765,83 @@ def update_availability_batch(*, batch_id, payload: dict) -> dict:
             if day:
                 days_to_delete.append(day)
 
-    changes_map = defaultdict(lambda: {"added": [], "removed": []})
-    for item in to_add:
-        changes_map[(item[0], item[1])]["added"].append(
-            {"start": item[2].strftime("%H:%M"), "end": item[3].strftime("%H:%M")}
-        )
-    for item in to_delete:
-        changes_map[(item[0], item[1])]["removed"].append(
-            {"start": item[2].strftime("%H:%M"), "end": item[3].strftime("%H:%M")}
-        )
+    changes_map = _changes_by_day(to_add, to_delete)
 
     with transaction.atomic():
         batch = AvailabilityBatch.objects.select_for_update().get(id=batch_id)
-        if to_delete:
-            slot_ids = [slot_map[item] for item in to_delete if item in slot_map]
-            AvailabilitySlot.objects.filter(id__in=slot_ids).delete()
-        if days_to_delete:
-            AvailabilityDay.objects.filter(id__in=[day.id for day in days_to_delete]).delete()
-
-        days_created = 0
-        slot_rows = []
-        for journey_id, date, start_time, end_time in to_add:
-            day_key = (journey_id, date)
-            day = day_map.get(day_key)
-            if not day:
-                day = AvailabilityDay.objects.create(
-                    journey_id=journey_id,
-                    date=date,
-                    batch_id=batch_id,
-                )
-                day_map[day_key] = day
-                days_created += 1
-            slot_rows.append(
-                AvailabilitySlot(
-                    availability_day=day,
-                    start_time=start_time,
-                    end_time=end_time,
-                )
+        with _timed(timings, "delete"):
+            if to_delete:
+                slot_ids = [slot_map[item] for item in to_delete if item in slot_map]
+                AvailabilitySlot.objects.filter(id__in=slot_ids).delete()
+            if days_to_delete:
+                AvailabilityDay.objects.filter(
+                    id__in=[day.id for day in days_to_delete]
+                ).delete()
+
+        with _timed(timings, "days"):
+            new_day_keys = dict.fromkeys(
+                (journey_id, date)
+                for journey_id, date, _, _ in to_add
+                if (journey_id, date) not in day_map
+            )
+            day_map.update(_bulk_create_days(new_day_keys, batch_id))
+            days_created = len(new_day_keys)
+        with _timed(timings, "slots"):
+            _bulk_create_slots(
+                [
+                    AvailabilitySlot(
+                        availability_day=day_map[(journey_id, date)],
+                        start_time=start_time,
+                        end_time=end_time,
+                    )
+                    for journey_id, date, start_time, end_time in to_add
+                ]
             )
-        if slot_rows:
-            AvailabilitySlot.objects.bulk_create(slot_rows)
 
         batch.type = payload["type"]
         batch.date_start = start_date
         batch.date_end = end_date
         batch.rule = _serialize_rule_payload(payload)
         batch.save(update_fields=["type", "date_start", "date_end", "rule", "updated_at"])
+        invalidate_free_slots(changes_map.keys())
 
-    changes = []
-    if changes_map:
-        journey_names = {
-            journey.id: journey.title
-            for journey in Journey.objects.filter(
-                id__in={key[0] for key in changes_map.keys()}
-            ).only("id", "title")
-        }
-        for (journey_id, date), payload_changes in changes_map.items():
-            changes.append(
-                {
-                    "journey_id": str(journey_id),
-                    "journey_name": journey_names.get(journey_id, str(journey_id)),
-                    "date": date.isoformat(),
-                    "added": payload_changes["added"],
-                    "removed": payload_changes["removed"],
-                }
-            )
+    changes = _serialize_changes(changes_map)
 
     return {
         "batch_id": str(batch_id),
+        "mode": batch.mode,
         "days_created": days_created,
         "days_deleted": len(days_to_delete),
         "slots_created": len(to_add),
         "slots_deleted": len(to_delete),
         "changes": changes,
+        "timings_ms": timings,
     }
 
 
-def list_availability(*, filters: dict) -> list[dict]:
-    qs = AvailabilityDay.objects.select_related("journey").prefetch_related("slots")
+class AvailabilityDayRow(NamedTuple):
+    date: date
+    journey_id: uuid.UUID
+    journey_name: str
+    batch_id: uuid.UUID
+    slots: list
+
+
+def _availability_rows(filters: dict) -> list[AvailabilityDayRow]:
+    """Materialized and virtual days matching the filters, ordered by date/journey."""
     jornada_id = filters.get("jornada_id")
     batch_id = filters.get("batch_id")
     start = filters.get("start")
     end = filters.get("end")
 
+    qs = AvailabilityDay.objects.select_related("journey").prefetch_related(
+        Prefetch(
+            "slots",
+            queryset=AvailabilitySlot.objects.only(
+                "availability_day_id", "start_time", "end_time"
+            ).order_by("start_time"),
+        )
+    )
     if jornada_id:
         qs = qs.filter(journey_id=jornada_id)
     if batch_id:
@@ -406,28 +849,181 @@ def list_availability(*, filters: dict) -> list[dict]:
     if start and end:
         qs = qs.filter(date__range=(start, end))
 
-    results = []
-    for day in qs.order_by("date", "journey_id"):
-        slots = [
-            {
-                "start": slot.start_time.strftime("%H:%M"),
-                "end": slot.end_time.strftime("%H:%M"),
-            }
-            for slot in day.slots.all().order_by("start_time")
-        ]
-        results.append(
-            {
-                "journey_id": str(day.journey_id),
-                "journey_name": day.journey.title,
-                "date": day.date.isoformat(),
-                "batch_id": str(day.batch_id),
-                "slots": slots,
-            }
+    rows = [
+        AvailabilityDayRow(
+            day.date,
+            day.journey_id,
+            day.journey.title,
+            day.batch_id,
+            [(slot.start_time, slot.end_time) for slot in day.slots.all()],
         )
-    return results
+        for day in qs.order_by("date", "journey_id").only(
+            "date", "journey_id", "batch_id", "journey__title"
+        )
+    ]
+
+    virtual_days = defaultdict(list)
+    for virtual_batch_id, interval in iter_virtual_intervals(
+        start_date=start,
+        end_date=end,
+        journey_ids=[jornada_id] if jornada_id else None,
+        batch_id=batch_id,
+    ):
+        virtual_days[(interval.date, interval.journey_id, virtual_batch_id)].append(
+            (interval.start_time, interval.end_time)
+        )
+    if virtual_days:
+        journey_names = dict(
+            Journey.objects.filter(
+                id__in={key[1] for key in virtual_days}
+            ).values_list("id", "title")
+        )
+        rows.extend(
+            AvailabilityDayRow(
+                day_date,
+                journey_id,
+                journey_names.get(journey_id, str(journey_id)),
+                virtual_batch_id,
+                sorted(slots),
+            )
+            for (day_date, journey_id, virtual_batch_id), slots in virtual_days.items()
+        )
+        rows.sort(key=lambda row: (row.date, row.journey_id))
+    return rows
+
+
+def _serialize_days(rows) -> list[dict]:
+    return [
+        {
+            "journey_id": str(row.journey_id),
+            "journey_name": row.journey_name,
+            "date": row.date.isoformat(),
+            "batch_id": str(row.batch_id),
+            "slots": [
+                {"start": start_time.strftime("%H:%M"), "end": end_time.strftime("%H:%M")}
+                for start_time, end_time in row.slots
+            ],
+        }
+        for row in rows
+    ]
+
+
+def _serialize_columnar(rows) -> list[dict]:
+    """
+    One entry per journey with parallel arrays, one position per slot:
+    ``dates`` (ISO), ``starts``/``ends`` (minutes since midnight) and ``batches``
+    (index into ``batch_ids``).
+    """
+    journeys = {}
+    for row in rows:
+        journey = journeys.get(row.journey_id)
+        if journey is None:
+            journey = journeys[row.journey_id] = {
+                "journey_id": str(row.journey_id),
+                "journey_name": row.journey_name,
+                "batch_ids": [],
+                "dates": [],
+                "starts": [],
+                "ends": [],
+                "batches": [],
+                "_batch_index": {},
+            }
+        batch_index = journey["_batch_index"].get(row.batch_id)
+        if batch_index is None:
+            batch_index = journey["_batch_index"][row.batch_id] = len(journey["batch_ids"])
+            journey["batch_ids"].append(str(row.batch_id))
+        day = row.date.isoformat()
+        for start_time, end_time in row.slots:
+            journey["dates"].append(day)
+            journey["starts"].append(_to_minutes(start_time))
+            journey["ends"].append(_to_minutes(end_time))
+            journey["batches"].append(batch_index)
+    for journey in journeys.values():
+        del journey["_batch_index"]
+    return list(journeys.values())
 
 
-def delete_availability(*, filters: dict) -> dict:
+def list_availability(*, filters: dict) -> list[dict]:
+    return _serialize_days(_availability_rows(filters))
+
+
+def list_availability_page(*, filters: dict, layout: str = "days", page_days=None) -> dict:
+    """
+    Availability for one date window of ``page_days`` days starting at
+    ``filters["start"]`` (or the whole range without ``page_days``).
+
+    ``next_start`` is the first day of the following window, or None.
+    """
+    start = filters.get("start")
+    end = filters.get("end")
+    next_start = None
+    if page_days and start and end:
+        window_end = start + timedelta(days=page_days - 1)
+        if window_end < end:
+            next_start = window_end + timedelta(days=1)
+            end = window_end
+        filters = {**filters, "end": end}
+
+    rows = _availability_rows(filters)
+    serialize = _serialize_columnar if layout == "columnar" else _serialize_days
+    return {
+        "layout": layout,
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+        "next_start": next_start.isoformat() if next_start else None,
+        "results": serialize(rows),
+    }
+
+
+_DELETE_DAYS_SQL = """
+WITH target AS ({target}),
+removed_slots AS (
+    DELETE FROM {slots_table}
+    WHERE availability_day_id IN (SELECT * FROM target)
+    RETURNING 1
+),
+removed_days AS (
+    DELETE FROM {days_table}
+    WHERE id IN (SELECT * FROM target)
+    RETURNING journey_id, date
+)
+SELECT journey_id, date, (SELECT COUNT(*) FROM removed_slots) FROM removed_days
+"""
+
+_DELETE_BLOCKS_SQL = """
+DELETE FROM {blocks_table}
+WHERE id IN ({target})
+RETURNING journey_id, date
+"""
+
+
+def _iter_delete_chunks(sql_template: str, queryset, chunk_size: int) -> Iterator[list]:
+    """
+    Run a set-based ``DELETE ... RETURNING`` over ``queryset`` in chunks.
+
+    Each chunk is its own short transaction, so large ranges never hold the
+    locks of every row at once nor load the rows into Python.
+    """
+    target, params = (
+        queryset.order_by().values("pk")[:chunk_size].query.sql_with_params()
+    )
+    sql = sql_template.format(
+        target=target,
+        slots_table=AvailabilitySlot._meta.db_table,
+        days_table=AvailabilityDay._meta.db_table,
+        blocks_table=ScheduleBlock._meta.db_table,
+    )
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        if not rows:
+            return
+        yield rows
+
+
+@free_slots_receivers_muted()
+def delete_availability(*, filters: dict, progress=None) -> dict:
     qs = AvailabilityDay.objects.all()
     jornada_id = filters.get("jornada_id")
     batch_id = filters.get("batch_id")
@@ -441,12 +1037,90 @@ def delete_availability(*, filters: dict) -> dict:
     if start and end:
         qs = qs.filter(date__range=(start, end))
 
-    slots_qs = AvailabilitySlot.objects.filter(availability_day__in=qs)
-    slots_deleted = slots_qs.count()
-    days_deleted = qs.count()
-    qs.delete()
+    days_deleted = 0
+    slots_deleted = 0
+    for rows in _iter_delete_chunks(_DELETE_DAYS_SQL, qs, DELETE_CHUNK_SIZE):
+        days_deleted += len(rows)
+        slots_deleted += rows[0][2]
+        invalidate_free_slots({(journey_id, day) for journey_id, day, _ in rows})
+        if progress:
+            progress(days_deleted=days_deleted, slots_deleted=slots_deleted)
+
+    virtual_days, virtual_slots = _delete_virtual_availability(filters=filters)
+
+    return {
+        "days_deleted": days_deleted + virtual_days,
+        "slots_deleted": slots_deleted + virtual_slots,
+    }
+
+
+def _delete_virtual_availability(*, filters: dict) -> tuple[int, int]:
+    """
+    Remove virtual availability matching the filters.
+
+    A batch fully covered by the filters is dropped and a journey removed for
+    the whole span of the batch leaves its rule; otherwise the removed days
+    are recorded as exceptions. Returns ``(days, slots)`` removed.
+    """
+    jornada_id = filters.get("jornada_id")
+    start = filters.get("start")
+    end = filters.get("end")
+    journey_ids = {jornada_id} if jornada_id else None
+
+    days_deleted = 0
+    slots_deleted = 0
+    batches_to_delete = []
+    batches_to_trim = []
+    exceptions = []
+    removed_days = set()
+    for batch in _virtual_batches(
+        start_date=start, end_date=end, batch_id=filters.get("batch_id")
+    ):
+        day_keys = defaultdict(int)
+        for interval in _iter_batch_intervals(
+            batch, start_date=start, end_date=end, journey_ids=journey_ids
+        ):
+            day_keys[(interval.journey_id, interval.date)] += 1
+        if not day_keys:
+            continue
+        days_deleted += len(day_keys)
+        slots_deleted += sum(day_keys.values())
+        removed_days.update(day_keys)
+
+        covers_dates = not (start and end) or (
+            start <= batch.date_start and end >= batch.date_end
+        )
+        covers_journeys = journey_ids is None or _rule_journey_ids(batch.rule) <= journey_ids
+        if covers_dates and covers_journeys:
+            batches_to_delete.append(batch.id)
+        elif covers_dates:
+            # Una excepcion por dia serian cientos de filas por jornada: la
+            # jornada sale de la regla.
+            batches_to_trim.append(batch.id)
+        else:
+            exceptions.extend(
+                AvailabilityException(batch_id=batch.id, journey_id=journey_id, date=day)
+                for journey_id, day in day_keys
+            )
 
-    return {"days_deleted": days_deleted, "slots_deleted": slots_deleted}
+    with transaction.atomic():
+        if batches_to_delete:
+            AvailabilityBatch.objects.filter(id__in=batches_to_delete).delete()
+        for batch in AvailabilityBatch.objects.select_for_update().filter(
+            id__in=batches_to_trim
+        ):
+            batch.rule = _drop_rule_journeys(batch.rule, journey_ids)
+            batch.save(update_fields=["rule", "updated_at"])
+        if batches_to_trim:
+            AvailabilityException.objects.filter(
+                batch_id__in=batches_to_trim, journey_id__in=journey_ids
+            ).delete()
+        if exceptions:
+            AvailabilityException.objects.bulk_create(
+                exceptions, batch_size=INSERT_BATCH_SIZE, ignore_conflicts=True
+            )
+    invalidate_free_slots(removed_days)
+    return days_deleted, slots_deleted
 
 
 def list_blocks(*, filters: dict) -> list[dict]:
@@ -475,7 +1149,7 @@ def list_blocks(*, filters: dict) -> list[dict]:
     return results
 
 
-def delete_blocks(*, filters: dict) -> dict:
+def delete_blocks(*, filters: dict, progress=None) -> dict:
     qs = ScheduleBlock.objects.all()
     jornada_id = filters.get("jornada_id")
     start = filters.get("start")
@@ -486,7 +1160,222 @@ def delete_blocks(*, filters: dict) -> dict:
     if start and end:
         qs = qs.filter(date__range=(start, end))
 
-    blocks_deleted = qs.count()
-    qs.delete()
+    blocks_deleted = 0
+    for rows in _iter_delete_chunks(_DELETE_BLOCKS_SQL, qs, DELETE_CHUNK_SIZE):
+        blocks_deleted += len(rows)
+        invalidate_free_slots(set(rows))
+        if progress:
+            progress(blocks_deleted=blocks_deleted)
 
     return {"blocks_deleted": blocks_deleted}
+
+
+# =========================
+# Borrados en segundo plano
+# =========================
+
+DELETION_AVAILABILITY = "availability"
+DELETION_BLOCKS = "blocks"
+
+_DELETION_SERVICES = {
+    DELETION_AVAILABILITY: delete_availability,
+    DELETION_BLOCKS: delete_blocks,
+}
+
+
+def _job_key(job_id) -> str:
+    return _JOB_KEY.format(job_id=job_id)
+
+
+def _dump_filters(filters: dict) -> dict:
+    return {
+        key: str(filters[key])
+        for key in ("jornada_id", "batch_id", "start", "end")
+        if filters.get(key)
+    }
+
+
+def _load_filters(raw: dict) -> dict:
+    filters = {}
+    for key in ("jornada_id", "batch_id"):
+        if raw.get(key):
+            filters[key] = uuid.UUID(raw[key])
+    for key in ("start", "end"):
+        if raw.get(key):
+            filters[key] = date.fromisoformat(raw[key])
+    return filters
+
+
+def get_deletion_job(job_id) -> dict | None:
+    return cache.get(_job_key(job_id))
+
+
+def _save_job(job: dict) -> dict:
+    cache.set(_job_key(job["job_id"]), job, timeout=DELETION_JOB_TIMEOUT)
+    return job
+
+
+def start_deletion_job(*, kind: str, filters: dict) -> dict:
+    """Queue a chunked deletion in Celery; progress is polled by job id."""
+    from apps.scheduling.tasks import run_deletion_job_task
+
+    job = _save_job(
+        {
+            "job_id": str(uuid.uuid4()),
+            "kind": kind,
+            "status": "pending",
+            "filters": _dump_filters(filters),
+            "progress": {},
+            "result": None,
+            "error": None,
+        }
+    )
+    transaction.on_commit(
+        lambda: run_deletion_job_task.delay(job["job_id"], kind, job["filters"])
+    )
+    return job
+
+
+def run_deletion_job(job_id, kind: str, raw_filters: dict) -> dict:
+    job = get_deletion_job(job_id) or {
+        "job_id": str(job_id),
+        "kind": kind,
+        "filters": raw_filters,
+        "result": None,
+        "error": None,
+    }
+    job.update(status="running", progress={})
+    _save_job(job)
+
+    def progress(**counts):
+        job["progress"] = counts
+        _save_job(job)
+
+    try:
+        result = _DELETION_SERVICES[kind](
+            filters=_load_filters(raw_filters), progress=progress
+        )
+    except Exception as exc:
+        job.update(status="failed", error=str(exc))
+        _save_job(job)
+        raise
+    job.update(status="done", progress=result, result=result)
+    return _save_job(job)
+
+
+def _to_minutes(value) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _subtract_ranges(ranges, blocked) -> list[tuple]:
+    free = []
+    blocked = _merge_ranges(blocked)
+    for start, end in _merge_ranges(ranges):
+        cursor = start
+        for block_start, block_end in blocked:
+            if block_end <= cursor:
+                continue
+            if block_start >= end:
+                break
+            if block_start > cursor:
+                free.append((cursor, block_start))
+            cursor = block_end
+            if cursor >= end:
+                break
+        if cursor < end:
+            free.append((cursor, end))
+    return free
+
+
+def _free_slots_key(journey_id, date) -> str:
+    return _FREE_SLOTS_KEY.format(journey_id=journey_id, date=date.isoformat())
+
+
+def _compute_free_slots(journey_id, dates) -> dict:
+    """Free windows (minutes) per date: availability minus schedule blocks."""
+    date_span = (min(dates), max(dates))
+    available = defaultdict(list)
+    for day, start_time, end_time in AvailabilitySlot.objects.filter(
+        availability_day__journey_id=journey_id,
+        availability_day__date__range=date_span,
+    ).values_list("availability_day__date", "start_time", "end_time"):
+        available[day].append((_to_minutes(start_time), _to_minutes(end_time)))
+    blocked = defaultdict(list)
+    for day, start_time, end_time in ScheduleBlock.objects.filter(
+        journey_id=journey_id, date__range=date_span
+    ).values_list("date", "start_time", "end_time"):
+        blocked[day].append((_to_minutes(start_time), _to_minutes(end_time)))
+    for _, interval in iter_virtual_intervals(
+        start_date=date_span[0], end_date=date_span[1], journey_ids=[journey_id]
+    ):
+        available[interval.date].append(
+            (_to_minutes(interval.start_time), _to_minutes(interval.end_time))
+        )
+
+    return {
+        day: [list(window) for window in _subtract_ranges(available[day], blocked[day])]
+        for day in dates
+    }
+
+
+def get_free_slots(*, journey_id, start, end) -> list[dict]:
+    """
+    Free time windows of a journey between ``start`` and ``end``.
+
+    Each (journey, date) is cached on its own so a write only recomputes the
+    days it touched; a month view is one ``get_many`` when the index is warm.
+    """
+    keys = {_free_slots_key(journey_id, date): date for date in _date_range(start, end)}
+    windows_by_date = {
+        keys[key]: windows for key, windows in cache.get_many(list(keys)).items()
+    }
+    missing = [date for date in keys.values() if date not in windows_by_date]
+    if missing:
+        computed = _compute_free_slots(journey_id, missing)
+        cache.set_many(
+            {_free_slots_key(journey_id, date): windows for date, windows in computed.items()},
+            timeout=settings.SCHEDULING_FREE_SLOTS_CACHE_TIMEOUT,
+        )
+        windows_by_date.update(computed)
+
+    return [
+        {
+            "date": date.isoformat(),
+            "slots": [
+                {"start": _format_minutes(start_min), "end": _format_minutes(end_min)}
+                for start_min, end_min in windows_by_date[date]
+            ],
+        }
+        for date in keys.values()
+        if windows_by_date[date]
+    ]
+
+
+def batch_day_keys(batch) -> set:
+    """
+    ``(journey_id, date)`` pairs a virtual batch can cover, for invalidation.
+
+    Every day of every rule segment counts, matched by the rule or not.
+    """
+    if batch.mode != AvailabilityBatch.Mode.VIRTUAL or not batch.rule:
+        return set()
+    return {
+        (uuid.UUID(journey_id), day)
+        for segment, start, end in _rule_segments(batch.rule)
+        for journey_id in segment["jornada_ids"]
+        for day in _date_range(start, end)
+    }
+
+
+def invalidate_free_slots(day_keys) -> None:
+    """Drop the cached free windows of the given (journey_id, date) pairs."""
+    keys = [_free_slots_key(journey_id, date) for journey_id, date in day_keys]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    # Una lectura concurrente pudo recalcular con datos previos al commit.
+    transaction.on_commit(lambda: cache.delete_many(keys))
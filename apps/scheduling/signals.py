@@ -0,0 +1,62 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import (
+    AvailabilityBatch,
+    AvailabilityDay,
+    AvailabilityException,
+    AvailabilitySlot,
+    ScheduleBlock,
+)
+from .services import (
+    batch_day_keys,
+    free_slots_receivers_are_muted,
+    invalidate_free_slots,
+)
+
+
+# Los servicios ya invalidan los dias que tocan y silencian estas senales.
+# Cubren lo que se edita desde el admin, que si no dejaria la cache publica
+# de horarios libres desactualizada hasta su timeout.
+
+
+def _day_keys(instance) -> set:
+    if isinstance(instance, AvailabilityBatch):
+        return batch_day_keys(instance)
+    if isinstance(instance, AvailabilitySlot):
+        day = (
+            AvailabilityDay.objects.filter(id=instance.availability_day_id)
+            .values_list("journey_id", "date")
+            .first()
+        )
+        return {day} if day else set()
+    return {(instance.journey_id, instance.date)}
+
+
+def free_slots_remember_previous_days(sender, instance, **kwargs):
+    # Un cambio de fecha o jornada tambien deja desactualizado el dia anterior.
+    if free_slots_receivers_are_muted():
+        return
+    instance._free_slots_previous = set()
+    if not instance._state.adding:
+        previous = sender.objects.filter(pk=instance.pk).first()
+        if previous is not None:
+            instance._free_slots_previous = _day_keys(previous)
+
+
+def free_slots_invalidate_days(sender, instance, **kwargs):
+    if free_slots_receivers_are_muted():
+        return
+    previous = getattr(instance, "_free_slots_previous", set())
+    invalidate_free_slots(previous | _day_keys(instance))
+
+
+for _model in (
+    AvailabilityBatch,
+    AvailabilityDay,
+    AvailabilityException,
+    AvailabilitySlot,
+    ScheduleBlock,
+):
+    pre_save.connect(free_slots_remember_previous_days, sender=_model)
+    post_save.connect(free_slots_invalidate_days, sender=_model)
+    post_delete.connect(free_slots_invalidate_days, sender=_model)
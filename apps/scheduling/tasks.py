@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from .services import run_deletion_job
+
+
+@shared_task
+def run_deletion_job_task(job_id, kind, filters):
+    job = run_deletion_job(job_id, kind, filters)
+    return job["result"]
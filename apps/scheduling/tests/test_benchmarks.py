@@ -0,0 +1,243 @@
+"""
+Benchmarks of the scheduling hot paths over a synthetic calendar.
+
+They are opt-in because they build a large calendar (50 jornadas x 2 years x
+6 slots/day by default):
+
+    SCHEDULING_BENCHMARK=1 pytest apps/scheduling/tests/test_benchmarks.py
+
+Every operation records wall time, query count and peak Python memory
+(tracemalloc, which also slows the timed code, so wall times are only
+comparable between runs of this suite). The report is written as JSON to
+``SCHEDULING_BENCHMARK_REPORT``. When ``SCHEDULING_BENCHMARK_BASELINE`` points
+to a previous report with the same parameters, the deltas are added and the
+run fails if an operation issues more queries than before, or gets slower
+than ``SCHEDULING_BENCHMARK_MAX_SLOWDOWN`` (ratio, optional).
+"""
+
+import json
+import os
+import subprocess
+import tracemalloc
+import uuid
+from datetime import time, timedelta
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.catalog.models import Category, Journey
+from apps.scheduling import services
+from apps.scheduling.models import AvailabilityBatch
+
+
+pytestmark = pytest.mark.skipif(
+    os.environ.get("SCHEDULING_BENCHMARK") != "1",
+    reason="Benchmarks opt-in: SCHEDULING_BENCHMARK=1",
+)
+
+JOURNEYS = int(os.environ.get("SCHEDULING_BENCHMARK_JOURNEYS", 50))
+DAYS = int(os.environ.get("SCHEDULING_BENCHMARK_DAYS", 730))
+SLOTS_PER_DAY = int(os.environ.get("SCHEDULING_BENCHMARK_SLOTS", 6))
+REPORT_PATH = os.environ.get("SCHEDULING_BENCHMARK_REPORT", "scheduling_benchmark.json")
+
+
+def _uid(prefix: str) -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:8]}"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _make_journeys(count: int) -> list:
+    category = Category.objects.create(name=_uid("cat"), slug=_uid("cat-slug"))
+    return [
+        Journey.objects.create(
+            slug=_uid("journey-slug"), title=_uid("Journey"), category=category
+        ).id
+        for _ in range(count)
+    ]
+
+
+def _time_slots(first_hour: int, count: int) -> list[dict]:
+    return [
+        {"start": time(first_hour + index), "end": time(first_hour + index + 1)}
+        for index in range(count)
+    ]
+
+
+def _weekly_payload(journey_ids, start, end, time_slots, **extra) -> dict:
+    return {
+        "type": AvailabilityBatch.Type.WEEKLY,
+        "jornada_ids": journey_ids,
+        "date_range": {"start": start, "end": end},
+        "weekly_config": [
+            {"day_of_week": day, "time_slots": time_slots} for day in range(1, 8)
+        ],
+        **extra,
+    }
+
+
+class _Recorder:
+    def __init__(self):
+        self.results = {}
+
+    def measure(self, name: str, func, **meta):
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            started = perf_counter()
+            value = func()
+            wall = perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.results[name] = {
+            "wall_ms": round(wall * 1000, 2),
+            "queries": len(queries.captured_queries),
+            "peak_kib": round(peak / 1024, 1),
+            **meta,
+        }
+        return value
+
+
+def _compare(report: dict, baseline: dict) -> list[str]:
+    regressions = []
+    if baseline.get("params") != report["params"]:
+        return regressions
+    max_slowdown = os.environ.get("SCHEDULING_BENCHMARK_MAX_SLOWDOWN")
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        current["baseline"] = {
+            key: previous[key] for key in ("wall_ms", "queries", "peak_kib")
+        }
+        if current["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name}: {previous['queries']} -> {current['queries']} queries"
+            )
+        if max_slowdown and previous["wall_ms"]:
+            ratio = current["wall_ms"] / previous["wall_ms"]
+            current["baseline"]["slowdown"] = round(ratio, 2)
+            if ratio > float(max_slowdown):
+                regressions.append(f"{name}: {ratio:.2f}x slower")
+    return regressions
+
+
+@pytest.mark.django_db
+def test_scheduling_benchmarks():
+    recorder = _Recorder()
+    journey_ids = _make_journeys(JOURNEYS)
+    start = timezone.localdate() + timedelta(days=1)
+    end = start + timedelta(days=DAYS - 1)
+    month_end = start + timedelta(days=30)
+
+    created = recorder.measure(
+        "create_availability",
+        lambda: services.create_availability(
+            payload=_weekly_payload(journey_ids, start, end, _time_slots(8, SLOTS_PER_DAY))
+        ),
+    )
+    batch_id = uuid.UUID(created["batch_id"])
+    recorder.results["create_availability"]["slots"] = created["slots_created"]
+
+    # Intervalos sin solape: el chequeo recorre todo el calendario existente.
+    free_hour = 8 + SLOTS_PER_DAY
+    intervals = services._build_intervals(
+        payload=_weekly_payload(journey_ids, start, end, _time_slots(free_hour, 1))
+    )
+    recorder.measure(
+        "check_conflicts",
+        lambda: services._check_conflicts(intervals, {}),
+        intervals=len(intervals),
+    )
+
+    recorder.measure(
+        "list_availability_month",
+        lambda: services.list_availability(
+            filters={"jornada_id": journey_ids[0], "start": start, "end": month_end}
+        ),
+    )
+    recorder.measure(
+        "list_availability_batch_columnar",
+        lambda: services.list_availability_page(
+            filters={"batch_id": batch_id, "start": start, "end": end},
+            layout="columnar",
+        ),
+    )
+    recorder.measure(
+        "free_slots_month_cold",
+        lambda: services.get_free_slots(
+            journey_id=journey_ids[0], start=start, end=month_end
+        ),
+    )
+    recorder.measure(
+        "free_slots_month_warm",
+        lambda: services.get_free_slots(
+            journey_id=journey_ids[0], start=start, end=month_end
+        ),
+    )
+
+    # Cambia el ultimo slot de cada dia: 1/SLOTS_PER_DAY del calendario.
+    updated_slots = _time_slots(8, SLOTS_PER_DAY - 1) + _time_slots(free_hour + 1, 1)
+    recorder.measure(
+        "update_availability_batch",
+        lambda: services.update_availability_batch(
+            batch_id=batch_id,
+            payload=_weekly_payload(
+                journey_ids, start, end, updated_slots, effective_from=start
+            ),
+        ),
+    )
+
+    virtual_journeys = _make_journeys(JOURNEYS)
+    recorder.measure(
+        "create_availability_virtual",
+        lambda: services.create_availability(
+            payload=_weekly_payload(
+                virtual_journeys,
+                start,
+                end,
+                _time_slots(8, SLOTS_PER_DAY),
+                mode=AvailabilityBatch.Mode.VIRTUAL,
+            )
+        ),
+    )
+    recorder.measure(
+        "list_availability_virtual_month",
+        lambda: services.list_availability(
+            filters={"jornada_id": virtual_journeys[0], "start": start, "end": month_end}
+        ),
+    )
+
+    recorder.measure(
+        "delete_availability",
+        lambda: services.delete_availability(filters={"batch_id": batch_id}),
+    )
+
+    report = {
+        "commit": _git_commit(),
+        "generated_at": timezone.now().isoformat(),
+        "params": {"journeys": JOURNEYS, "days": DAYS, "slots_per_day": SLOTS_PER_DAY},
+        "results": recorder.results,
+    }
+    regressions = []
+    baseline_path = os.environ.get("SCHEDULING_BENCHMARK_BASELINE")
+    if baseline_path:
+        baseline = json.loads(Path(baseline_path).read_text())
+        regressions = _compare(report, baseline)
+        report["baseline_commit"] = baseline.get("commit")
+    Path(REPORT_PATH).write_text(json.dumps(report, indent=2))
+
+    assert not regressions, "Regresiones: " + "; ".join(regressions)
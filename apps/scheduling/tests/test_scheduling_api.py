@@ -0,0 +1,1156 @@
+import uuid
+from datetime import time, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.catalog.models import Category, Journey
+from apps.scheduling import services, tasks
+from apps.scheduling.models import (
+    AvailabilityBatch,
+    AvailabilityDay,
+    AvailabilityException,
+    AvailabilitySlot,
+    ScheduleBlock,
+)
+
+
+AVAILABILITY_URL = "/api/v1/availability/"
+FREE_SLOTS_URL = "/api/v1/availability/free/"
+BLOCKS_URL = "/api/v1/blocks/"
+
+
+def _uid(prefix: str) -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture(autouse=True)
+def _scheduling_settings(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_CLASSES": [],
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _make_staff():
+    User = get_user_model()
+    return User.objects.create_user(
+        email=f"{_uid('staff')}@test.com",
+        password="test1234",
+        is_staff=True,
+        is_active=True,
+    )
+
+
+def _admin_client() -> APIClient:
+    client = APIClient()
+    client.force_authenticate(_make_staff())
+    return client
+
+
+def _make_journeys(count: int) -> list[Journey]:
+    category = Category.objects.create(name=_uid("cat"), slug=_uid("cat-slug"))
+    return [
+        Journey.objects.create(
+            category=category, slug=_uid("journey-slug"), title=_uid("Journey")
+        )
+        for _ in range(count)
+    ]
+
+
+def _future(days: int):
+    return timezone.localdate() + timedelta(days=days)
+
+
+def _slots(*ranges) -> list[dict]:
+    return [{"start": start, "end": end} for start, end in ranges]
+
+
+def _single_payload(journeys, day, *ranges, **extra) -> dict:
+    return {
+        "type": "SINGLE",
+        "jornada_ids": [str(journey.id) for journey in journeys],
+        "date_range": {"start": day.isoformat(), "end": day.isoformat()},
+        "time_slots": _slots(*ranges),
+        **extra,
+    }
+
+
+def _weekly_payload(journeys, start, end, *ranges, days_of_week=range(1, 8), **extra):
+    return {
+        "type": "WEEKLY",
+        "jornada_ids": [str(journey.id) for journey in journeys],
+        "date_range": {"start": start.isoformat(), "end": end.isoformat()},
+        "weekly_config": [
+            {"day_of_week": day_of_week, "time_slots": _slots(*ranges)}
+            for day_of_week in days_of_week
+        ],
+        **extra,
+    }
+
+
+# =========================
+# Conflictos
+# =========================
+
+
+@pytest.mark.django_db
+def test_create_availability_rejects_overlaps_with_409():
+    client = _admin_client()
+    journey, other = _make_journeys(2)
+    start, end = _future(3), _future(9)
+    created = client.post(
+        AVAILABILITY_URL,
+        _weekly_payload([journey], start, end, ("09:00", "10:00"), ("11:00", "12:00")),
+        format="json",
+    )
+    assert created.status_code == 201
+
+    day = _future(5)
+    overlap = client.post(
+        AVAILABILITY_URL,
+        _single_payload([other, journey], day, ("09:30", "10:30")),
+        format="json",
+    )
+    assert overlap.status_code == 409
+    assert journey.title in overlap.data["detail"]
+    assert day.strftime("%d/%m/%Y") in overlap.data["detail"]
+
+    # Un slot que cubre por completo a uno existente tambien choca.
+    covering = client.post(
+        AVAILABILITY_URL,
+        _single_payload([journey], day, ("08:00", "13:00")),
+        format="json",
+    )
+    assert covering.status_code == 409
+
+    # Nada del intento rechazado quedo guardado, tampoco para la otra jornada.
+    listed = client.get(AVAILABILITY_URL, {"jornada_id": str(other.id)})
+    assert listed.status_code == 200
+    assert listed.data == []
+
+
+@pytest.mark.django_db
+def test_create_availability_allows_touching_ranges():
+    client = _admin_client()
+    (journey,) = _make_journeys(1)
+    day = _future(4)
+    assert (
+        client.post(
+            AVAILABILITY_URL,
+            _single_payload([journey], day, ("09:00", "10:00"), ("11:00", "12:00")),
+            format="json",
+        ).status_code
+        == 201
+    )
+
+    # Termina justo cuando empieza uno y empieza justo cuando termina el otro.
+    touching = client.post(
+        AVAILABILITY_URL,
+        _single_payload(
+            [journey], day, ("08:00", "09:00"), ("10:00", "11:00"), ("12:00", "13:00")
+        ),
+        format="json",
+    )
+    assert touching.status_code == 201
+    assert touching.data["slots_created"] == 3
+
+    # Cada batch aporta su propia fila del dia.
+    listed = client.get(AVAILABILITY_URL, {"jornada_id": str(journey.id)})
+    assert len(listed.data) == 2
+    assert sorted(
+        (slot["start"], slot["end"]) for row in listed.data for slot in row["slots"]
+    ) == [(f"{hour:02d}:00", f"{hour + 1:02d}:00") for hour in range(8, 13)]
+
+
+@pytest.mark.django_db
+def test_update_availability_batch_ignores_its_own_slots_but_not_others():
+    client = _admin_client()
+    (journey,) = _make_journeys(1)
+    start, end = _future(3), _future(6)
+    batch_id = client.post(
+        AVAILABILITY_URL,
+        _weekly_payload([journey], start, end, ("09:00", "10:00")),
+        format="json",
+    ).data["batch_id"]
+    other_day = _future(5)
+    client.post(
+        AVAILABILITY_URL,
+        _single_payload([journey], other_day, ("11:00", "12:00")),
+        format="json",
+    )
+    url = f"{AVAILABILITY_URL}batches/{batch_id}/"
+
+    shifted = client.patch(
+        url,
+        _weekly_payload(
+            [journey], start, end, ("09:30", "10:30"), effective_from=start.isoformat()
+        ),
+        format="json",
+    )
+    assert shifted.status_code == 200
+    assert shifted.data["slots_created"] == shifted.data["slots_deleted"] == 4
+
+    overlapping = client.patch(
+        url,
+        _weekly_payload(
+            [journey], start, end, ("10:30", "11:30"), effective_from=start.isoformat()
+        ),
+        format="json",
+    )
+    assert overlapping.status_code == 409
+    assert other_day.strftime("%d/%m/%Y") in overlapping.data["detail"]
+
+
+# =========================
+# Alta en bloque
+# =========================
+
+
+def _expected_rows(journeys, start, end, slots_by_weekday) -> set:
+    """(jornada, fecha, inicio, fin) como los generaba el alta fila por fila."""
+    rows = set()
+    for journey in journeys:
+        current = start
+        while current <= end:
+            for slot_start, slot_end in slots_by_weekday.get(current.isoweekday(), ()):
+                rows.add(
+                    (
+                        journey.id,
+                        current,
+                        time.fromisoformat(slot_start),
+                        time.fromisoformat(slot_end),
+                    )
+                )
+            current += timedelta(days=1)
+    return rows
+
+
+def _stored_rows(batch_id) -> set:
+    return set(
+        AvailabilitySlot.objects.filter(
+            availability_day__batch_id=batch_id
+        ).values_list(
+            "availability_day__journey_id",
+            "availability_day__date",
+            "start_time",
+            "end_time",
+        )
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("insert_batch_size", [services.INSERT_BATCH_SIZE, 7])
+def test_bulk_created_availability_matches_the_per_row_result(
+    monkeypatch, insert_batch_size
+):
+    monkeypatch.setattr(services, "INSERT_BATCH_SIZE", insert_batch_size)
+    client = _admin_client()
+    journeys = _make_journeys(3)
+    start, end = _future(2), _future(30)
+    ranges = (("09:00", "10:00"), ("10:30", "12:00"))
+    days_of_week = (1, 3, 5)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(
+            AVAILABILITY_URL,
+            _weekly_payload(journeys, start, end, *ranges, days_of_week=days_of_week),
+            format="json",
+        )
+    assert response.status_code == 201
+
+    expected = _expected_rows(
+        journeys, start, end, {day_of_week: ranges for day_of_week in days_of_week}
+    )
+    expected_days = {(journey_id, day) for journey_id, day, _, _ in expected}
+    batch_id = response.data["batch_id"]
+    assert _stored_rows(batch_id) == expected
+    assert (
+        set(
+            AvailabilityDay.objects.filter(batch_id=batch_id).values_list(
+                "journey_id", "date"
+            )
+        )
+        == expected_days
+    )
+    assert response.data["days_created"] == len(expected_days)
+    assert response.data["slots_created"] == len(expected)
+
+    # Un INSERT por lote de filas, no uno por dia o por slot.
+    inserts = [
+        query["sql"]
+        for query in queries.captured_queries
+        if query["sql"].startswith("INSERT")
+    ]
+    day_inserts = -(-len(expected_days) // insert_batch_size)
+    slot_inserts = -(-len(expected) // insert_batch_size)
+    assert len(inserts) == 1 + day_inserts + slot_inserts
+
+
+@pytest.mark.django_db
+def test_bulk_created_slots_point_to_their_own_day():
+    client = _admin_client()
+    journeys = _make_journeys(2)
+    day = _future(6)
+    response = client.post(
+        AVAILABILITY_URL,
+        _single_payload(journeys, day, ("08:00", "09:00"), ("15:00", "16:30")),
+        format="json",
+    )
+    assert response.status_code == 201
+
+    for journey in journeys:
+        listed = client.get(
+            AVAILABILITY_URL,
+            {
+                "jornada_id": str(journey.id),
+                "start": day.isoformat(),
+                "end": day.isoformat(),
+            },
+        )
+        assert listed.data == [
+            {
+                "journey_id": str(journey.id),
+                "journey_name": journey.title,
+                "date": day.isoformat(),
+                "batch_id": response.data["batch_id"],
+                "slots": _slots(("08:00", "09:00"), ("15:00", "16:30")),
+            }
+        ]
+
+
+# =========================
+# Horarios libres
+# =========================
+
+
+def _free_days(journey, start, end) -> dict:
+    response = APIClient().get(
+        FREE_SLOTS_URL,
+        {
+            "jornada_id": str(journey.id),
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+        },
+    )
+    assert response.status_code == 200, response.data
+    return {
+        day["date"]: [(slot["start"], slot["end"]) for slot in day["slots"]]
+        for day in response.data["days"]
+    }
+
+
+def _block_payload(journeys, day, start, end) -> dict:
+    return {
+        "date": day.isoformat(),
+        "jornada_ids": [str(journey.id) for journey in journeys],
+        "time_slot": {"start": start, "end": end},
+        "reason": "Mantenimiento",
+    }
+
+
+@pytest.mark.django_db
+def test_free_slots_subtract_schedule_blocks():
+    client = _admin_client()
+    journey, other = _make_journeys(2)
+    start, end = _future(3), _future(5)
+    client.post(
+        AVAILABILITY_URL,
+        _weekly_payload(
+            [journey, other], start, end, ("09:00", "11:00"), ("11:00", "13:00")
+        ),
+        format="json",
+    )
+    middle, last = _future(4), _future(5)
+    for payload in (
+        _block_payload([journey], middle, "10:00", "11:30"),
+        _block_payload([journey], middle, "12:30", "14:00"),
+        _block_payload([journey], last, "08:00", "13:00"),
+    ):
+        assert client.post(BLOCKS_URL, payload, format="json").status_code == 201
+
+    # Los slots contiguos se unen; un dia bloqueado entero no aparece.
+    assert _free_days(journey, start, end) == {
+        start.isoformat(): [("09:00", "13:00")],
+        middle.isoformat(): [("09:00", "10:00"), ("11:30", "12:30")],
+    }
+    assert _free_days(other, start, end) == {
+        day.isoformat(): [("09:00", "13:00")] for day in (start, middle, last)
+    }
+
+
+@pytest.mark.django_db
+def test_free_slots_validate_the_range():
+    (journey,) = _make_journeys(1)
+    start = _future(1)
+    too_long = APIClient().get(
+        FREE_SLOTS_URL,
+        {
+            "jornada_id": str(journey.id),
+            "start": start.isoformat(),
+            "end": (start + timedelta(days=services.FREE_SLOTS_MAX_DAYS)).isoformat(),
+        },
+    )
+    assert too_long.status_code == 400
+
+
+@pytest.mark.django_db
+def test_free_slots_of_an_unknown_journey_are_empty_and_cached():
+    unknown = Journey(id=uuid.uuid4())
+    start, end = _future(1), _future(7)
+    assert _free_days(unknown, start, end) == {}
+
+    with CaptureQueriesContext(connection) as queries:
+        assert _free_days(unknown, start, end) == {}
+    assert queries.captured_queries == []
+
+
+@pytest.mark.django_db
+def test_free_slots_cache_is_invalidated_by_availability_and_block_writes():
+    client = _admin_client()
+    (journey,) = _make_journeys(1)
+    day = _future(4)
+    window = (day - timedelta(days=1), day + timedelta(days=1))
+    created = client.post(
+        AVAILABILITY_URL,
+        _single_payload([journey], day, ("09:00", "12:00")),
+        format="json",
+    )
+    assert _free_days(journey, *window) == {day.isoformat(): [("09:00", "12:00")]}
+
+    # Con la cache caliente la ruta no toca la base.
+    with CaptureQueriesContext(connection) as queries:
+        _free_days(journey, *window)
+    assert queries.captured_queries == []
+
+    client.post(
+        AVAILABILITY_URL,
+        _single_payload([journey], day, ("14:00", "15:00")),
+        format="json",
+    )
+    assert _free_days(journey, *window) == {
+        day.isoformat(): [("09:00", "12:00"), ("14:00", "15:00")]
+    }
+
+    client.post(
+        BLOCKS_URL, _block_payload([journey], day, "09:00", "10:00"), format="json"
+    )
+    assert _free_days(journey, *window) == {
+        day.isoformat(): [("10:00", "12:00"), ("14:00", "15:00")]
+    }
+
+    patched = client.patch(
+        f"{AVAILABILITY_URL}batches/{created.data['batch_id']}/",
+        _single_payload([journey], day, ("09:00", "13:00")),
+        format="json",
+    )
+    assert patched.status_code == 200
+    assert _free_days(journey, *window) == {
+        day.isoformat(): [("10:00", "13:00"), ("14:00", "15:00")]
+    }
+
+    deleted = client.delete(
+        f"{BLOCKS_URL}?jornada_id={journey.id}"
+        f"&start={day.isoformat()}&end={day.isoformat()}"
+    )
+    assert deleted.data == {"blocks_deleted": 1}
+    assert _free_days(journey, *window) == {
+        day.isoformat(): [("09:00", "13:00"), ("14:00", "15:00")]
+    }
+
+    deleted = client.delete(f"{AVAILABILITY_URL}?jornada_id={journey.id}")
+    assert deleted.data == {"days_deleted": 2, "slots_deleted": 2}
+    assert _free_days(journey, *window) == {}
+
+
+@pytest.mark.django_db
+def test_free_slots_cache_is_invalidated_by_admin_edits():
+    client = _admin_client()
+    journey, other = _make_journeys(2)
+    day, next_day = _future(4), _future(5)
+    window = (day, next_day)
+    client.post(
+        AVAILABILITY_URL,
+        _single_payload([journey], day, ("09:00", "12:00")),
+        format="json",
+    )
+    assert _free_days(journey, *window) == {day.isoformat(): [("09:00", "12:00")]}
+
+    # El admin guarda con el ORM, sin pasar por los servicios.
+    block = ScheduleBlock.objects.create(
+        journey=journey, date=day, start_time=time(9), end_time=time(10)
+    )
+    assert _free_days(journey, *window) == {day.isoformat(): [("10:00", "12:00")]}
+    block.delete()
+    assert _free_days(journey, *window) == {day.isoformat(): [("09:00", "12:00")]}
+
+    slot = AvailabilitySlot.objects.get(availability_day__journey=journey)
+    slot.end_time = time(11)
+    slot.save()
+    assert _free_days(journey, *window) == {day.isoformat(): [("09:00", "11:00")]}
+
+    # Mover el dia invalida tanto la fecha nueva como la anterior.
+    availability_day = AvailabilityDay.objects.get(journey=journey)
+    availability_day.date = next_day
+    availability_day.save()
+    assert _free_days(journey, *window) == {next_day.isoformat(): [("09:00", "11:00")]}
+    slot.delete()
+    assert _free_days(journey, *window) == {}
+
+    created = client.post(
+        AVAILABILITY_URL,
+        _weekly_payload(
+            [journey, other], day, next_day, ("14:00", "15:00"), mode="VIRTUAL"
+        ),
+        format="json",
+    )
+    batch = AvailabilityBatch.objects.get(id=created.data["batch_id"])
+    assert _free_days(journey, *window) == {
+        day.isoformat(): [("14:00", "15:00")],
+        next_day.isoformat(): [("14:00", "15:00")],
+    }
+
+    AvailabilityException.objects.create(batch=batch, journey=journey, date=day)
+    assert _free_days(journey, *window) == {next_day.isoformat(): [("14:00", "15:00")]}
+
+    batch.rule["jornada_ids"] = [str(other.id)]
+    batch.save()
+    assert _free_days(journey, *window) == {}
+    assert _free_days(other, *window) == {
+        day.isoformat(): [("14:00", "15:00")],
+        next_day.isoformat(): [("14:00", "15:00")],
+    }
+
+
+# =========================
+# Expansion de reglas
+# =========================
+
+
+def _matches(rule: dict, day) -> bool:
+    """Oraculo dia por dia de la regla, sin aritmetica de calendario."""
+    if rule["type"] == "WEEKLY":
+        return day.isoweekday() in {
+            item["day_of_week"] for item in rule["weekly_config"]
+        }
+    recurrence = rule["recurrence_rule"]
+    if recurrence["mode"] == "SPECIFIC_DATE":
+        return day.day == recurrence["day_of_month"]
+    return (
+        day.isoweekday() == recurrence["week_day"]
+        and (day.day - 1) // 7 + 1 == recurrence["index"]
+    )
+
+
+def _monthly_payload(journeys, start, end, recurrence_rule) -> dict:
+    return {
+        "type": "MONTHLY",
+        "jornada_ids": [str(journey.id) for journey in journeys],
+        "date_range": {"start": start.isoformat(), "end": end.isoformat()},
+        "recurrence_rule": recurrence_rule,
+        "time_slots": _slots(("09:00", "10:00")),
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "build",
+    [
+        lambda journeys, start, end: _monthly_payload(
+            journeys, start, end, {"mode": "SPECIFIC_DATE", "day_of_month": 31}
+        ),
+        lambda journeys, start, end: _monthly_payload(
+            journeys, start, end, {"mode": "SPECIFIC_DATE", "day_of_month": 29}
+        ),
+        lambda journeys, start, end: _monthly_payload(
+            journeys, start, end, {"mode": "RELATIVE", "week_day": 5, "index": 5}
+        ),
+        lambda journeys, start, end: _monthly_payload(
+            journeys, start, end, {"mode": "RELATIVE", "week_day": 1, "index": 1}
+        ),
+        lambda journeys, start, end: _weekly_payload(
+            journeys, start, end, ("09:00", "10:00"), days_of_week=(2, 7)
+        ),
+    ],
+    ids=["day-31", "day-29", "fifth-friday", "first-monday", "weekly"],
+)
+@pytest.mark.parametrize("offset", [1, 17])
+def test_rule_expansion_across_month_ends(build, offset):
+    client = _admin_client()
+    (journey,) = _make_journeys(1)
+    # Mas de un anio: cruza todos los fines de mes y un cambio de anio.
+    start = _future(offset)
+    end = start + timedelta(days=400)
+    payload = build([journey], start, end)
+    response = client.post(AVAILABILITY_URL, payload, format="json")
+    assert response.status_code == 201
+
+    expected = []
+    current = start
+    while current <= end:
+        if _matches(payload, current):
+            expected.append(current.isoformat())
+        current += timedelta(days=1)
+    assert response.data["days_created"] == len(expected)
+
+    listed = client.get(
+        AVAILABILITY_URL,
+        {
+            "jornada_id": str(journey.id),
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+        },
+    )
+    assert [row["date"] for row in listed.data] == expected
+
+
+# =========================
+# Batches virtuales
+# =========================
+
+
+def _listed_slots(client, journey, start, end) -> dict:
+    response = client.get(
+        AVAILABILITY_URL,
+        {
+            "jornada_id": str(journey.id),
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+        },
+    )
+    assert response.status_code == 200
+    return {
+        row["date"]: [(slot["start"], slot["end"]) for slot in row["slots"]]
+        for row in response.data
+    }
+
+
+@pytest.mark.django_db
+def test_virtual_batch_create_list_update_and_delete():
+    client = _admin_client()
+    journey, other = _make_journeys(2)
+    start, end = _future(2), _future(15)
+    dates = [
+        (start + timedelta(days=offset)) for offset in range((end - start).days + 1)
+    ]
+
+    created = client.post(
+        AVAILABILITY_URL,
+        _weekly_payload(
+            [journey, other], start, end, ("09:00", "10:00"), mode="VIRTUAL"
+        ),
+        format="json",
+    )
+    assert created.status_code == 201
+    assert created.data["mode"] == "VIRTUAL"
+    assert created.data["days_created"] == 2 * len(dates)
+    batch_id = created.data["batch_id"]
+    # Solo se guarda la regla.
+    assert not AvailabilityDay.objects.filter(batch_id=batch_id).exists()
+
+    listed = client.get(AVAILABILITY_URL, {"batch_id": batch_id})
+    assert len(listed.data) == 2 * len(dates)
+    assert {row["batch_id"] for row in listed.data} == {batch_id}
+    assert _free_days(journey, start, start) == {
+        start.isoformat(): [("09:00", "10:00")]
+    }
+
+    # Los dias virtuales cuentan para los conflictos.
+    overlap = client.post(
+        AVAILABILITY_URL,
+        _single_payload([journey], _future(5), ("09:30", "11:00")),
+        format="json",
+    )
+    assert overlap.status_code == 409
+
+    effective_from = _future(9)
+    patched = client.patch(
+        f"{AVAILABILITY_URL}batches/{batch_id}/",
+        _weekly_payload(
+            [journey, other],
+            start,
+            end,
+            ("15:00", "16:00"),
+            effective_from=effective_from.isoformat(),
+        ),
+        format="json",
+    )
+    assert patched.status_code == 200
+    assert patched.data["slots_created"] == patched.data["slots_deleted"] == 2 * 7
+
+    # Los dias previos a effective_from conservan la regla anterior.
+    expected = {
+        day.isoformat(): [
+            ("09:00", "10:00") if day < effective_from else ("15:00", "16:00")
+        ]
+        for day in dates
+    }
+    assert _listed_slots(client, journey, start, end) == expected
+    rule = client.get(f"{AVAILABILITY_URL}batches/{batch_id}/").data["rule"]
+    assert [previous["until"] for previous in rule["history"]] == [
+        (effective_from - timedelta(days=1)).isoformat()
+    ]
+    assert rule["history"][0]["weekly_config"][0]["time_slots"] == _slots(
+        ("09:00", "10:00")
+    )
+
+    # Un borrado parcial queda como excepcion del batch.
+    removed = _future(4)
+    deleted = client.delete(
+        f"{AVAILABILITY_URL}?jornada_id={journey.id}"
+        f"&start={removed.isoformat()}&end={removed.isoformat()}"
+    )
+    assert deleted.data == {"days_deleted": 1, "slots_deleted": 1}
+    assert AvailabilityException.objects.filter(
+        batch_id=batch_id, journey=journey, date=removed
+    ).exists()
+    del expected[removed.isoformat()]
+    assert _listed_slots(client, journey, start, end) == expected
+    assert removed.isoformat() in _listed_slots(client, other, start, end)
+    assert _free_days(journey, removed, removed) == {}
+
+    # Sin filtro de fechas el batch se borra entero.
+    deleted = client.delete(f"{AVAILABILITY_URL}?batch_id={batch_id}")
+    assert deleted.data == {
+        "days_deleted": 2 * len(dates) - 1,
+        "slots_deleted": 2 * len(dates) - 1,
+    }
+    assert not AvailabilityBatch.objects.filter(id=batch_id).exists()
+    assert not AvailabilityException.objects.filter(batch_id=batch_id).exists()
+    assert client.get(AVAILABILITY_URL, {"batch_id": batch_id}).data == []
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("whole_span_dates", [False, True])
+def test_removing_a_journey_from_a_virtual_batch_trims_the_rule(whole_span_dates):
+    client = _admin_client()
+    journey, other = _make_journeys(2)
+    start, end = _future(2), _future(15)
+    batch_id = client.post(
+        AVAILABILITY_URL,
+        _weekly_payload(
+            [journey, other], start, end, ("09:00", "10:00"), mode="VIRTUAL"
+        ),
+        format="json",
+    ).data["batch_id"]
+    effective_from = _future(9)
+    client.patch(
+        f"{AVAILABILITY_URL}batches/{batch_id}/",
+        _weekly_payload(
+            [journey, other],
+            start,
+            end,
+            ("15:00", "16:00"),
+            effective_from=effective_from.isoformat(),
+        ),
+        format="json",
+    )
+    partial = _future(3)
+    client.delete(
+        f"{AVAILABILITY_URL}?jornada_id={journey.id}"
+        f"&start={partial.isoformat()}&end={partial.isoformat()}"
+    )
+    other_before = _listed_slots(client, other, start, end)
+
+    url = f"{AVAILABILITY_URL}?jornada_id={journey.id}"
+    if whole_span_dates:
+        url += f"&start={_future(1).isoformat()}&end={_future(20).isoformat()}"
+    deleted = client.delete(url)
+
+    # Todos los dias del batch menos el que ya era una excepcion.
+    days = (end - start).days
+    assert deleted.data == {"days_deleted": days, "slots_deleted": days}
+    # La jornada sale de la regla y de su historial: sin una excepcion por dia.
+    assert not AvailabilityException.objects.filter(batch_id=batch_id).exists()
+    rule = AvailabilityBatch.objects.get(id=batch_id).rule
+    assert rule["jornada_ids"] == [str(other.id)]
+    assert [previous["jornada_ids"] for previous in rule["history"]] == [
+        [str(other.id)]
+    ]
+    assert _listed_slots(client, journey, start, end) == {}
+    assert _free_days(journey, start, end) == {}
+    assert _listed_slots(client, other, start, end) == other_before
+
+
+@pytest.mark.django_db
+def test_virtual_batches_outside_the_window_are_not_loaded():
+    client = _admin_client()
+    (journey,) = _make_journeys(1)
+    client.post(
+        AVAILABILITY_URL,
+        _weekly_payload(
+            [journey], _future(40), _future(70), ("09:00", "10:00"), mode="VIRTUAL"
+        ),
+        format="json",
+    )
+    start, end = _future(1), _future(10)
+
+    # Sin batches en la ventana no hay nada que expandir ni excepciones que traer.
+    with CaptureQueriesContext(connection) as queries:
+        assert _listed_slots(client, journey, start, end) == {}
+        assert _free_days(journey, start, end) == {}
+    assert not [
+        query
+        for query in queries.captured_queries
+        if "availability_exceptions" in query["sql"]
+    ]
+
+
+# =========================
+# Layout columnar y paginado
+# =========================
+
+
+def _minutes(value: str) -> int:
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _seed_two_batches(client, journey, start, end) -> None:
+    client.post(
+        AVAILABILITY_URL,
+        _weekly_payload(
+            [journey],
+            start,
+            end,
+            ("08:00", "09:00"),
+            ("09:30", "10:15"),
+            days_of_week=(1, 2, 4, 6),
+        ),
+        format="json",
+    )
+    client.post(
+        AVAILABILITY_URL,
+        _weekly_payload(
+            [journey],
+            start,
+            end,
+            ("18:00", "19:00"),
+            days_of_week=(2, 3),
+            mode="VIRTUAL",
+        ),
+        format="json",
+    )
+
+
+def _day_tuples(rows) -> list[tuple]:
+    return [
+        (row["date"], _minutes(slot["start"]), _minutes(slot["end"]), row["batch_id"])
+        for row in rows
+        for slot in row["slots"]
+    ]
+
+
+@pytest.mark.django_db
+def test_columnar_layout_carries_the_same_slots_as_the_days_layout():
+    client = _admin_client()
+    (journey,) = _make_journeys(1)
+    start, end = _future(1), _future(20)
+    _seed_two_batches(client, journey, start, end)
+    query = {
+        "jornada_id": str(journey.id),
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+    }
+
+    days = client.get(AVAILABILITY_URL, query).data
+    columnar = client.get(AVAILABILITY_URL, {**query, "layout": "columnar"}).data
+    assert columnar["layout"] == "columnar"
+    assert (columnar["start"], columnar["end"]) == (query["start"], query["end"])
+    assert columnar["next_start"] is None
+
+    (entry,) = columnar["results"]
+    assert entry["journey_id"] == str(journey.id)
+    assert entry["journey_name"] == journey.title
+    assert len(entry["batch_ids"]) == 2
+    assert (
+        len(entry["dates"])
+        == len(entry["starts"])
+        == len(entry["ends"])
+        == len(entry["batches"])
+    )
+    assert list(
+        zip(
+            entry["dates"],
+            entry["starts"],
+            entry["ends"],
+            (entry["batch_ids"][index] for index in entry["batches"]),
+        )
+    ) == _day_tuples(days)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("layout", ["days", "columnar"])
+def test_page_days_cursors_walk_the_whole_range(layout):
+    client = _admin_client()
+    (journey,) = _make_journeys(1)
+    start, end = _future(1), _future(20)
+    _seed_two_batches(client, journey, start, end)
+    full = client.get(
+        AVAILABILITY_URL,
+        {
+            "jornada_id": str(journey.id),
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+        },
+    ).data
+
+    pages = []
+    cursor = start.isoformat()
+    while cursor:
+        page = client.get(
+            AVAILABILITY_URL,
+            {
+                "jornada_id": str(journey.id),
+                "start": cursor,
+                "end": end.isoformat(),
+                "layout": layout,
+                "page_days": 6,
+            },
+        ).data
+        assert page["layout"] == layout
+        assert page["start"] == cursor
+        pages.append(page)
+        cursor = page["next_start"]
+
+    # 20 dias en ventanas de 6: la ultima es mas corta y termina en end.
+    assert [(page["start"], page["end"]) for page in pages] == [
+        (
+            (start + timedelta(days=offset)).isoformat(),
+            min(start + timedelta(days=offset + 5), end).isoformat(),
+        )
+        for offset in range(0, 20, 6)
+    ]
+    if layout == "days":
+        walked = [row for page in pages for row in page["results"]]
+        assert walked == full
+    else:
+        walked = [
+            (date_, start_min, end_min, entry["batch_ids"][index])
+            for page in pages
+            for entry in page["results"]
+            for date_, start_min, end_min, index in zip(
+                entry["dates"], entry["starts"], entry["ends"], entry["batches"]
+            )
+        ]
+        assert walked == _day_tuples(full)
+
+
+@pytest.mark.django_db
+def test_page_days_requires_a_date_range():
+    client = _admin_client()
+    (journey,) = _make_journeys(1)
+    response = client.get(
+        AVAILABILITY_URL, {"jornada_id": str(journey.id), "page_days": 7}
+    )
+    assert response.status_code == 400
+    assert "page_days" in response.data
+
+
+# =========================
+# Borrados por lotes
+# =========================
+
+
+def _delete_statements(queries) -> list[str]:
+    return [
+        query["sql"]
+        for query in queries.captured_queries
+        if "DELETE FROM" in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_availability_is_deleted_in_chunks(monkeypatch):
+    monkeypatch.setattr(services, "DELETE_CHUNK_SIZE", 4)
+    client = _admin_client()
+    journey, other = _make_journeys(2)
+    start, end = _future(1), _future(10)
+    client.post(
+        AVAILABILITY_URL,
+        _weekly_payload(
+            [journey, other], start, end, ("09:00", "10:00"), ("10:00", "11:00")
+        ),
+        format="json",
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.delete(f"{AVAILABILITY_URL}?jornada_id={journey.id}")
+    assert response.status_code == 200
+    assert response.data == {"days_deleted": 10, "slots_deleted": 20}
+
+    # 10 dias en lotes de 4, mas la vuelta vacia que corta el ciclo. Cada lote
+    # borra slots y dias en una sola sentencia.
+    statements = _delete_statements(queries)
+    assert len(statements) == 4
+    assert all("RETURNING" in sql for sql in statements)
+    assert not AvailabilityDay.objects.filter(journey=journey).exists()
+    assert not AvailabilitySlot.objects.filter(
+        availability_day__journey=journey
+    ).exists()
+    assert (
+        AvailabilitySlot.objects.filter(availability_day__journey=other).count() == 20
+    )
+
+
+@pytest.mark.django_db
+def test_blocks_are_deleted_in_chunks(monkeypatch):
+    monkeypatch.setattr(services, "DELETE_CHUNK_SIZE", 2)
+    client = _admin_client()
+    journey, other = _make_journeys(2)
+    days = [_future(offset) for offset in range(1, 6)]
+    for day in days:
+        client.post(
+            BLOCKS_URL,
+            _block_payload([journey, other], day, "09:00", "10:00"),
+            format="json",
+        )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.delete(
+            f"{BLOCKS_URL}?jornada_id={journey.id}"
+            f"&start={days[0].isoformat()}&end={days[-1].isoformat()}"
+        )
+    assert response.data == {"blocks_deleted": 5}
+    assert len(_delete_statements(queries)) == 4
+    assert not ScheduleBlock.objects.filter(journey=journey).exists()
+    assert ScheduleBlock.objects.filter(journey=other).count() == 5
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url, result",
+    [
+        (AVAILABILITY_URL, {"days_deleted": 5, "slots_deleted": 5}),
+        (BLOCKS_URL, {"blocks_deleted": 5}),
+    ],
+)
+def test_background_deletion_job_reports_progress(
+    monkeypatch, django_capture_on_commit_callbacks, url, result
+):
+    monkeypatch.setattr(services, "DELETE_CHUNK_SIZE", 2)
+    # La tarea corre en linea al confirmar la transaccion.
+    monkeypatch.setattr(
+        tasks.run_deletion_job_task,
+        "delay",
+        lambda *args: tasks.run_deletion_job_task(*args),
+    )
+    saved = []
+    save_job = services._save_job
+
+    def _recording_save_job(job):
+        saved.append((job["status"], dict(job["progress"])))
+        return save_job(job)
+
+    monkeypatch.setattr(services, "_save_job", _recording_save_job)
+    client = _admin_client()
+    (journey,) = _make_journeys(1)
+    start, end = _future(1), _future(5)
+    client.post(
+        AVAILABILITY_URL,
+        _weekly_payload([journey], start, end, ("09:00", "10:00")),
+        format="json",
+    )
+    for offset in range(1, 6):
+        client.post(
+            BLOCKS_URL,
+            _block_payload([journey], _future(offset), "12:00", "13:00"),
+            format="json",
+        )
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        accepted = client.delete(f"{url}?jornada_id={journey.id}&background=1")
+    assert accepted.status_code == 202
+    job_url = f"/api/v1/scheduling/jobs/{accepted.data['job_id']}/"
+    pending = client.get(job_url)
+    assert pending.data["status"] == "pending"
+    assert pending.data["filters"] == {"jornada_id": str(journey.id)}
+
+    for callback in callbacks:
+        callback()
+
+    done = client.get(job_url)
+    assert done.status_code == 200
+    assert done.data["status"] == "done"
+    assert done.data["result"] == done.data["progress"] == result
+    # pending, running, un guardado por lote (5 filas en lotes de 2) y done.
+    assert [status for status, _ in saved] == ["pending", "running"] + [
+        "running"
+    ] * 3 + ["done"]
+    assert saved[-2][1] == result
+
+
+@pytest.mark.django_db
+def test_deletion_job_returns_404_for_unknown_jobs():
+    client = _admin_client()
+    response = client.get(f"/api/v1/scheduling/jobs/{uuid.uuid4()}/")
+    assert response.status_code == 404
+
+
+# =========================
+# Queries de la ruta publica
+# =========================
+
+# Techo de queries en frio de GET /api/v1/availability/free/.
+FREE_SLOTS_QUERY_BOUND = 4
+
+
+def _seed_free_slots_calendar(client, journeys, start, end, first_hour) -> None:
+    """Weekly, virtual and single availability plus blocks over the window."""
+    hours = [
+        (f"{hour:02d}:00", f"{hour:02d}:45")
+        for hour in range(first_hour, first_hour + 3)
+    ]
+    for payload in (
+        _weekly_payload(journeys, start, end, *hours, days_of_week=(1, 3, 5)),
+        _weekly_payload(
+            journeys, start, end, *hours, days_of_week=(2, 4), mode="VIRTUAL"
+        ),
+        _single_payload(
+            journeys, start, (f"{first_hour + 4:02d}:00", f"{first_hour + 5:02d}:00")
+        ),
+    ):
+        assert client.post(AVAILABILITY_URL, payload, format="json").status_code == 201
+    for offset in range(0, (end - start).days + 1, 2):
+        client.post(
+            BLOCKS_URL,
+            _block_payload(
+                journeys,
+                start + timedelta(days=offset),
+                f"{first_hour:02d}:15",
+                f"{first_hour + 1:02d}:30",
+            ),
+            format="json",
+        )
+
+
+def _free_slots_query_count(journey, start, end) -> tuple[int, int]:
+    # En frio: cada dia queda cacheado entre requests.
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        days = _free_days(journey, start, end)
+    return len(queries.captured_queries), sum(len(slots) for slots in days.values())
+
+
+@pytest.mark.django_db
+def test_free_slots_query_count_is_bounded_and_constant():
+    client = _admin_client()
+    journeys = _make_journeys(3)
+    start, end = _future(1), _future(28)
+    _seed_free_slots_calendar(client, journeys, start, end, first_hour=8)
+    small, small_windows = _free_slots_query_count(journeys[0], start, end)
+
+    _seed_free_slots_calendar(client, journeys, start, end, first_hour=14)
+    large, large_windows = _free_slots_query_count(journeys[0], start, end)
+
+    assert small <= FREE_SLOTS_QUERY_BOUND, (small, FREE_SLOTS_QUERY_BOUND)
+    assert large == small
+    assert large_windows > small_windows > 0
@@ -25,6 +25,7 @@ from apps.users.services import update_client_profile, ClientMatchError
 from apps.authcodes.models import OTPLoginCode
 from apps.authcodes.tasks import send_verification_code_task
 from core.api import CookieCsrfProtectedAPIView
+from core.auth_cache import forget_token
 from core.authentication import CookieJWTAuthentication
 from core.auth_cookies import attach_csrf_token, clear_auth_cookies, set_auth_cookies
 from core.csrf import issue_csrf_token
@@ -197,6 +198,9 @@ class LogoutView(CookieCsrfProtectedAPIView):
                 RefreshToken(token).blacklist()
             except Exception:
                 pass
+        access_token = request.COOKIES.get(settings.AUTH_COOKIE_ACCESS_NAME)
+        if access_token:
+            forget_token(access_token)
 
         response = Response(status=status.HTTP_204_NO_CONTENT)
         response = clear_auth_cookies(response)
@@ -3,8 +3,9 @@ from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from apps.shared.cloudinary import delete_uploaded_asset
-from apps.users.models import Client
+from apps.users.models import Client, User
 from apps.users.services import ensure_client_for_user
+from core.auth_cache import invalidate_user
 
 
 def _extract_google_data(sociallogin):
@@ -63,6 +64,7 @@ def capture_old_custom_avatar(sender, instance, **kwargs):
         old_instance = Client.objects.get(pk=instance.pk)
     except Client.DoesNotExist:
         return
+    instance._old_user_id = old_instance.user_id
     old_avatar = getattr(old_instance, "custom_avatar", None)
     new_avatar = getattr(instance, "custom_avatar", None)
     if old_avatar and old_avatar != new_avatar:
@@ -81,3 +83,19 @@ def cleanup_old_custom_avatar(sender, instance, **kwargs):
 @receiver(post_delete, sender=Client)
 def cleanup_custom_avatar_on_delete(sender, instance, **kwargs):
     _delete_cloudinary_avatar(instance.custom_avatar)
+
+
+# El usuario autenticado se cachea junto a su Client (core.auth_cache).
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+def invalidate_cached_client_user(sender, instance, **kwargs):
+    old_user_id = getattr(instance, "_old_user_id", None)
+    if old_user_id and old_user_id != instance.user_id:
+        invalidate_user(old_user_id)
+    invalidate_user(instance.user_id)
@@ -153,6 +153,45 @@ def test_logout_clears_auth_cookies(settings):
     assert me_response.status_code == 401
 
 
+@pytest.mark.django_db
+def test_cookie_auth_caches_user_until_user_or_client_changes(
+    settings, django_assert_num_queries
+):
+    _disable_throttling(settings)
+    email = "cached-user@example.com"
+    _, raw_code = OTPLoginCode.create_fresh(email=email)
+
+    client = APIClient(enforce_csrf_checks=True)
+    login_response = client.post(
+        "/api/v1/auth/verify-code/",
+        {"email": email, "code": raw_code},
+        format="json",
+    )
+    assert client.get("/api/v1/auth/me/").status_code == 200
+
+    # Usuario y Client salen de la cache: el GET no toca la base.
+    with django_assert_num_queries(0):
+        me_response = client.get("/api/v1/auth/me/")
+    assert me_response.data["email"] == email
+
+    profile = Client.objects.get(user__email=email)
+    profile.first_name = "Renombrada"
+    profile.save()
+    assert client.get("/api/v1/auth/me/").data["client"]["first_name"] == "Renombrada"
+
+    get_user_model().objects.filter(email=email).update(is_staff=True)
+    get_user_model().objects.get(email=email).save()
+    assert client.get("/api/v1/auth/me/").data["is_staff"] is True
+
+    logout_response = client.post(
+        "/api/v1/auth/logout/",
+        {},
+        format="json",
+        HTTP_X_CSRFTOKEN=login_response.data["csrfToken"],
+    )
+    assert logout_response.status_code == 204
+
+
 @pytest.mark.django_db
 def test_google_callback_sets_cookies_and_redirects_without_tokens_in_url(settings):
     _disable_throttling(settings)
@@ -1,9 +1,31 @@
 from collections.abc import Iterable
 
-from .models import Area, AreaCategory, FeaturedItemOrder, Pack
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch, Q
+
+from core.renderers import render_json
+
+from .models import (
+    Area,
+    AreaCategory,
+    BenefitItem,
+    FaqItem,
+    FeaturedItemOrder,
+    Pack,
+    PackArea,
+    RecommendationItem,
+    Section,
+    WaxingContent,
+    WaxingSettings,
+)
 from .models.choices import PackPosition, SortOption
 
 
+PUBLIC_SNAPSHOT_KEY = "waxing:public:snapshot"
+
+
 def image_url(image_field):
     if image_field:
         try:
@@ -151,12 +173,8 @@ def serialize_category(
     }
 
 
-def single_category_packs_for_category(category: AreaCategory):
-    packs = (
-        Pack.objects.filter(section=category.section, is_active=True)
-        .prefetch_related("pack_areas__area__category")
-        .all()
-    )
+def single_category_packs(packs: Iterable[Pack], category: AreaCategory):
+    """Packs whose areas all belong to ``category`` (``pack_areas`` prefetched)."""
     eligible = []
     for pack in packs:
         category_ids = {pack_area.area.category_id for pack_area in pack.pack_areas.all()}
@@ -165,18 +183,21 @@ def single_category_packs_for_category(category: AreaCategory):
     return eligible
 
 
-def sort_featured_items(section, sort_key: str):
-    areas = section.areas.filter(is_active=True, is_featured=True)
-    packs = section.packs.filter(is_active=True, is_featured=True).prefetch_related(
-        "pack_areas__area__category"
-    )
+def sort_featured_items(
+    areas: Iterable[Area],
+    packs: Iterable[Pack],
+    sort_key: str,
+    order_map: dict,
+):
+    """
+    Mix the featured areas and packs of a section.
+
+    ``order_map`` maps ``(item_kind, str(item_id))`` to the manual order saved
+    in ``FeaturedItemOrder``.
+    """
     mixed = [("area", area) for area in areas] + [("pack", pack) for pack in packs]
 
     if sort_key == SortOption.MANUAL:
-        order_map = {
-            (row.item_kind, str(row.item_id)): row.order
-            for row in FeaturedItemOrder.objects.filter(section=section)
-        }
         with_order = []
         without_order = []
         for kind, item in mixed:
@@ -220,3 +241,265 @@ def sort_featured_items(section, sort_key: str):
         return sorted(mixed, key=lambda data: (data[1].name or "").lower(), reverse=True)
 
     return sorted(mixed, key=lambda data: (data[1].name or "").lower())
+
+
+def serialize_content(content: WaxingContent | None):
+    """Public content block; relations must be prefetched active and ordered."""
+    if content is None:
+        return {
+            "title": "",
+            "short_description": "",
+            "description": "",
+            "recommendations_intro_text": "",
+            "image": None,
+            "benefits_image": None,
+            "recommendations_image": None,
+            "benefits": [],
+            "recommendations": [],
+            "faqs": [],
+        }
+
+    return {
+        "id": content.id,
+        "title": content.title,
+        "short_description": content.short_description,
+        "description": content.description,
+        "recommendations_intro_text": content.recommendations_intro_text,
+        "image": image_url(content.image),
+        "benefits_image": image_url(content.benefits_image),
+        "recommendations_image": image_url(content.recommendations_image),
+        "benefits": [
+            {
+                "id": item.id,
+                "title": item.title,
+                "detail": item.detail,
+                "order": item.order,
+            }
+            for item in content.benefits.all()
+        ],
+        "recommendations": [
+            {
+                "id": item.id,
+                "title": item.title,
+                "detail": item.detail,
+                "order": item.order,
+            }
+            for item in content.recommendations.all()
+        ],
+        "faqs": [
+            {
+                "id": item.id,
+                "question": item.question,
+                "answer": item.answer,
+                "order": item.order,
+            }
+            for item in content.faqs.all()
+        ],
+    }
+
+
+# =========================
+# Snapshot publico
+# =========================
+
+
+def _load_public_content():
+    return (
+        WaxingContent.objects.prefetch_related(
+            Prefetch(
+                "benefits",
+                queryset=BenefitItem.objects.filter(is_active=True).order_by("order"),
+            ),
+            Prefetch(
+                "recommendations",
+                queryset=RecommendationItem.objects.filter(is_active=True).order_by(
+                    "order"
+                ),
+            ),
+            Prefetch(
+                "faqs",
+                queryset=FaqItem.objects.filter(is_active=True).order_by("order"),
+            ),
+        )
+        .order_by("-created_at")
+        .first()
+    )
+
+
+def build_public_snapshot():
+    """
+    Build everything the public waxing page needs in a fixed number of queries.
+
+    Sections, categories, areas, packs (with their pack areas), featured
+    orders and content are loaded once and grouped in memory, so the query
+    count does not grow with the number of sections or categories.
+    """
+    settings_obj = WaxingSettings.objects.order_by("-created_at").first()
+    if settings_obj and not settings_obj.is_enabled:
+        return {"is_enabled": False}
+
+    show_prices = True if settings_obj is None else settings_obj.show_prices
+    featured_enabled = True if settings_obj is None else settings_obj.featured_enabled
+    public_visible = True if settings_obj is None else settings_obj.public_visible
+
+    sections = list(Section.objects.filter(is_active=True).order_by("-created_at"))
+    snapshot = {
+        "is_enabled": True,
+        "content": serialize_content(_load_public_content()),
+        "sections": [],
+    }
+    if not public_visible:
+        snapshot["sections"] = [
+            {"name": section.name, "data": None, "featured": []} for section in sections
+        ]
+        return snapshot
+
+    section_ids = [section.id for section in sections]
+    categories = list(
+        AreaCategory.objects.filter(
+            section_id__in=section_ids, is_active=True
+        ).order_by("order", "name")
+    )
+    areas = list(
+        Area.objects.filter(is_active=True).filter(
+            Q(category_id__in=[category.id for category in categories])
+            | Q(section_id__in=section_ids, is_featured=True)
+        )
+    )
+    packs = list(
+        Pack.objects.filter(section_id__in=section_ids, is_active=True).prefetch_related(
+            Prefetch(
+                "pack_areas",
+                queryset=PackArea.objects.select_related("area__category"),
+            )
+        )
+    )
+    featured_orders = {}
+    for row in FeaturedItemOrder.objects.filter(section_id__in=section_ids):
+        featured_orders.setdefault(row.section_id, {})[
+            (row.item_kind, str(row.item_id))
+        ] = row.order
+
+    categories_by_section = {}
+    for category in categories:
+        categories_by_section.setdefault(category.section_id, []).append(category)
+    areas_by_category = {}
+    for area in areas:
+        areas_by_category.setdefault(area.category_id, []).append(area)
+    packs_by_section = {}
+    for pack in packs:
+        packs_by_section.setdefault(pack.section_id, []).append(pack)
+
+    for section in sections:
+        section_packs = packs_by_section.get(section.id, [])
+        categories_payload = []
+        for category in categories_by_section.get(section.id, []):
+            category_areas = sort_items(
+                areas_by_category.get(category.id, []),
+                category.area_sort,
+            )
+            category_packs = []
+            if category.show_packs:
+                category_packs = sort_items(
+                    single_category_packs(section_packs, category),
+                    category.pack_sort,
+                )
+            categories_payload.append(
+                serialize_category(
+                    category,
+                    areas=category_areas,
+                    packs=category_packs,
+                    show_prices=show_prices,
+                )
+            )
+
+        featured_items = []
+        if featured_enabled:
+            featured = sort_featured_items(
+                [
+                    area
+                    for area in areas
+                    if area.section_id == section.id and area.is_featured
+                ],
+                [pack for pack in section_packs if pack.is_featured],
+                section.featured_sort,
+                featured_orders.get(section.id, {}),
+            )
+            for kind, item in featured:
+                if kind == "area":
+                    featured_items.append(serialize_area(item, show_prices=show_prices))
+                else:
+                    featured_items.append(serialize_pack(item, show_prices=show_prices))
+
+        snapshot["sections"].append(
+            {
+                "name": section.name,
+                "data": {
+                    "section": {
+                        "id": section.id,
+                        "name": section.name,
+                        "image": image_url(section.image),
+                        "featured_sort": section.featured_sort,
+                    },
+                    "categories": categories_payload,
+                },
+                "featured": featured_items,
+            }
+        )
+    # La vista sin filtro de seccion envia estos bytes tal cual.
+    snapshot["body"] = render_json(build_public_payload(snapshot))
+    return snapshot
+
+
+def build_public_payload(snapshot, selected_section=None):
+    """Public waxing page of an enabled snapshot, optionally limited to a section."""
+    payload = {
+        "category": "waxing",
+        "genders": [section["name"] for section in snapshot["sections"]],
+        "sections_by_gender": {},
+        "featured_by_gender": {},
+        "content": snapshot["content"],
+    }
+
+    for section in snapshot["sections"]:
+        section_name = section["name"]
+        if (
+            selected_section and selected_section != section_name
+        ) or section["data"] is None:
+            payload["sections_by_gender"][section_name] = {}
+            payload["featured_by_gender"][section_name] = []
+            continue
+        payload["sections_by_gender"][section_name] = section["data"]
+        payload["featured_by_gender"][section_name] = section["featured"]
+
+    if selected_section and selected_section not in payload["sections_by_gender"]:
+        payload["sections_by_gender"][selected_section] = {}
+        payload["featured_by_gender"][selected_section] = []
+    return payload
+
+
+def get_public_snapshot():
+    snapshot = cache.get(PUBLIC_SNAPSHOT_KEY)
+    if snapshot is None:
+        snapshot = build_public_snapshot()
+        cache.set(PUBLIC_SNAPSHOT_KEY, snapshot, timeout=None)
+    return snapshot
+
+
+async def aget_public_snapshot():
+    """
+    ``get_public_snapshot`` for async views.
+
+    The cache backends have no native async API, so ``aget``, the build and
+    ``aset`` would be three thread hops; the lookup runs in a single one.
+    """
+    return await sync_to_async(get_public_snapshot)()
+
+
+def invalidate_public_snapshot():
+    """
+    Drop the cached public snapshot now and again after commit, so a reader
+    that rebuilt it from pre-commit data does not keep serving it.
+    """
+    cache.delete(PUBLIC_SNAPSHOT_KEY)
+    transaction.on_commit(lambda: cache.delete(PUBLIC_SNAPSHOT_KEY))
@@ -3,6 +3,7 @@ from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from .models import Area, AreaCategory, Pack, Section, WaxingContent
+from .services import invalidate_public_snapshot
 
 
 def _cleanup_cloudinary_image(image_field):
@@ -141,3 +142,19 @@ def capture_waxing_content_old_images(sender, instance, **kwargs):
 def cleanup_waxing_content_old_images(sender, instance, **kwargs):
     """Cleanup old images after new ones are saved successfully."""
     _cleanup_old_images_after_save(instance)
+
+
+# =========================
+# Snapshot publico
+# =========================
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_public_snapshot_on_change(sender, **kwargs):
+    # Cualquier modelo de waxing (settings, contenido, secciones, items,
+    # orden de destacados) forma parte del snapshot publico.
+    meta = getattr(sender, "_meta", None)
+    if meta is None or meta.app_label != "waxing":
+        return
+    invalidate_public_snapshot()
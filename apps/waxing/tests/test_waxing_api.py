@@ -3,7 +3,10 @@ from datetime import timedelta
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
 from apps.waxing.models import (
@@ -17,6 +20,7 @@ from apps.waxing.models import (
     WaxingSettings,
 )
 from apps.waxing.models.choices import SortOption
+from apps.waxing.services import get_public_snapshot, invalidate_public_snapshot
 
 
 def _uid(prefix: str) -> str:
@@ -229,6 +233,28 @@ def test_public_filter_by_gender_keeps_full_structure():
     assert response.data["featured_by_gender"]["hombre"] == []
 
 
+@pytest.mark.django_db
+def test_public_endpoint_sends_the_prerendered_snapshot_body():
+    client = APIClient()
+    mujer = _create_section("mujer")
+    hombre = _create_section("hombre")
+    _create_area(mujer, _create_category(mujer, name="Rostro"), name="Bozo", price=5000)
+    _create_area(hombre, _create_category(hombre, name="Espalda"), name="Espalda alta")
+
+    invalidate_public_snapshot()
+    cold = client.get("/api/v1/waxing/")
+    warm = client.get("/api/v1/waxing/")
+    filtered = client.get("/api/v1/waxing/?section=mujer")
+
+    assert warm.prerendered_body == get_public_snapshot()["body"]
+    assert cold.content == warm.content == warm.prerendered_body
+    assert warm.content == JSONRenderer().render(warm.data)
+    # Con filtro de seccion el payload cambia: se renderiza en el request.
+    assert filtered.prerendered_body is None
+    assert filtered.content == JSONRenderer().render(filtered.data)
+    assert filtered.content != warm.content
+
+
 @pytest.mark.django_db
 def test_public_hides_price_and_price_without_discount_when_show_prices_is_false():
     client = APIClient()
@@ -773,6 +799,39 @@ def test_public_endpoint_supports_more_than_two_sections():
     }
 
 
+def _populate_section(name: str) -> Section:
+    section = _create_section(name, featured_sort=SortOption.MANUAL)
+    for _ in range(2):
+        category = _create_category(section)
+        area = _create_area(section, category, is_featured=True)
+        pack = _create_pack(section, is_featured=True)
+        PackArea.objects.create(pack=pack, area=area)
+    return section
+
+
+@pytest.mark.django_db
+def test_public_snapshot_query_count_does_not_grow_with_sections(
+    django_assert_num_queries,
+):
+    client = APIClient()
+    _populate_section(_uid("uno"))
+    with CaptureQueriesContext(connection) as small:
+        assert client.get("/api/v1/waxing/").status_code == 200
+
+    for _ in range(3):
+        _populate_section(_uid("otra"))
+    with CaptureQueriesContext(connection) as large:
+        response = client.get("/api/v1/waxing/")
+    assert len(response.data["genders"]) == 4
+    for section in response.data["sections_by_gender"].values():
+        assert len(section["categories"]) == 2
+        assert [len(c["items"]) for c in section["categories"]] == [2, 2]
+    assert len(large.captured_queries) == len(small.captured_queries)
+
+    with django_assert_num_queries(0):
+        assert client.get("/api/v1/waxing/").data == response.data
+
+
 @pytest.mark.django_db
 def test_sections_are_ordered_by_creation_date_in_public_and_crud():
     client = APIClient()
@@ -1195,3 +1254,46 @@ def test_content_patch_supports_nested_benefits_recommendations_and_faqs():
     faqs = list(content.faqs.order_by("order", "id"))
     assert [item.question for item in faqs] == ["Q actualizada", "Q nueva"]
     assert [item.order for item in faqs] == [0, 1]
+
+
+# Techo de queries en frio de las rutas publicas de waxing.
+PUBLIC_QUERY_BOUNDS = {
+    "/api/v1/waxing/": 12,
+    "/api/v1/waxing/summary/": 2,
+}
+
+
+def _populate_categories(section: Section, count: int) -> None:
+    for _ in range(count):
+        category = _create_category(section)
+        areas = [_create_area(section, category, is_featured=True) for _ in range(3)]
+        pack = _create_pack(section, is_featured=True)
+        for area in areas:
+            PackArea.objects.create(pack=pack, area=area)
+
+
+def _public_query_counts() -> dict:
+    client = APIClient()
+    counts = {}
+    for url in PUBLIC_QUERY_BOUNDS:
+        # En frio: el snapshot publico queda cacheado entre requests.
+        invalidate_public_snapshot()
+        with CaptureQueriesContext(connection) as queries:
+            assert client.get(url).status_code == 200
+        counts[url] = len(queries.captured_queries)
+    return counts
+
+
+@pytest.mark.django_db
+def test_public_routes_query_counts_are_bounded_and_constant():
+    section = _create_section(_uid("mujer"), featured_sort=SortOption.MANUAL)
+    _populate_categories(section, 4)
+    small = _public_query_counts()
+
+    _populate_categories(section, 4)
+    _populate_categories(_create_section(_uid("hombre")), 8)
+    large = _public_query_counts()
+
+    for url, bound in PUBLIC_QUERY_BOUNDS.items():
+        assert small[url] <= bound, (url, small[url], bound)
+    assert large == small
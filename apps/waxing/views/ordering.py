@@ -8,6 +8,7 @@ from rest_framework.views import APIView
 
 from ..models import Area, AreaCategory, FeaturedItemOrder, Pack, Section
 from ..serializers import FeaturedReorderSerializer, UUIDReorderSerializer
+from ..services import invalidate_public_snapshot
 
 
 def _validate_complete_uuid_list(requested_ids, expected_ids, field_name):
@@ -62,6 +63,7 @@ class CategoryAreaReorderView(APIView):
         with transaction.atomic():
             if to_update:
                 Area.objects.bulk_update(to_update, ["order"])
+                invalidate_public_snapshot()
 
         return Response(
             {
@@ -98,6 +100,7 @@ class CategoryPackReorderView(APIView):
         with transaction.atomic():
             if to_update:
                 Pack.objects.bulk_update(to_update, ["order"])
+                invalidate_public_snapshot()
 
         return Response(
             {
@@ -157,6 +160,7 @@ class SectionFeaturedReorderView(APIView):
                     for index, (item_kind, item_id) in enumerate(requested_keys)
                 ]
             )
+            invalidate_public_snapshot()
 
         return Response(
             {
@@ -1,3 +1,7 @@
+import inspect
+
+from asgiref.sync import sync_to_async
+from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from core.csrf import enforce_csrf
@@ -15,3 +19,54 @@ class CookieCsrfProtectedAPIView(APIView):
         if self.should_enforce_csrf(request):
             enforce_csrf(request)
         super().initial(request, *args, **kwargs)
+
+
+class PrerenderedResponse(Response):
+    """
+    Response of a payload whose JSON was rendered when it was cached.
+
+    ``data`` stays available (browsable API, tests); ``ORJSONRenderer`` sends
+    ``body`` as is instead of encoding ``data`` again. ``body=None`` renders
+    normally.
+    """
+
+    def __init__(self, data=None, body=None, **kwargs):
+        super().__init__(data, **kwargs)
+        self.prerendered_body = body
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines, so Django runs it as an async view.
+
+    DRF is sync-only: authentication, permissions and throttling (``initial``)
+    run in a single ``sync_to_async`` hop and the handler awaits the async ORM
+    and cache APIs. Every handler must be ``async def``.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = self.http_method_not_allowed
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), handler)
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def options(self, request, *args, **kwargs):
+        return super().options(request, *args, **kwargs)
+
+    def get_serializer_context(self):
+        return {"request": self.request, "format": self.format_kwarg, "view": self}
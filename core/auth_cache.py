@@ -0,0 +1,161 @@
+"""
+Short-lived cache of the user behind an access token.
+
+``CookieJWTAuthentication`` would otherwise load the user (and then its
+``Client``) on every authenticated request. The user is pickled together with
+its client and stored under ``(user_id, jti)`` in the default cache backend,
+with a small per-process LRU in front so repeated requests of the same session
+do not even reach Redis.
+
+Each user owns a generation counter. Cached entries carry the generation they
+were built with, so saving the user or its client invalidates every token of
+that user at once; the per-process LRU of other workers keeps serving the old
+copy for at most ``AUTH_USER_LOCAL_CACHE_SECONDS``.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+LOCAL_CACHE_SIZE = 1024
+
+_ENTRY_KEY = "auth:user:{user_id}:{jti}"
+_GENERATION_KEY = "auth:user:generation:{user_id}"
+
+
+class _LocalLRU:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key, payload, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard_user(self, user_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def discard(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_local = _LocalLRU(LOCAL_CACHE_SIZE)
+
+
+def _new_generation() -> int:
+    # Sembrado con el reloj: si Redis desaloja el contador no vuelve a un valor viejo.
+    return time.time_ns() // 1000
+
+
+def _token_key(validated_token) -> Optional[tuple]:
+    user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+    jti = validated_token.get(api_settings.JTI_CLAIM)
+    if user_id is None or not jti:
+        return None
+    return str(user_id), str(jti)
+
+
+def get_token_user(validated_token, load: Callable):
+    """
+    Return the user of ``validated_token``, calling ``load`` only on a miss.
+
+    ``AUTH_USER_CACHE_TIMEOUT = 0`` disables the cache entirely.
+    """
+    timeout = settings.AUTH_USER_CACHE_TIMEOUT
+    key = _token_key(validated_token)
+    if not timeout or key is None:
+        return load(validated_token)
+
+    # Se guarda pickleado: cada request recibe su propia instancia y un
+    # ``save()`` en la vista no modifica la copia compartida.
+    payload = _local.get(key)
+    if payload is not None:
+        return pickle.loads(payload)
+
+    user_id, jti = key
+    entry_key = _ENTRY_KEY.format(user_id=user_id, jti=jti)
+    generation_key = _GENERATION_KEY.format(user_id=user_id)
+    found = cache.get_many([entry_key, generation_key])
+    generation = found.get(generation_key)
+    if generation is None:
+        generation = _new_generation()
+        if not cache.add(generation_key, generation, timeout=None):
+            generation = cache.get(generation_key, generation)
+
+    entry = found.get(entry_key)
+    if entry is not None and entry[0] == generation:
+        payload = entry[1]
+    else:
+        user = load(validated_token)
+        payload = pickle.dumps(user)
+        cache.set(entry_key, (generation, payload), timeout)
+    _local.set(key, payload, min(settings.AUTH_USER_LOCAL_CACHE_SECONDS, timeout))
+    return pickle.loads(payload)
+
+
+def _bump_generation(user_id: str) -> None:
+    key = _GENERATION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_generation(), timeout=None)
+    _local.discard_user(user_id)
+
+
+def invalidate_user(user_id) -> None:
+    """
+    Drop every cached token entry of ``user_id``.
+
+    Runs immediately and again after commit, so a request that cached the
+    pre-commit row in between does not keep serving it.
+    """
+    if user_id is None:
+        return
+    user_id = str(user_id)
+    _bump_generation(user_id)
+    transaction.on_commit(lambda: _bump_generation(user_id))
+
+
+def forget_token(raw_token: str) -> None:
+    """Drop the cached user of one access token (logout)."""
+    try:
+        key = _token_key(AccessToken(raw_token))
+    except TokenError:
+        return
+    if key is None:
+        return
+    _local.discard(key)
+    cache.delete(_ENTRY_KEY.format(user_id=key[0], jti=key[1]))
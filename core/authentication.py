@@ -1,6 +1,8 @@
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from core.auth_cache import get_token_user
 from core.csrf import enforce_csrf
 
 
@@ -23,4 +25,13 @@ class CookieJWTAuthentication(JWTAuthentication):
         validated_token = self.get_validated_token(raw_token)
         if used_cookie and request.method not in {"GET", "HEAD", "OPTIONS"}:
             enforce_csrf(request)
-        return self.get_user(validated_token), validated_token
+        return get_token_user(validated_token, self._load_user), validated_token
+
+    def _load_user(self, validated_token):
+        user = self.get_user(validated_token)
+        # Se carga el Client ahora para que quede cacheado junto al usuario.
+        try:
+            user.client
+        except ObjectDoesNotExist:
+            pass
+        return user
@@ -0,0 +1,42 @@
+"""
+Cache backends that report hits and misses to the request metrics.
+
+They only override the read methods and otherwise behave exactly like the
+backend they extend.
+"""
+
+from django.core.cache.backends.locmem import LocMemCache as BaseLocMemCache
+from django_redis.cache import RedisCache as BaseRedisCache
+
+from core.request_metrics import record_cache_lookup
+
+_MISSING = object()
+
+
+class CacheMetricsMixin:
+    def get(self, key, default=None, *args, **kwargs):
+        value = super().get(key, _MISSING, *args, **kwargs)
+        if value is _MISSING:
+            record_cache_lookup(misses=1)
+            return default
+        record_cache_lookup(hits=1)
+        return value
+
+
+class BatchCacheMetricsMixin(CacheMetricsMixin):
+    """For backends whose ``get_many`` does not go through ``get``."""
+
+    def get_many(self, keys, *args, **kwargs):
+        keys = list(keys)
+        found = super().get_many(keys, *args, **kwargs)
+        record_cache_lookup(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+
+class LocMemCache(CacheMetricsMixin, BaseLocMemCache):
+    # BaseCache.get_many llama a get por clave: ya queda contado ahi.
+    pass
+
+
+class RedisCache(BatchCacheMetricsMixin, BaseRedisCache):
+    pass
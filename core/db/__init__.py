@@ -0,0 +1,7 @@
+"""
+PostgreSQL backend that reports queries and connection setup to the
+request metrics.
+
+Use ``ENGINE = "core.db"``; ``core.settings`` switches to it for every
+Postgres ``DATABASE_URL``.
+"""
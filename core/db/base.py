@@ -0,0 +1,31 @@
+from time import perf_counter
+
+from django.db.backends.postgresql.base import DatabaseWrapper as BaseDatabaseWrapper
+
+from core.request_metrics import db_execute_wrapper, record_db_connect
+
+# Indicadores del pool que se guardan con la espera de cada request.
+POOL_GAUGES = ("pool_size", "pool_available", "requests_waiting")
+
+
+class DatabaseWrapper(BaseDatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Las conexiones son por hilo: con vistas async las queries corren en
+        # el hilo de sync_to_async, fuera del alcance del middleware. El wrapper
+        # no hace nada si no hay un request en curso.
+        self.execute_wrappers.append(db_execute_wrapper)
+
+    def get_new_connection(self, conn_params):
+        """
+        Time the connection setup: a TCP + auth handshake without a pool, or
+        the wait for a free connection (``getconn``) with one.
+        """
+        started = perf_counter()
+        connection = super().get_new_connection(conn_params)
+        pool_stats = None
+        if self.pool:
+            stats = self.pool.get_stats()
+            pool_stats = {key: stats.get(key, 0) for key in POOL_GAUGES}
+        record_db_connect(perf_counter() - started, pool_stats)
+        return connection
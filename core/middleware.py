@@ -1,19 +1,64 @@
+import logging
 import re
 import secrets
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
 from django.http import HttpResponse, JsonResponse
 from django.middleware.csrf import CsrfViewMiddleware
 from django.utils.functional import cached_property
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
 
+from core import request_metrics
 
-class HealthzShortCircuitMiddleware:
-    """Return 200 for /healthz without running the rest of the middleware chain."""
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCapableMiddleware:
+    """
+    Base for middleware that runs natively in both modes.
+
+    Under ASGI a single sync-only middleware makes Django run the rest of the
+    chain in a thread, which defeats the async views.
+    """
+
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+
+class HealthzShortCircuitMiddleware(AsyncCapableMiddleware):
+    """Return 200 for /healthz without running the rest of the middleware chain."""
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self._healthz(request)
+        if response is None:
+            response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request):
+        response = self._healthz(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
+
+    def _healthz(self, request):
         if request.method in {"GET", "HEAD"} and request.path_info in {
             "/healthz",
             "/healthz/",
@@ -21,33 +66,145 @@ class HealthzShortCircuitMiddleware:
             response = HttpResponse(status=200)
             response["Cache-Control"] = "no-store"
             return response
-        return self.get_response(request)
+        return None
 
 
-class ProxySecretMiddleware:
-    """Optionally require a shared secret for requests that must come via a proxy."""
+class RequestMetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Measure wall time, DB queries/time, cache hits/misses and serializer time.
+
+    The metrics go out as a ``Server-Timing`` header, a JSON log line on the
+    ``core.request_metrics`` logger and data on the sampled Sentry transaction.
+    Views may declare a ``query_budget``; exceeding it logs a warning, or
+    raises ``QueryBudgetExceeded`` with ``QUERY_BUDGET_STRICT`` (tests).
+    Queries issued while a streaming response is consumed are not counted.
+    """
 
     def __init__(self, get_response):
-        self.get_response = get_response
+        super().__init__(get_response)
+        request_metrics.install_serializer_timing()
 
     def __call__(self, request):
-        if not getattr(settings, "REQUIRE_PROXY_SECRET", False):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.REQUEST_METRICS_ENABLED:
             return self.get_response(request)
 
+        metrics, token = request_metrics.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_metrics.finish(token)
+        return self._finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not settings.REQUEST_METRICS_ENABLED:
+            return await self.get_response(request)
+
+        metrics, token = request_metrics.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_metrics.finish(token)
+        return self._finish(request, response, metrics)
+
+    def _finish(self, request, response, metrics):
+        total_time = metrics.total_time
+        self._record_view(request, metrics)
+        if metrics.over_budget:
+            message = (
+                f"{metrics.view} hizo {metrics.db_queries} queries "
+                f"(presupuesto {metrics.query_budget})"
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                raise request_metrics.QueryBudgetExceeded(message)
+            logger.warning(message)
+        if settings.REQUEST_METRICS_SERVER_TIMING:
+            response["Server-Timing"] = metrics.server_timing(total_time)
+        if settings.REQUEST_METRICS_LOG:
+            request_metrics.report(request, response, metrics, total_time)
+        return response
+
+    def _record_view(self, request, metrics):
+        # Sin process_view: en modo async Django lo correria en un hilo (y
+        # Sentry envuelve los process_view en funciones sync). resolver_match
+        # ya esta cuando vuelve la respuesta; falta en 404 y /healthz.
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return
+        view_func = match.func
+        # ``as_view()`` devuelve una closure; el nombre util es el de la clase.
+        view = (
+            getattr(view_func, "cls", None)
+            or getattr(view_func, "view_class", None)
+            or view_func
+        )
+        metrics.view = f"{view.__module__}.{view.__qualname__}"
+        metrics.query_budget = request_metrics.view_query_budget(view_func)
+
+
+class ProxySecretMiddleware(AsyncCapableMiddleware):
+    """Optionally require a shared secret for requests that must come via a proxy."""
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self._forbidden(request)
+        if response is None:
+            response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request):
+        response = self._forbidden(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
+
+    def _forbidden(self, request):
+        if not getattr(settings, "REQUIRE_PROXY_SECRET", False):
+            return None
+
         path = request.path_info or "/"
         exempt_prefixes = getattr(settings, "PROXY_SECRET_EXEMPT_PATH_PREFIXES", [])
         if any(path.startswith(prefix) for prefix in exempt_prefixes):
-            return self.get_response(request)
+            return None
 
         expected = getattr(settings, "PROXY_SHARED_SECRET", "")
         received = request.headers.get("X-Proxy-Secret", "")
 
         if expected and secrets.compare_digest(received, expected):
-            return self.get_response(request)
+            return None
 
         return JsonResponse({"detail": "Forbidden."}, status=403)
 
 
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """WhiteNoise that passes non-static requests through without a thread hop."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
 class LanAwareCsrfViewMiddleware(CsrfViewMiddleware):
     """Allow regex-based CSRF origins for local LAN frontends."""
 
@@ -0,0 +1,38 @@
+"""
+orjson-backed JSON parser, a drop-in replacement of DRF's ``JSONParser``.
+"""
+
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from core.renderers import ORJSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - sin orjson se usa el parser de DRF
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    """
+    Parse UTF-8 request bodies with orjson.
+
+    orjson rejects NaN/Infinity like DRF does under ``STRICT_JSON``; other
+    charsets and non-strict mode fall back to DRF's parser.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,74 @@
+"""
+orjson-backed JSON rendering with the exact output of DRF's ``JSONRenderer``.
+
+orjson already writes UUIDs, dates and datetimes the way DRF's encoder does
+(``Z`` for UTC via ``OPT_UTC_Z``); everything else it does not know natively
+(Decimal, lazy strings, querysets...) goes through DRF's ``JSONEncoder.default``,
+so the compact output is byte-for-byte the same. Known differences: floats
+below 1e-4 or from 1e16 up keep their value but are spelled the orjson way
+(``1e-7`` vs ``1e-07``), and NaN/Infinity become ``null`` instead of raising.
+Amounts travel as strings (``COERCE_DECIMAL_TO_STRING``), so neither shows up
+in this API.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - sin orjson se usa el renderer de DRF
+    orjson = None
+
+
+_encoder = JSONEncoder()
+_LINE_SEPARATOR = "\u2028".encode()
+_PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def render_json(data) -> bytes:
+    """Compact UTF-8 JSON of ``data``, as DRF's ``JSONRenderer`` renders it."""
+    if orjson is None:
+        return JSONRenderer().render(data)
+    try:
+        body = orjson.dumps(data, default=_encoder.default, option=_OPTIONS)
+    except orjson.JSONEncodeError:
+        # Enteros de mas de 64 bits y otros casos que orjson no cubre.
+        return JSONRenderer().render(data)
+    # DRF los escapa para que el JSON sea un subconjunto estricto de JavaScript.
+    if _LINE_SEPARATOR in body or _PARAGRAPH_SEPARATOR in body:
+        body = body.replace(_LINE_SEPARATOR, b"\\u2028").replace(
+            _PARAGRAPH_SEPARATOR, b"\\u2029"
+        )
+    return body
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that encodes with orjson.
+
+    Responses carrying a ``prerendered_body`` (see ``core.api.PrerenderedResponse``)
+    are returned as is. Indented output (browsable API, ``; indent=``) and
+    non-default ``UNICODE_JSON``/``COMPACT_JSON``/``STRICT_JSON`` settings
+    fall back to DRF's renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        body = getattr(renderer_context.get("response"), "prerendered_body", None)
+        if body is not None:
+            return body
+        return render_json(data)
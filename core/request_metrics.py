@@ -0,0 +1,209 @@
+"""
+Per-request performance metrics collected by ``RequestMetricsMiddleware``.
+
+The metrics of the running request live in a context variable, so the
+``core.db`` backend, the instrumented cache backends and the serializer hook
+can feed them from anywhere without threading the request around; the
+variable also follows the request into ``sync_to_async`` threads. Outside a request (Celery, management commands) ``current()`` is
+None and nothing is recorded.
+"""
+
+import json
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Optional
+
+try:
+    import sentry_sdk
+except ImportError:  # pragma: no cover - sentry es opcional
+    sentry_sdk = None
+
+
+logger = logging.getLogger("core.request_metrics")
+
+_current: ContextVar[Optional["RequestMetrics"]] = ContextVar(
+    "request_metrics", default=None
+)
+_serializer_timing_installed = False
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a view issues more queries than its budget."""
+
+
+@dataclass
+class RequestMetrics:
+    started: float = field(default_factory=perf_counter)
+    db_queries: int = 0
+    db_time: float = 0.0
+    db_connects: int = 0
+    db_connect_time: float = 0.0
+    db_pool: Optional[dict] = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    serialize_time: float = 0.0
+    serialize_depth: int = 0
+    view: str = ""
+    query_budget: Optional[int] = None
+
+    @property
+    def total_time(self) -> float:
+        return perf_counter() - self.started
+
+    @property
+    def over_budget(self) -> bool:
+        return self.query_budget is not None and self.db_queries > self.query_budget
+
+    def server_timing(self, total_time: float) -> str:
+        return ", ".join(
+            [
+                f"total;dur={total_time * 1000:.1f}",
+                f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries"',
+                f"db-connect;dur={self.db_connect_time * 1000:.1f}",
+                f"serialize;dur={self.serialize_time * 1000:.1f}",
+                f'cache;desc="hits={self.cache_hits} misses={self.cache_misses}"',
+            ]
+        )
+
+
+def current() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+def start() -> tuple:
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def finish(token) -> None:
+    _current.reset(token)
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """Execute wrapper of the ``core.db`` backend counting queries and their time."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_queries += 1
+        metrics.db_time += perf_counter() - started
+
+
+def record_db_connect(seconds: float, pool_stats: Optional[dict] = None) -> None:
+    """Connection setup (or pool wait) reported by the ``core.db`` backend."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.db_connects += 1
+        metrics.db_connect_time += seconds
+        if pool_stats is not None:
+            metrics.db_pool = pool_stats
+
+
+def record_cache_lookup(*, hits: int = 0, misses: int = 0) -> None:
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+def query_budget(max_queries: int):
+    """
+    Declare the maximum number of queries of a view (function or class).
+
+    Views can also set a ``query_budget`` class attribute.
+    """
+
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+
+    return decorator
+
+
+def view_query_budget(view_func) -> Optional[int]:
+    budget = getattr(view_func, "query_budget", None)
+    if budget is None:
+        view_class = getattr(view_func, "cls", None) or getattr(
+            view_func, "view_class", None
+        )
+        budget = getattr(view_class, "query_budget", None)
+    return budget
+
+
+def install_serializer_timing() -> None:
+    """
+    Time ``serializer.data`` (where DRF runs ``to_representation``).
+
+    Only the outermost call is timed, so serializers that build nested ones
+    by hand are not counted twice.
+    """
+    global _serializer_timing_installed
+    if _serializer_timing_installed:
+        return
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data.fget
+
+    def timed_data(serializer):
+        metrics = _current.get()
+        if metrics is None or metrics.serialize_depth:
+            return original(serializer)
+        metrics.serialize_depth += 1
+        started = perf_counter()
+        try:
+            return original(serializer)
+        finally:
+            metrics.serialize_depth -= 1
+            metrics.serialize_time += perf_counter() - started
+
+    BaseSerializer.data = property(timed_data)
+    _serializer_timing_installed = True
+
+
+def report(request, response, metrics: RequestMetrics, total_time: float) -> None:
+    """Emit the structured log line and attach the metrics to Sentry."""
+    payload = {
+        "method": request.method,
+        "path": request.path,
+        "route": getattr(request.resolver_match, "route", None),
+        "view": metrics.view,
+        "status": response.status_code,
+        "total_ms": round(total_time * 1000, 1),
+        "db_queries": metrics.db_queries,
+        "db_ms": round(metrics.db_time * 1000, 1),
+        "db_connects": metrics.db_connects,
+        "db_connect_ms": round(metrics.db_connect_time * 1000, 1),
+        "db_pool": metrics.db_pool,
+        "serialize_ms": round(metrics.serialize_time * 1000, 1),
+        "cache_hits": metrics.cache_hits,
+        "cache_misses": metrics.cache_misses,
+        "query_budget": metrics.query_budget,
+        "streaming": response.streaming,
+    }
+    logger.info(json.dumps(payload, separators=(",", ":")))
+    _report_sentry(payload, metrics)
+
+
+def _report_sentry(payload: dict, metrics: RequestMetrics) -> None:
+    if sentry_sdk is None:
+        return
+    # Solo hay transaccion si el request entro en SENTRY_TRACES_SAMPLE_RATE.
+    transaction = sentry_sdk.get_current_scope().transaction
+    if transaction is None:
+        return
+    for key in (
+        "db_queries",
+        "db_ms",
+        "db_connect_ms",
+        "serialize_ms",
+        "cache_hits",
+        "cache_misses",
+    ):
+        transaction.set_data(f"request.{key}", payload[key])
+    if metrics.over_budget:
+        transaction.set_tag("query_budget_exceeded", "true")
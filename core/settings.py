@@ -64,10 +64,11 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "core.middleware.HealthzShortCircuitMiddleware",
+    "core.middleware.RequestMetricsMiddleware",
     "core.middleware.ProxySecretMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",  # 👈 Vital para el CSS en Cloud Run
+    "core.middleware.WhiteNoiseMiddleware",  # 👈 Vital para el CSS en Cloud Run
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "core.middleware.LanAwareCsrfViewMiddleware",
@@ -129,14 +130,44 @@ ASGI_APPLICATION = "core.asgi.application"
 # ── BASE DE DATOS ──
 DATABASES = {"default": env.db("DATABASE_URL")}
 CONN_MAX_AGE = env.int("CONN_MAX_AGE", default=0)
+CONN_HEALTH_CHECKS = env.bool("CONN_HEALTH_CHECKS", default=True)
 DISABLE_SERVER_SIDE_CURSORS = env.bool("DISABLE_SERVER_SIDE_CURSORS", default=True)
+# Pool de psycopg 3 por proceso (OPTIONS["pool"]). Con ASGI cada request sync
+# corre en su propio hilo, asi que las conexiones persistentes (CONN_MAX_AGE)
+# quedan atadas a hilos; el pool las devuelve al terminar cada request.
+DATABASE_POOL = env.bool("DATABASE_POOL", default=False)
+DATABASE_POOL_MIN_SIZE = env.int("DATABASE_POOL_MIN_SIZE", default=2)
+DATABASE_POOL_MAX_SIZE = env.int("DATABASE_POOL_MAX_SIZE", default=10)
+DATABASE_POOL_TIMEOUT = env.float("DATABASE_POOL_TIMEOUT", default=10.0)
+DATABASE_POOL_MAX_IDLE = env.int("DATABASE_POOL_MAX_IDLE", default=300)
+DATABASE_POOL_MAX_LIFETIME = env.int("DATABASE_POOL_MAX_LIFETIME", default=1800)
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    DATABASES["default"].update(
+        {
+            # Igual que el backend de Django, pero mide la conexion/espera del pool.
+            "ENGINE": "core.db",
+            "CONN_HEALTH_CHECKS": CONN_HEALTH_CHECKS,
+            "DISABLE_SERVER_SIDE_CURSORS": DISABLE_SERVER_SIDE_CURSORS,
+            # Django no admite conexiones persistentes junto con el pool.
+            "CONN_MAX_AGE": 0 if DATABASE_POOL else CONN_MAX_AGE,
+        }
+    )
+    if DATABASE_POOL:
+        DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+            "min_size": DATABASE_POOL_MIN_SIZE,
+            "max_size": DATABASE_POOL_MAX_SIZE,
+            "timeout": DATABASE_POOL_TIMEOUT,
+            "max_idle": DATABASE_POOL_MAX_IDLE,
+            "max_lifetime": DATABASE_POOL_MAX_LIFETIME,
+        }
 
 # ── CACHÉ (REDIS O MEMORIA) ──
 REDIS_URL = os.getenv("REDIS_URL", None)
 if REDIS_URL:
     CACHES = {
         "default": {
-            "BACKEND": "django_redis.cache.RedisCache",
+            "BACKEND": "core.cache_backends.RedisCache",
             "LOCATION": REDIS_URL,
             "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
             "KEY_PREFIX": env("CACHE_KEY_PREFIX", default="core"),
@@ -145,11 +176,29 @@ if REDIS_URL:
 else:
     CACHES = {
         "default": {
-            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "BACKEND": "core.cache_backends.LocMemCache",
             "LOCATION": "unique-snowflake",
         }
     }
 
+# Listados públicos del catálogo (se invalidan por versión al editar)
+CATALOG_LISTING_CACHE_TIMEOUT = env.int(
+    "CATALOG_LISTING_CACHE_TIMEOUT", default=60 * 60 * 24
+)
+# Segundos que se agrupan los cambios antes de recalcular el resumen de filtros
+CATALOG_FILTERS_SUMMARY_DEBOUNCE = env.int(
+    "CATALOG_FILTERS_SUMMARY_DEBOUNCE", default=10
+)
+# Segundos que se agrupan los cambios antes de regenerar el snapshot del catálogo
+CATALOG_SUMMARY_SNAPSHOT_DEBOUNCE = env.int(
+    "CATALOG_SUMMARY_SNAPSHOT_DEBOUNCE", default=10
+)
+
+# Segundos que se cachean las ventanas libres por jornada y dia (agenda publica)
+SCHEDULING_FREE_SLOTS_CACHE_TIMEOUT = env.int(
+    "SCHEDULING_FREE_SLOTS_CACHE_TIMEOUT", default=60 * 60 * 24
+)
+
 LANGUAGE_CODE = "es"
 TIME_ZONE = env("TIME_ZONE", default="America/Argentina/Buenos_Aires")
 USE_I18N = True
@@ -192,8 +241,12 @@ CLOUDINARY_STORAGE = {
 # ── DRF ──
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": ("core.authentication.CookieJWTAuthentication",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_PARSER_CLASSES": (
-        "rest_framework.parsers.JSONParser",
+        "core.parsers.ORJSONParser",
     ),
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -234,6 +287,11 @@ SIMPLE_JWT = {
     "UPDATE_LAST_LOGIN": True,
 }
 
+# Cache del usuario autenticado por (user_id, jti); se invalida al guardar User/Client
+AUTH_USER_CACHE_TIMEOUT = env.int("AUTH_USER_CACHE_TIMEOUT", default=60)
+# LRU en memoria de cada proceso delante de Redis (segundos)
+AUTH_USER_LOCAL_CACHE_SECONDS = env.int("AUTH_USER_LOCAL_CACHE_SECONDS", default=5)
+
 AUTH_COOKIE_ACCESS_NAME = env("AUTH_COOKIE_ACCESS_NAME", default="accessToken")
 AUTH_COOKIE_REFRESH_NAME = env("AUTH_COOKIE_REFRESH_NAME", default="refreshToken")
 AUTH_COOKIE_PATH = env("AUTH_COOKIE_PATH", default="/")
@@ -332,6 +390,14 @@ CELERY_TASK_IGNORE_RESULT = env.bool("CELERY_TASK_IGNORE_RESULT", default=True)
 CELERY_TASK_ALWAYS_EAGER = env.bool("CELERY_TASK_ALWAYS_EAGER", default=False)
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# ── MÉTRICAS POR REQUEST ──
+# Server-Timing + log JSON (core.request_metrics) con tiempos, queries y cache
+REQUEST_METRICS_ENABLED = env.bool("REQUEST_METRICS_ENABLED", default=True)
+REQUEST_METRICS_SERVER_TIMING = env.bool("REQUEST_METRICS_SERVER_TIMING", default=True)
+REQUEST_METRICS_LOG = env.bool("REQUEST_METRICS_LOG", default=True)
+# Si una vista supera su query_budget: False solo loguea, True levanta excepción
+QUERY_BUDGET_STRICT = env.bool("QUERY_BUDGET_STRICT", default=False)
+
 # ── SENTRY ──
 try:
     import sentry_sdk
@@ -368,6 +434,14 @@ REVIEWS_GOOGLE_AUTO_SYNC_ON_READ = env.bool(
     "REVIEWS_GOOGLE_AUTO_SYNC_ON_READ",
     default=True,
 )
+# Segundos que se cachea el payload publico de reviews (se invalida por version)
+REVIEWS_PUBLIC_CACHE_TIMEOUT = env.int(
+    "REVIEWS_PUBLIC_CACHE_TIMEOUT", default=60 * 60 * 24
+)
+# Vida maxima del lock del sync en segundo plano (si el worker muere, expira solo)
+REVIEWS_GOOGLE_SYNC_LOCK_SECONDS = env.int(
+    "REVIEWS_GOOGLE_SYNC_LOCK_SECONDS", default=60 * 15
+)
 REVIEWS_GOOGLE_ACCOUNT_ID = env("REVIEWS_GOOGLE_ACCOUNT_ID", default="")
 REVIEWS_GOOGLE_LOCATION_ID = env("REVIEWS_GOOGLE_LOCATION_ID", default="")
 REVIEWS_GOOGLE_ACCESS_TOKEN = env("REVIEWS_GOOGLE_ACCESS_TOKEN", default="")
@@ -401,5 +475,10 @@ LOGGING = {
             "level": "INFO",
             "propagate": True,
         },
+        "core.request_metrics": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
@@ -0,0 +1,69 @@
+import json
+import re
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.urls import resolve
+from django.utils.module_loading import import_string
+
+from apps.waxing import services as waxing_services
+from core import request_metrics
+from core.middleware import RequestMetricsMiddleware
+
+
+@pytest.fixture(autouse=True)
+def _public_client_settings(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_CLASSES": [],
+    }
+    settings.REVIEWS_PROVIDER = "manual"
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_public_reads_run_as_async_views_through_an_async_middleware_chain(
+    settings, monkeypatch
+):
+    settings.REQUEST_METRICS_LOG = True
+    logged = []
+    monkeypatch.setattr(request_metrics.logger, "info", logged.append)
+
+    # Un solo middleware sync haria correr toda la cadena en un hilo.
+    for path in settings.MIDDLEWARE:
+        assert getattr(import_string(path), "async_capable", False), path
+    for url in ("/api/v1/reviews/", "/api/v1/waxing/", "/api/v1/waxing/summary/"):
+        assert iscoroutinefunction(resolve(url).func), url
+    # Un process_view sync tambien saltaria a un hilo en cada request.
+    assert not hasattr(RequestMetricsMiddleware, "process_view")
+
+    response = async_to_sync(AsyncClient().get)("/api/v1/reviews/")
+
+    assert response.status_code == 200
+    assert response.json()["provider"] == "manual"
+    # Las queries del hilo de sync_to_async tambien se cuentan.
+    queries = re.search(r'desc="(\d+) queries"', response["Server-Timing"])
+    assert int(queries.group(1)) > 0
+    assert json.loads(logged[-1])["view"] == "apps.reviews.views.PublicReviewsView"
+
+
+@pytest.mark.django_db
+def test_async_waxing_snapshot_lookup_is_a_single_thread_hop(monkeypatch):
+    hops = []
+
+    def counting_sync_to_async(func, *args, **kwargs):
+        hops.append(func)
+        return sync_to_async(func, *args, **kwargs)
+
+    monkeypatch.setattr(waxing_services, "sync_to_async", counting_sync_to_async)
+    waxing_services.invalidate_public_snapshot()
+
+    cold = async_to_sync(waxing_services.aget_public_snapshot)()
+    warm = async_to_sync(waxing_services.aget_public_snapshot)()
+
+    assert hops == [waxing_services.get_public_snapshot] * 2
+    assert cold == warm == waxing_services.get_public_snapshot()
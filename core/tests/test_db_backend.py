@@ -0,0 +1,37 @@
+import pytest
+from django.db import connection
+
+from core import request_metrics
+from core.db.base import DatabaseWrapper
+
+
+@pytest.mark.django_db
+def test_db_backend_reports_connection_setup_and_pool_wait():
+    settings_dict = {
+        **connection.settings_dict,
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {
+            **connection.settings_dict["OPTIONS"],
+            "pool": {"min_size": 1, "max_size": 1},
+        },
+    }
+    pooled = DatabaseWrapper(settings_dict, alias="pool_test")
+    direct = DatabaseWrapper(connection.settings_dict, alias="direct_test")
+    metrics, token = request_metrics.start()
+    try:
+        for wrapper in (direct, pooled, pooled):
+            wrapper.ensure_connection()
+            wrapper.close()
+    finally:
+        request_metrics.finish(token)
+        pooled.close_pool()
+
+    assert metrics.db_connects == 3
+    assert metrics.db_connect_time > 0
+    # Con una sola conexion, la segunda vuelta reutiliza la que se devolvio.
+    assert metrics.db_pool == {
+        "pool_size": 1,
+        "pool_available": 0,
+        "requests_waiting": 0,
+    }
+    assert "db-connect;dur=" in metrics.server_timing(metrics.total_time)
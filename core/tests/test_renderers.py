@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from core.api import PrerenderedResponse
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer, render_json
+
+
+def _render_payload():
+    return ReturnDict(
+        {
+            "id": UUID("12345678-1234-5678-1234-567812345678"),
+            "created_at": datetime(2024, 5, 1, 13, 30, tzinfo=dt_timezone.utc),
+            "updated_at": datetime(
+                2024, 5, 1, 13, 30, 0, 123456, tzinfo=ZoneInfo("UTC")
+            ),
+            "local": datetime(
+                2024, 5, 1, 10, 30, tzinfo=ZoneInfo("America/Argentina/Buenos_Aires")
+            ),
+            "naive": datetime(2024, 5, 1, 10, 30),
+            "day": date(2024, 5, 1),
+            "opens": time(9, 0, 0, 500),
+            "duration": timedelta(minutes=45),
+            "price": Decimal("1500.50"),
+            "price_str": "1500.50",
+            "label": gettext_lazy("Depilación"),
+            "text": 'Ñandú   línea   "comillas" \\ </script>',
+            "empty": [],
+            "nested": ReturnList(
+                [OrderedDict(b=1, a=None), {1: True, None: 2.5}], serializer=None
+            ),
+            "numbers": [0, -1, 2**53, 0.1, 1.5, 0.0001, True, False],
+            "blob": b"bytes",
+        },
+        serializer=None,
+    )
+
+
+def test_orjson_renderer_matches_drf_json_renderer_byte_for_byte():
+    data = _render_payload()
+    expected = JSONRenderer().render(data)
+
+    assert ORJSONRenderer().render(data) == expected
+    assert render_json(data) == expected
+    assert b"\\u2028" in expected and b"\\u2029" in expected
+    # Indentado (API navegable) y enteros fuera de 64 bits pasan por DRF.
+    assert ORJSONRenderer().render(data, "application/json; indent=4") == (
+        JSONRenderer().render(data, "application/json; indent=4")
+    )
+    assert render_json({"big": 2**70}) == JSONRenderer().render({"big": 2**70})
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_orjson_renderer_sends_prerendered_bodies_as_is():
+    response = PrerenderedResponse({"a": 1}, b'{"a":1}')
+    context = {"response": response}
+
+    assert ORJSONRenderer().render(response.data, None, context) == b'{"a":1}'
+    assert (
+        ORJSONRenderer().render(response.data, "application/json; indent=2", context)
+        == b'{\n  "a": 1\n}'
+    )
+    assert (
+        ORJSONRenderer().render(
+            {"a": 2}, None, {"response": PrerenderedResponse({"a": 2})}
+        )
+        == b'{"a":2}'
+    )
+
+
+def test_orjson_parser_matches_drf_json_parser():
+    body = (
+        '{"name":"Ñandú","items":[1,2.5,null,true],"nested":{"a":"\\u2028"}}'.encode()
+    )
+    assert ORJSONParser().parse(BytesIO(body)) == JSONParser().parse(BytesIO(body))
+
+    for invalid in (b"{", b'{"a": NaN}', b'{"a": Infinity}', '"ñ"'.encode("latin-1")):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(BytesIO(invalid))
+
+
+@pytest.mark.django_db
+def test_api_renders_and_parses_json_with_orjson(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_CLASSES": [],
+    }
+    client = APIClient()
+
+    response = client.get("/api/v1/waxing/summary/")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    assert response.content == JSONRenderer().render(response.data)
+
+    malformed = client.post(
+        "/api/v1/auth/jwt/verify/", data=b"{", content_type="application/json"
+    )
+    assert malformed.status_code == 400
+    assert malformed.json()["detail"].startswith("JSON parse error - ")
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from apps.reviews.views import PublicReviewsView
+from core import request_metrics
+from core.cache_backends import BatchCacheMetricsMixin, LocMemCache, RedisCache
+from core.request_metrics import QueryBudgetExceeded
+
+
+@pytest.fixture(autouse=True)
+def _public_client_settings(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_CLASSES": [],
+    }
+    settings.REVIEWS_PROVIDER = "manual"
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_request_metrics_middleware_emits_server_timing_and_enforces_budget(
+    settings, monkeypatch
+):
+    settings.REQUEST_METRICS_LOG = True
+    logged = []
+    monkeypatch.setattr(request_metrics.logger, "info", logged.append)
+
+    response = APIClient().get("/api/v1/reviews/")
+
+    assert response.status_code == 200
+    timing = response["Server-Timing"]
+    assert timing.startswith("total;dur=")
+    assert "db;dur=" in timing and "queries" in timing
+    assert "cache;desc=" in timing
+    assert json.loads(logged[-1])["view"] == "apps.reviews.views.PublicReviewsView"
+
+    cache.clear()
+    settings.QUERY_BUDGET_STRICT = True
+    monkeypatch.setattr(PublicReviewsView, "query_budget", 0, raising=False)
+    with pytest.raises(QueryBudgetExceeded):
+        APIClient().get("/api/v1/reviews/")
+
+
+def test_cache_backends_count_every_lookup_once():
+    backend = LocMemCache("metrics-test", {})
+    backend.set("hit", 1)
+    metrics, token = request_metrics.start()
+    try:
+        assert backend.get_many(["hit", "miss"]) == {"hit": 1}
+        assert backend.get("miss") is None
+    finally:
+        request_metrics.finish(token)
+
+    assert (metrics.cache_hits, metrics.cache_misses) == (1, 2)
+    # El get_many de django-redis es un MGET que no pasa por get.
+    assert RedisCache.get_many is BatchCacheMetricsMixin.get_many
+    assert "get_many" not in vars(LocMemCache)